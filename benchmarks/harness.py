@@ -0,0 +1,162 @@
+"""Benchmark measurement, result and baseline helpers"""
+
+import json
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Metrics where a larger value is an improvement; everything else is "lower is better"
+HIGHER_IS_BETTER = ("rows_per_sec", "symbols_per_sec")
+
+
+class BenchmarkResult:
+    """Metrics collected by one benchmark"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.metrics: Dict[str, float] = {}
+        self.stages: Dict[str, Dict[str, float]] = {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "metrics": self.metrics, "stages": self.stages}
+
+
+class StageTimer:
+    """
+    Accumulates wall time and call counts per named stage
+    
+    Wraps methods of an existing object so benchmarks can attribute time to
+    pipeline stages without modifying application code.
+    """
+    
+    def __init__(self):
+        self.totals: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+    
+    def wrap(self, obj: Any, method: str, stage: Optional[str] = None) -> None:
+        """
+        Replace obj.method with a timed version
+        
+        Args:
+            obj: Object whose method is wrapped
+            method: Method name
+            stage: Stage name (defaults to the method name)
+        """
+        original = getattr(obj, method)
+        stage = stage or method
+        
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.totals[stage] = self.totals.get(stage, 0.0) + time.perf_counter() - start
+                self.calls[stage] = self.calls.get(stage, 0) + 1
+        
+        setattr(obj, method, timed)
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage total seconds, call count and mean milliseconds"""
+        return {
+            stage: {
+                "total_sec": round(total, 6),
+                "calls": self.calls[stage],
+                "mean_ms": round(total / self.calls[stage] * 1000, 3),
+            }
+            for stage, total in self.totals.items()
+        }
+
+
+@contextmanager
+def measure(result: BenchmarkResult, track_memory: bool = False) -> Iterator[None]:
+    """
+    Record elapsed time (and optionally peak Python memory) into a result
+    
+    tracemalloc slows allocation-heavy code noticeably, so memory is only
+    tracked on request.
+    """
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        result.metrics["elapsed_sec"] = round(time.perf_counter() - start, 6)
+        if track_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result.metrics["peak_memory_mb"] = round(peak / 1024 / 1024, 3)
+
+
+def run_info(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Describe the environment and parameters of a benchmark run"""
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": params,
+    }
+
+
+def save_results(results: List[BenchmarkResult], info: Dict[str, Any], path: Path) -> None:
+    """Write results and run info as JSON"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"info": info, "results": [r.to_dict() for r in results]}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+def load_baseline(name: str) -> Optional[Dict[str, Any]]:
+    """Load a stored baseline by name, or None if missing"""
+    path = BASELINE_DIR / f"{name}.json"
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_to_baseline(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, Any],
+    tolerance: float
+) -> List[str]:
+    """
+    Find metrics that regressed beyond a relative tolerance
+    
+    Args:
+        results: Results of the current run
+        baseline: Payload previously written by save_results()
+        tolerance: Allowed relative slowdown, e.g. 0.2 for 20%
+    
+    Returns:
+        Human-readable regression descriptions (empty if none)
+    """
+    previous = {r["name"]: r["metrics"] for r in baseline.get("results", [])}
+    regressions = []
+    
+    for result in results:
+        for metric, value in result.metrics.items():
+            old = previous.get(result.name, {}).get(metric)
+            if not old:
+                continue
+            
+            if metric in HIGHER_IS_BETTER:
+                change = (old - value) / old
+            else:
+                change = (value - old) / old
+            
+            if change > tolerance:
+                regressions.append(
+                    f"{result.name}.{metric}: {old} -> {value} "
+                    f"({change:+.1%} worse, tolerance {tolerance:.0%})"
+                )
+    
+    return regressions
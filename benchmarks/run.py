@@ -0,0 +1,122 @@
+"""
+Run the offline benchmark suite
+
+Examples:
+    python -m benchmarks.run --symbols 100 --years 5
+    python -m benchmarks.run --save-baseline local
+    python -m benchmarks.run --compare local --tolerance 0.25
+    python -m benchmarks.run --suite schema --backend mysql --database-url mysql+pymysql://...
+    python -m benchmarks.run --cassette fixtures/http/crawl.json.gz --symbol-list AAPL,MSFT
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from src.data_sources import SyntheticDataSource, YFinanceDataSource, create_cassette_session
+from src.data_sources.http_cassette import MODE_REPLAY
+
+from .harness import (
+    RESULTS_DIR, BASELINE_DIR, compare_to_baseline, load_baseline, run_info, save_results,
+)
+from .suites import bench_pipeline, bench_schema, bench_storage, make_symbols
+
+
+SUITES = ("pipeline", "storage", "schema")
+
+
+def print_results(results) -> None:
+    """Print a compact results table"""
+    print(f"\n{'Benchmark':<28} {'Elapsed(s)':>11} {'Rows':>10} {'Rows/s':>12} {'Peak MB':>9}")
+    print("-" * 74)
+    for result in results:
+        m = result.metrics
+        print(
+            f"{result.name:<28} {m['elapsed_sec']:>11.3f} {m.get('rows', 0):>10,} "
+            f"{m.get('rows_per_sec', 0):>12,.1f} {m.get('peak_memory_mb', float('nan')):>9.2f}"
+        )
+        for stage, stats in result.stages.items():
+            print(
+                f"    {stage:<26} {stats['total_sec']:>9.3f}s  "
+                f"{stats['calls']:>6} calls  {stats['mean_ms']:>9.3f} ms/call"
+            )
+    print()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline crawl pipeline benchmarks")
+    parser.add_argument('--symbols', type=int, default=50, help='Number of synthetic symbols')
+    parser.add_argument('--years', type=int, default=5, help='Years of history for storage benchmarks')
+    parser.add_argument('--backend', default='sqlite', choices=['sqlite', 'mmap', 'mysql'],
+                        help='Storage backend under test')
+    parser.add_argument('--database-url', help='Database URL for the mysql backend')
+    parser.add_argument('--latency', type=float, default=0.0, help='Simulated seconds per request')
+    parser.add_argument('--rate-limit', type=float, default=0.0,
+                        help='Probability of an injected HTTP 429 per request')
+    parser.add_argument('--cassette', help='Replay Yahoo Finance traffic from an HTTP cassette '
+                        'instead of using the synthetic source')
+    parser.add_argument('--symbol-list', help='Comma-separated symbols (e.g. those in the cassette)')
+    parser.add_argument('--suite', action='append', choices=SUITES,
+                        help='Suite(s) to run (default: all)')
+    parser.add_argument('--memory', action='store_true', help='Track peak memory with tracemalloc')
+    parser.add_argument('--save-baseline', metavar='NAME', help='Store results as a named baseline')
+    parser.add_argument('--compare', metavar='NAME', help='Compare against a named baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed relative regression when comparing (default 0.2)')
+    
+    args = parser.parse_args()
+    if args.symbol_list:
+        symbols = [s.strip().upper() for s in args.symbol_list.split(",")]
+    else:
+        symbols = make_symbols(args.symbols)
+    suites = args.suite or SUITES
+    results = []
+    
+    if "pipeline" in suites:
+        if args.cassette:
+            session = create_cassette_session(
+                args.cassette,
+                mode=MODE_REPLAY,
+                latency=args.latency,
+                rate_limit_probability=args.rate_limit
+            )
+            source = YFinanceDataSource(request_delay=0, retry_delay=0, session=session)
+        else:
+            source = SyntheticDataSource(
+                latency=args.latency,
+                rate_limit_probability=args.rate_limit
+            )
+        results += bench_pipeline(symbols, source, args.backend, args.memory, args.database_url)
+    if "storage" in suites:
+        results += bench_storage(symbols, args.years, args.backend, args.memory, args.database_url)
+    if "schema" in suites:
+        results += bench_schema(symbols, args.years, args.backend, args.memory, args.database_url)
+    
+    print_results(results)
+    
+    info = run_info(vars(args))
+    save_results(results, info, RESULTS_DIR / f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    
+    if args.save_baseline:
+        save_results(results, info, BASELINE_DIR / f"{args.save_baseline}.json")
+        print(f"Saved baseline '{args.save_baseline}'")
+    
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        if baseline is None:
+            print(f"Baseline '{args.compare}' not found in {BASELINE_DIR}")
+            return 1
+        
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("Performance regressions:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"No regressions against baseline '{args.compare}'")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
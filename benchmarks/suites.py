@@ -0,0 +1,274 @@
+"""Benchmark suites for the crawl pipeline, bulk writes and reads"""
+
+import logging
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from sqlalchemy import MetaData, create_engine, insert, select
+
+from src.config import Settings
+from src.data_sources import BaseDataSource, SyntheticDataSource
+from src.main import StockCrawlerApp
+from src.models import StockData
+from src.storage import BaseStorage, create_storage
+from src.storage.migrations import legacy_stock_data_table
+
+from .harness import BenchmarkResult, StageTimer, measure
+
+
+def make_symbols(count: int) -> List[str]:
+    """Generate distinct pseudo ticker symbols"""
+    return [f"SYN{i:05d}" for i in range(count)]
+
+
+def make_storage(backend: str, work_dir: Path, database_url: str = None) -> BaseStorage:
+    """
+    Create and connect an empty storage backend for benchmarking
+    
+    Args:
+        backend: Storage backend name (sqlite, mmap or mysql)
+        work_dir: Scratch directory for embedded backends
+        database_url: Database URL for the mysql backend
+    """
+    settings = Settings(
+        storage_backend=backend,
+        sqlite_path=str(work_dir / "bench.db"),
+        mmap_data_dir=str(work_dir / "bars"),
+        database_url=database_url,
+    )
+    storage = create_storage(settings)
+    if not storage.connect() or not storage.initialize_schema():
+        raise RuntimeError(f"Could not open {backend} storage for benchmarking")
+    return storage
+
+
+def bench_pipeline(
+    symbols: List[str],
+    data_source: BaseDataSource,
+    backend: str,
+    track_memory: bool,
+    database_url: str = None
+) -> List[BenchmarkResult]:
+    """
+    End-to-end StockCrawlerApp.fetch_and_store_data against an offline source
+    
+    The source is either SyntheticDataSource or a real source replaying an
+    HTTP cassette. Runs a cold pass (empty database, 30-day backfill per
+    symbol) and a warm pass (incremental, nothing new to fetch).
+    """
+    results = []
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        app = StockCrawlerApp()
+        logging.getLogger().setLevel(logging.WARNING)
+        
+        # No screening panel or correlation caches: they would land in ./data and
+        # their refresh is not part of the crawl being measured
+        app.settings = Settings(
+            stock_symbols=",".join(symbols),
+            screening_cache_path="",
+            correlation_dir=""
+        )
+        app.data_source = data_source
+        app.storage = make_storage(backend, Path(tmp), database_url)
+        
+        try:
+            for phase in ("cold", "warm"):
+                saved = []
+                original_save = app.storage.save_stock_data
+                
+                def counting_save(data, _save=original_save):
+                    count = _save(data)
+                    saved.append(count)
+                    return count
+                
+                app.storage.save_stock_data = counting_save
+                
+                timer = StageTimer()
+                timer.wrap(app.storage, "get_latest_dates")
+                timer.wrap(app.data_source, "fetch_stock_data")
+                timer.wrap(app.storage, "save_stock_data")
+                
+                result = BenchmarkResult(f"pipeline_{phase}")
+                with measure(result, track_memory):
+                    app.fetch_and_store_data()
+                
+                elapsed = result.metrics["elapsed_sec"]
+                result.metrics["rows"] = sum(saved)
+                result.metrics["rows_per_sec"] = round(sum(saved) / elapsed, 1)
+                result.metrics["symbols_per_sec"] = round(len(symbols) / elapsed, 1)
+                result.stages = timer.summary()
+                results.append(result)
+                
+                # Drop the wrappers before the next phase
+                for method in ("get_latest_dates", "save_stock_data"):
+                    app.storage.__dict__.pop(method, None)
+                app.data_source.__dict__.pop("fetch_stock_data", None)
+        
+        finally:
+            app.storage.disconnect()
+    
+    return results
+
+
+def bench_storage(
+    symbols: List[str],
+    years: int,
+    backend: str,
+    track_memory: bool,
+    database_url: str = None
+) -> List[BenchmarkResult]:
+    """Bulk write of multi-year history, then per-symbol and bulk reads"""
+    source = SyntheticDataSource()
+    end_date = date.today()
+    start_date = end_date - timedelta(days=365 * years)
+    
+    # Data generation is not part of the measurement
+    batches = [source.fetch_stock_data(s, start_date, end_date) for s in symbols]
+    total_rows = sum(len(batch) for batch in batches)
+    results = []
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        logging.getLogger().setLevel(logging.WARNING)
+        storage = make_storage(backend, Path(tmp), database_url)
+        
+        try:
+            result = BenchmarkResult("bulk_write")
+            with measure(result, track_memory):
+                for batch in batches:
+                    storage.save_stock_data(batch)
+            result.metrics["rows"] = total_rows
+            result.metrics["rows_per_sec"] = round(total_rows / result.metrics["elapsed_sec"], 1)
+            results.append(result)
+            
+            result = BenchmarkResult("read_per_symbol")
+            with measure(result, track_memory):
+                rows = sum(len(storage.get_stock_data(s)) for s in symbols)
+            result.metrics["rows"] = rows
+            result.metrics["rows_per_sec"] = round(rows / result.metrics["elapsed_sec"], 1)
+            results.append(result)
+            
+            if hasattr(storage, "read_frame"):
+                result = BenchmarkResult("read_frame")
+                with measure(result, track_memory):
+                    rows = len(storage.read_frame(columns=["close_price", "volume"]))
+                result.metrics["rows"] = rows
+                result.metrics["rows_per_sec"] = round(rows / result.metrics["elapsed_sec"], 1)
+                results.append(result)
+            
+            if hasattr(storage, "iter_stock_data"):
+                result = BenchmarkResult("read_stream")
+                with measure(result, track_memory):
+                    rows = sum(len(batch) for batch in storage.iter_stock_data())
+                result.metrics["rows"] = rows
+                result.metrics["rows_per_sec"] = round(rows / result.metrics["elapsed_sec"], 1)
+                results.append(result)
+        
+        finally:
+            storage.disconnect()
+    
+    return results
+
+
+def bench_schema(
+    symbols: List[str],
+    years: int,
+    backend: str,
+    track_memory: bool,
+    database_url: str = None,
+    range_reads: int = 500
+) -> List[BenchmarkResult]:
+    """
+    Legacy (surrogate id) vs clustered (symbol, date) stock_data layout
+    
+    Inserts the same history into both layouts one symbol per transaction,
+    as the crawler does, then times random 90-day range reads of one
+    symbol. SQLite runs each layout in its own scratch file; mysql uses
+    bench_* tables in the given database and drops them afterwards.
+    """
+    if backend not in ("sqlite", "mysql"):
+        print(f"Skipping schema benchmark: needs the sqlite or mysql backend, not {backend}")
+        return []
+    
+    source = SyntheticDataSource()
+    end_date = date.today()
+    start_date = end_date - timedelta(days=365 * years)
+    now = datetime.utcnow()
+    batches = [
+        [
+            {
+                "symbol": dto.symbol, "date": dto.date,
+                "open_price": dto.open_price, "high_price": dto.high_price,
+                "low_price": dto.low_price, "close_price": dto.close_price,
+                "adj_close_price": dto.adj_close_price, "volume": dto.volume,
+                "market_cap": dto.market_cap, "pe_ratio": dto.pe_ratio,
+                "turnover_rate": dto.turnover_rate, "data_source": dto.data_source,
+                "created_at": now, "updated_at": now,
+            }
+            for dto in source.fetch_stock_data(symbol, start_date, end_date)
+        ]
+        for symbol in symbols
+    ]
+    total_rows = sum(len(batch) for batch in batches)
+    
+    rng = random.Random(42)
+    span_days = max((end_date - start_date).days - 90, 1)
+    windows = []
+    for _ in range(range_reads):
+        window_start = start_date + timedelta(days=rng.randrange(span_days))
+        windows.append((rng.choice(symbols), window_start, window_start + timedelta(days=90)))
+    
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout in ("legacy", "clustered"):
+            metadata = MetaData()
+            if layout == "legacy":
+                table = legacy_stock_data_table(metadata, name="bench_stock_data_legacy")
+            else:
+                table = StockData.__table__.to_metadata(metadata, name="bench_stock_data")
+            url = database_url if backend == "mysql" else f"sqlite:///{tmp}/{layout}.db"
+            engine = create_engine(url)
+            
+            try:
+                table.drop(engine, checkfirst=True)
+                table.create(engine)
+                
+                result = BenchmarkResult(f"schema_insert_{layout}")
+                with measure(result, track_memory):
+                    for batch in batches:
+                        with engine.begin() as conn:
+                            conn.execute(insert(table), batch)
+                result.metrics["rows"] = total_rows
+                result.metrics["rows_per_sec"] = round(total_rows / result.metrics["elapsed_sec"], 1)
+                results.append(result)
+                
+                latencies = []
+                rows = 0
+                result = BenchmarkResult(f"schema_range_read_{layout}")
+                with measure(result, track_memory), engine.connect() as conn:
+                    for symbol, window_start, window_end in windows:
+                        started = time.perf_counter()
+                        rows += len(conn.execute(
+                            select(table)
+                            .where(table.c.symbol == symbol,
+                                   table.c.date.between(window_start, window_end))
+                            .order_by(table.c.date)
+                        ).all())
+                        latencies.append(time.perf_counter() - started)
+                result.metrics["rows"] = rows
+                result.metrics["rows_per_sec"] = round(rows / result.metrics["elapsed_sec"], 1)
+                result.metrics["mean_ms"] = round(float(np.mean(latencies)) * 1000, 3)
+                result.metrics["p95_ms"] = round(float(np.percentile(latencies, 95)) * 1000, 3)
+                results.append(result)
+            
+            finally:
+                if backend == "mysql":
+                    table.drop(engine, checkfirst=True)
+                engine.dispose()
+    
+    return results
@@ -197,6 +197,29 @@ FROM stock_data
 GROUP BY symbol
 ORDER BY latest_data_date DESC;
 
+-- 隔离区：未通过入库前校验的数据（按规则统计）
+SELECT 
+    reasons,
+    COUNT(*) as rows_quarantined,
+    COUNT(DISTINCT symbol) as symbols,
+    MAX(quarantined_at) as last_seen
+FROM stock_data_quarantine
+GROUP BY reasons
+ORDER BY rows_quarantined DESC;
+
+-- 最近的校验运行统计
+SELECT 
+    id,
+    started_at,
+    symbols,
+    rows_checked,
+    rows_quarantined,
+    ROUND(100.0 * rows_quarantined / NULLIF(rows_checked, 0), 2) as quarantine_pct,
+    rule_counts
+FROM data_quality_runs
+ORDER BY id DESC
+LIMIT 20;
+
 -- ======================================
 -- 7. 导出数据
 -- ======================================
@@ -97,3 +97,14 @@ WHERE price_date_range LIKE '%2024%'
   AND response_status = 'success'
 ORDER BY stock_code;
 
+
+-- ============================================
+-- Monthly partitioning (managed by PARTITIONING_ENABLED / utils.py partitions)
+-- ============================================
+-- MySQL requires the partitioning column in every unique key:
+-- ALTER TABLE stock_price_raw DROP PRIMARY KEY, ADD PRIMARY KEY (id, crawl_save_time);
+-- ALTER TABLE stock_price_raw PARTITION BY RANGE COLUMNS(crawl_save_time) (
+--     PARTITION p202601 VALUES LESS THAN ('2026-02-01 00:00:00'),
+--     PARTITION p202602 VALUES LESS THAN ('2026-03-01 00:00:00'),
+--     PARTITION pfuture VALUES LESS THAN (MAXVALUE)
+-- );
@@ -0,0 +1,28 @@
+"""Analytics computed locally from stored bars"""
+
+from typing import TYPE_CHECKING
+
+from src.utils.lazy import lazy_module
+
+if TYPE_CHECKING:
+    from .correlation import RollingCorrelation, update_correlations
+    from .rollups import RollupEngine, rollup_frame
+    from .screening import MarketPanel, Screener, load_panel
+
+_LAZY_ATTRIBUTES = {
+    "RollupEngine": ".rollups",
+    "rollup_frame": ".rollups",
+    "MarketPanel": ".screening",
+    "Screener": ".screening",
+    "load_panel": ".screening",
+    "RollingCorrelation": ".correlation",
+    "update_correlations": ".correlation",
+}
+
+__all__ = [
+    "RollupEngine", "rollup_frame", "MarketPanel", "Screener", "load_panel",
+    "RollingCorrelation", "update_correlations",
+]
+
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_ATTRIBUTES)
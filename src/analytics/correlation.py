@@ -0,0 +1,340 @@
+"""Rolling return covariance and correlation matrices across the universe"""
+
+import logging
+import os
+import warnings
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .screening import MarketPanel
+
+logger = logging.getLogger(__name__)
+
+
+def panel_returns(panel: MarketPanel):
+    """
+    Daily close-to-close returns of a panel
+
+    Args:
+        panel: Screening panel
+
+    Returns:
+        Tuple of (dates, returns) where returns is a dates x symbols matrix,
+        NaN where either close is missing
+    """
+    close = panel.fields["close_price"]
+    if len(close) < 2:
+        return panel.dates[:0], np.empty((0, len(panel.symbols)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = close[1:] / close[:-1] - 1
+    returns[~np.isfinite(returns)] = np.nan
+    return panel.dates[1:], returns
+
+
+def _same_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Rows of two equally shaped matrices that are equal, NaN matching NaN"""
+    return ((a == b) | (np.isnan(a) & np.isnan(b))).all(axis=1)
+
+
+class RollingCorrelation:
+    """
+    Pairwise-complete covariance and correlation of daily returns over a window
+
+    Keeps per pair of symbols the number of days both have a return, the
+    sums of each one's returns and squared returns over those days, and the
+    sum of their products. A day entering the window is added to these
+    N x N sums as a rank-one update and a day leaving it is subtracted, so
+    a new trading day costs a few outer products instead of a recompute.
+    Results match pandas DataFrame.cov()/corr() on the window's returns.
+
+    The sums take four N x N float64 matrices (~128 MB for 2,000 symbols).
+    """
+
+    def __init__(self, window: int = 60, min_periods: Optional[int] = None):
+        """
+        Initialize an empty window
+
+        Args:
+            window: Trading days (returns) in the window
+            min_periods: Fewest shared days for a pair to get a value
+                (defaults to half the window)
+        """
+        self.window = window
+        self.min_periods = min_periods or max(window // 2, 2)
+        self.symbols: List[str] = []
+        self.dates = np.array([], dtype="datetime64[D]")
+        self.returns = np.empty((0, 0))
+        self._reset(0)
+        # Days added or removed since the sums were last recomputed from scratch
+        self.updates = 0
+
+    def _reset(self, size: int) -> None:
+        self.count = np.zeros((size, size))
+        self.sum_x = np.zeros((size, size))
+        self.sum_xx = np.zeros((size, size))
+        self.sum_xy = np.zeros((size, size))
+
+    @property
+    def last_date(self):
+        return self.dates[-1].astype(object) if len(self.dates) else None
+
+    def _apply(self, rows: np.ndarray, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) days of returns from the sums"""
+        if not len(rows):
+            return
+        present = (~np.isnan(rows)).astype(float)
+        values = np.nan_to_num(rows)
+        self.count += sign * (present.T @ present)
+        self.sum_x += sign * (values.T @ present)
+        self.sum_xx += sign * ((values * values).T @ present)
+        self.sum_xy += sign * (values.T @ values)
+        self.updates += len(rows)
+
+    def _rebuild(self, dates: np.ndarray, returns: np.ndarray, symbols: List[str]) -> None:
+        self.symbols = list(symbols)
+        self.dates = dates
+        self.returns = returns.copy()
+        self._reset(len(symbols))
+        self._apply(self.returns, 1)
+        self.updates = 0
+
+    def _grow(self, symbols: List[str]) -> None:
+        """Append symbols without any returns yet"""
+        extra = len(symbols) - len(self.symbols)
+        for name in ("count", "sum_x", "sum_xx", "sum_xy"):
+            setattr(self, name, np.pad(getattr(self, name), ((0, extra), (0, extra))))
+        self.returns = np.pad(self.returns, ((0, 0), (0, extra)), constant_values=np.nan)
+        self.symbols = list(symbols)
+
+    def update(self, panel: MarketPanel) -> int:
+        """
+        Bring the window up to date with a panel
+
+        Days that left the window are subtracted, new days added, and days
+        whose returns changed (rewritten bars, new symbols) swapped. Falls
+        back to a full recompute when the panel no longer lines up with the
+        window (a day inserted in the middle, symbols reordered) and after
+        window days of updates, which bounds floating-point drift.
+
+        Args:
+            panel: Screening panel holding at least the window's closes
+
+        Returns:
+            Number of days added, removed or swapped
+        """
+        dates, returns = panel_returns(panel)
+        dates, returns = dates[-self.window:], returns[-self.window:]
+
+        aligned = self.symbols == panel.symbols[:len(self.symbols)]
+        if aligned and len(panel.symbols) > len(self.symbols):
+            self._grow(panel.symbols)
+
+        # Days kept from the current window must be the first days of the new one
+        kept = self.dates >= dates[0] if len(dates) else np.zeros(len(self.dates), bool)
+        overlap = int(kept.sum())
+        aligned = aligned and np.array_equal(self.dates[kept], dates[:overlap])
+        if not aligned or not len(self.dates) or self.updates >= self.window:
+            self._rebuild(dates, returns, panel.symbols)
+            return len(dates)
+
+        leaving = self.returns[~kept]
+        changed = ~_same_rows(self.returns[kept], returns[:overlap])
+        self._apply(np.vstack([leaving, self.returns[kept][changed]]), -1)
+        self._apply(np.vstack([returns[:overlap][changed], returns[overlap:]]), 1)
+
+        applied = len(leaving) + 2 * int(changed.sum()) + len(returns) - overlap
+        self.dates = dates
+        self.returns = returns.copy()
+        return applied
+
+    def _centered(self, rows, cols):
+        """Co-moment, both variances and the pair count for index arrays"""
+        count = self.count[rows, cols]
+        sum_x, sum_y = self.sum_x[rows, cols], self.sum_x[cols, rows]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            comoment = self.sum_xy[rows, cols] - sum_x * sum_y / count
+            var_x = self.sum_xx[rows, cols] - sum_x * sum_x / count
+            var_y = self.sum_xx[cols, rows] - sum_y * sum_y / count
+        valid = count >= self.min_periods
+        return np.where(valid, comoment, np.nan), var_x, var_y, count
+
+    def _stats(self, rows, cols):
+        comoment, var_x, var_y, count = self._centered(rows, cols)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covariance = comoment / (count - 1)
+            # Clip the rounding error of a symbol against itself
+            correlation = np.clip(comoment / np.sqrt(var_x * var_y), -1, 1)
+        # Constant returns have no correlation
+        correlation = np.where(var_x * var_y > 0, correlation, np.nan)
+        return covariance, correlation, count
+
+    def _index(self, symbol: str) -> int:
+        try:
+            return self.symbols.index(symbol.upper())
+        except ValueError:
+            raise KeyError(f"{symbol} is not in the correlation window") from None
+
+    def pair(self, a: str, b: str) -> Dict[str, float]:
+        """
+        Covariance and correlation of two symbols' returns
+
+        Args:
+            a: Stock ticker symbol
+            b: Stock ticker symbol
+
+        Returns:
+            Dictionary with covariance, correlation and observations
+            (NaN values when the pair shares fewer than min_periods days)
+
+        Raises:
+            KeyError: If a symbol is not in the window
+        """
+        i, j = self._index(a), self._index(b)
+        covariance, correlation, count = self._stats(np.array([i]), np.array([j]))
+        return {
+            "covariance": float(covariance[0]),
+            "correlation": float(correlation[0]),
+            "observations": int(count[0]),
+        }
+
+    def neighbours(self, symbol: str, top: int = 10, negative: bool = False) -> pd.DataFrame:
+        """
+        Symbols most (or least) correlated with one symbol
+
+        Args:
+            symbol: Stock ticker symbol
+            top: Number of symbols returned
+            negative: Most negatively correlated instead
+
+        Returns:
+            DataFrame indexed by symbol with correlation, covariance and observations
+
+        Raises:
+            KeyError: If the symbol is not in the window
+        """
+        i = self._index(symbol)
+        others = np.arange(len(self.symbols))
+        covariance, correlation, count = self._stats(np.full_like(others, i), others)
+        frame = pd.DataFrame(
+            {"correlation": correlation, "covariance": covariance, "observations": count.astype(int)},
+            index=pd.Index(self.symbols, name="symbol")
+        ).drop(index=self.symbols[i])
+        frame = frame[np.isfinite(frame["correlation"])]
+        return frame.sort_values("correlation", ascending=negative).head(top)
+
+    def matrix(self, symbols: Optional[List[str]] = None, kind: str = "correlation") -> pd.DataFrame:
+        """
+        Covariance or correlation matrix
+
+        Args:
+            symbols: Symbols to include (None for the whole window)
+            kind: "correlation" or "covariance"
+
+        Returns:
+            Symmetric DataFrame indexed and labelled by symbol
+
+        Raises:
+            KeyError: If a symbol is not in the window
+        """
+        names = [s.upper() for s in symbols] if symbols else self.symbols
+        index = np.array([self._index(s) for s in names], dtype=np.intp)
+        rows, cols = np.meshgrid(index, index, indexing="ij")
+        covariance, correlation, _ = self._stats(rows, cols)
+        values = correlation if kind == "correlation" else covariance
+        return pd.DataFrame(values, index=names, columns=names)
+
+    def save(self, path: str) -> None:
+        """Atomically write the window and its sums to an .npz file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(
+            tmp_path,
+            window=np.array(self.window),
+            min_periods=np.array(self.min_periods),
+            updates=np.array(self.updates),
+            symbols=np.array(self.symbols, dtype=str),
+            dates=self.dates,
+            returns=self.returns,
+            count=self.count,
+            sum_x=self.sum_x,
+            sum_xx=self.sum_xx,
+            sum_xy=self.sum_xy
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "RollingCorrelation":
+        """
+        Read a window written by save()
+
+        Args:
+            path: .npz file
+
+        Returns:
+            RollingCorrelation
+        """
+        with np.load(path, allow_pickle=False) as data:
+            rolling = cls(int(data["window"]), int(data["min_periods"]))
+            rolling.updates = int(data["updates"])
+            rolling.symbols = data["symbols"].tolist()
+            rolling.dates = data["dates"]
+            rolling.returns = data["returns"]
+            for name in ("count", "sum_x", "sum_xx", "sum_xy"):
+                setattr(rolling, name, data[name])
+        return rolling
+
+
+def correlation_path(cache_dir: str, window: int) -> Path:
+    """File holding the window of the given length"""
+    return Path(cache_dir) / f"returns_{window}d.npz"
+
+
+def update_correlations(
+    panel: MarketPanel,
+    cache_dir: str,
+    windows: List[int],
+    min_periods: Optional[int] = None
+) -> Dict[int, RollingCorrelation]:
+    """
+    Update the persisted rolling windows from a current panel
+
+    Args:
+        panel: Current screening panel
+        cache_dir: Directory of the window files
+        windows: Window lengths in trading days
+        min_periods: Fewest shared days for a pair (default: half of each window)
+
+    Returns:
+        Mapping of window length to updated RollingCorrelation
+    """
+    results = {}
+    for window in windows:
+        if window >= panel.max_days:
+            logger.warning(
+                f"Correlation window of {window} days exceeds the screening panel's "
+                f"{panel.max_days} days and covers only {panel.max_days - 1} returns"
+            )
+        path = correlation_path(cache_dir, window)
+        rolling = None
+        if path.exists():
+            try:
+                rolling = RollingCorrelation.load(path)
+            except (OSError, KeyError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable correlation window {path}: {e}")
+        if rolling is None or (min_periods and rolling.min_periods != min_periods):
+            rolling = RollingCorrelation(window, min_periods)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            applied = rolling.update(panel)
+        rolling.save(path)
+        logger.info(
+            f"Updated {window}-day correlations of {len(rolling.symbols)} symbols "
+            f"through {rolling.last_date} ({applied} days applied)"
+        )
+        results[window] = rolling
+    return results
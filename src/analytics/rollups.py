@@ -0,0 +1,215 @@
+"""Weekly, monthly and custom-period bars derived from daily bars"""
+
+import logging
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.models import StockRollup
+
+logger = logging.getLogger(__name__)
+
+
+# Short names for the common periods; any other pandas period alias
+# (W-WED, Q-JUN, ...) is used as given
+PERIOD_ALIASES = {
+    "W": "W-FRI",
+    "M": "M",
+    "Q": "Q",
+    "Y": "Y",
+}
+
+# Daily columns read to build rollups
+DAILY_COLUMNS = [
+    "open_price", "high_price", "low_price", "close_price", "adj_close_price", "volume",
+]
+
+# Columns written to stock_rollups besides the key
+ROLLUP_COLUMNS = ["period_end", "trading_days"] + DAILY_COLUMNS
+
+
+def rollup_frame(daily: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    Aggregate daily bars into one bar per symbol and period
+
+    Open is the first open of the period, high/low the extremes, close and
+    adjusted close the last values and volume the sum, like the weekly and
+    monthly series of Alpha Vantage (which date each bar on the period's
+    last trading day, reported here as period_end).
+
+    Args:
+        daily: DataFrame with symbol, date and DAILY_COLUMNS
+        period: Period name (W, M, Q, Y or a pandas period alias)
+
+    Returns:
+        DataFrame with symbol, period, period_start and ROLLUP_COLUMNS
+    """
+    columns = ["symbol", "period", "period_start"] + ROLLUP_COLUMNS
+    if daily.empty:
+        return pd.DataFrame(columns=columns)
+
+    daily = daily.sort_values(["symbol", "date"])
+    dates = pd.to_datetime(daily["date"])
+    keys = [daily["symbol"], dates.dt.to_period(PERIOD_ALIASES.get(period, period))]
+
+    grouped = daily.assign(period_end=dates).groupby(keys, sort=True)
+    bars = grouped.agg(
+        period_end=("period_end", "max"),
+        trading_days=("period_end", "size"),
+        open_price=("open_price", "first"),
+        high_price=("high_price", "max"),
+        low_price=("low_price", "min"),
+        close_price=("close_price", "last"),
+        adj_close_price=("adj_close_price", "last"),
+        volume=("volume", "sum"),
+    )
+    bars.index.names = ["symbol", "bucket"]
+    bars = bars.reset_index()
+
+    bars["period"] = period
+    bars["period_start"] = bars["bucket"].map(lambda bucket: bucket.start_time.date())
+    bars["period_end"] = bars["period_end"].dt.date
+    return bars[columns]
+
+
+class RollupEngine:
+    """
+    Keeps stock_rollups up to date from stock_data
+
+    After new daily bars land, refresh() recomputes only the periods
+    containing them (normally just the current week and month) from the
+    stored daily bars, so weekly and monthly series never need their own
+    API calls.
+    """
+
+    def __init__(self, storage, periods: Optional[List[str]] = None):
+        """
+        Initialize the engine
+
+        Args:
+            storage: SQL storage backend (needs engine and read_frame())
+            periods: Periods to maintain (defaults to W and M)
+        """
+        self.storage = storage
+        self.periods = periods or ["W", "M"]
+
+    def _period_start(self, day: date, period: str) -> date:
+        alias = PERIOD_ALIASES.get(period, period)
+        return pd.Timestamp(day).to_period(alias).start_time.date()
+
+    def _upsert_statement(self):
+        """INSERT that overwrites an existing rollup with the same key"""
+        table = StockRollup.__table__
+        if self.storage.engine.dialect.name == "sqlite":
+            stmt = sqlite_insert(table)
+            return stmt.on_conflict_do_update(
+                index_elements=["symbol", "period", "period_start"],
+                set_={name: stmt.excluded[name] for name in ROLLUP_COLUMNS + ["updated_at"]}
+            )
+        stmt = mysql_insert(table)
+        return stmt.on_duplicate_key_update({
+            name: stmt.inserted[name] for name in ROLLUP_COLUMNS + ["updated_at"]
+        })
+
+    def _save(self, bars: pd.DataFrame) -> int:
+        if bars.empty:
+            return 0
+        rows = bars.astype(object).where(bars.notna(), None).to_dict("records")
+        now = datetime.utcnow()
+        for row in rows:
+            row["updated_at"] = now
+        with self.storage.engine.begin() as conn:
+            conn.execute(self._upsert_statement(), rows)
+        return len(rows)
+
+    def refresh(self, changes: Dict[str, Optional[date]]) -> int:
+        """
+        Recompute the rollups touched by new or changed daily bars
+
+        Args:
+            changes: Mapping of symbol to the earliest daily bar date written
+                (None recomputes the symbol's whole history)
+
+        Returns:
+            Number of rollup rows written
+        """
+        if not changes:
+            return 0
+
+        written = 0
+        try:
+            for period in self.periods:
+                starts = {
+                    symbol: self._period_start(day, period) if day else date.min
+                    for symbol, day in changes.items()
+                }
+                earliest = min(starts.values())
+                daily = self.storage.read_frame(
+                    list(starts),
+                    start_date=earliest if earliest > date.min else None,
+                    columns=DAILY_COLUMNS
+                )
+                bars = rollup_frame(daily, period)
+                # Symbols whose changes start later keep their earlier periods
+                bars = bars[bars["period_start"] >= bars["symbol"].map(starts)]
+                written += self._save(bars)
+
+            logger.info(f"Refreshed {written} {'/'.join(self.periods)} rollups "
+                        f"for {len(changes)} symbols")
+            return written
+
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error(f"Failed to refresh rollups: {str(e)}", exc_info=True)
+            return written
+
+    def rebuild(self, symbols: List[str], chunk_size: int = 200) -> int:
+        """
+        Recompute every rollup of the given symbols from all their daily bars
+
+        Args:
+            symbols: Stock ticker symbols
+            chunk_size: Symbols whose full history is loaded at a time
+
+        Returns:
+            Number of rollup rows written
+        """
+        return sum(
+            self.refresh({symbol: None for symbol in symbols[start:start + chunk_size]})
+            for start in range(0, len(symbols), chunk_size)
+        )
+
+    def get_rollups(
+        self,
+        symbol: str,
+        period: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> pd.DataFrame:
+        """
+        Read stored rollups of a symbol
+
+        Args:
+            symbol: Stock ticker symbol
+            period: Period name
+            start_date: Earliest period_start (optional)
+            end_date: Latest period_start (optional)
+
+        Returns:
+            DataFrame ordered by period_start
+        """
+        stmt = select(
+            StockRollup.period_start,
+            *[getattr(StockRollup, name) for name in ROLLUP_COLUMNS]
+        ).where(StockRollup.symbol == symbol, StockRollup.period == period)
+        if start_date:
+            stmt = stmt.where(StockRollup.period_start >= start_date)
+        if end_date:
+            stmt = stmt.where(StockRollup.period_start <= end_date)
+
+        with self.storage.engine.connect() as conn:
+            return pd.read_sql(stmt.order_by(StockRollup.period_start), conn)
@@ -0,0 +1,380 @@
+"""Cross-sectional stock screens over an in-memory date x symbol matrix"""
+
+import logging
+import os
+import warnings
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# Daily fields held by the panel
+PANEL_FIELDS = ["high_price", "low_price", "close_price", "volume", "market_cap", "pe_ratio"]
+
+
+def read_daily_frame(
+    storage,
+    symbols: Optional[List[str]],
+    start_date: Optional[date],
+    columns: List[str]
+) -> pd.DataFrame:
+    """
+    Read daily bars from any storage backend into a DataFrame
+
+    Args:
+        storage: Connected storage backend
+        symbols: Stock ticker symbols (None for all stored symbols)
+        start_date: Start date filter (optional)
+        columns: Columns besides symbol and date
+
+    Returns:
+        DataFrame with symbol, date and columns
+    """
+    if hasattr(storage, "read_frame"):
+        return storage.read_frame(symbols, start_date=start_date, columns=columns)
+
+    # mmap backend: zero-copy range reads per symbol
+    frames = []
+    for symbol in symbols or storage.list_symbols():
+        bars = storage.read_range(symbol, start_date)
+        if len(bars):
+            frame = pd.DataFrame({name: bars[name] for name in ["date"] + columns})
+            frame.insert(0, "symbol", symbol.upper())
+            frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=["symbol", "date"] + columns)
+    frame = pd.concat(frames, ignore_index=True)
+    if "volume" in frame:
+        frame["volume"] = frame["volume"].where(frame["volume"] >= 0)
+    return frame
+
+
+def _last_valid_rows(values: np.ndarray) -> np.ndarray:
+    """Row of the latest non-NaN value of every column (-1 if the column has none)"""
+    rows = np.where(np.isnan(values), -1, np.arange(len(values))[:, None])
+    return rows.max(axis=0, initial=-1)
+
+
+def _last_valid(values: np.ndarray) -> np.ndarray:
+    """Latest non-NaN value of every column (NaN if the column has none)"""
+    rows = _last_valid_rows(values)
+    found = values[np.maximum(rows, 0), np.arange(values.shape[1])] if len(values) else rows
+    return np.where(rows >= 0, found, np.nan)
+
+
+class MarketPanel:
+    """
+    Dense date x symbol float matrices of the most recent daily bars
+
+    One array per field, rows in date order, NaN where a symbol has no bar.
+    refresh() merges only the rows written since a date, so the panel is
+    kept current after every crawl without rescanning the table, and
+    save()/load() keep it between processes as an .npz file.
+    """
+
+    def __init__(self, max_days: int = 260):
+        """
+        Initialize an empty panel
+
+        Args:
+            max_days: Most recent dates (rows) kept
+        """
+        self.max_days = max_days
+        self.dates = np.array([], dtype="datetime64[D]")
+        self.symbols: List[str] = []
+        self.fields: Dict[str, np.ndarray] = {
+            name: np.empty((0, 0)) for name in PANEL_FIELDS
+        }
+
+    @property
+    def shape(self):
+        return len(self.dates), len(self.symbols)
+
+    @property
+    def last_date(self) -> Optional[date]:
+        return self.dates[-1].astype(date) if len(self.dates) else None
+
+    def _reindex(self, dates: np.ndarray, symbols: List[str]) -> None:
+        """Grow the matrices to new date and symbol axes, keeping existing values"""
+        rows = np.searchsorted(dates, self.dates)
+        position = {symbol: i for i, symbol in enumerate(symbols)}
+        cols = np.array([position[symbol] for symbol in self.symbols], dtype=np.intp)
+        for name, values in self.fields.items():
+            grown = np.full((len(dates), len(symbols)), np.nan)
+            if values.size:
+                grown[np.ix_(rows, cols)] = values
+            self.fields[name] = grown
+        self.dates = dates
+        self.symbols = symbols
+
+    def refresh(
+        self,
+        storage,
+        since: Optional[date] = None,
+        symbols: Optional[List[str]] = None
+    ) -> int:
+        """
+        Merge daily bars written since a date into the panel
+
+        Args:
+            storage: Connected storage backend
+            since: Earliest date to read (default: enough history to fill the panel)
+            symbols: Symbols to read (None for all stored symbols)
+
+        Returns:
+            Number of bars merged
+        """
+        if since is None:
+            # Calendar days covering max_days trading days, with room for holidays
+            since = date.today() - timedelta(days=int(self.max_days * 1.5) + 10)
+
+        frame = read_daily_frame(storage, symbols, since, PANEL_FIELDS)
+        if frame.empty:
+            return 0
+
+        frame_dates = pd.to_datetime(frame["date"]).values.astype("datetime64[D]")
+        dates = np.union1d(self.dates, frame_dates)
+        known = set(self.symbols)
+        new_symbols = sorted({s for s in frame["symbol"].unique() if s not in known})
+        if len(dates) != len(self.dates) or new_symbols:
+            self._reindex(dates, self.symbols + new_symbols)
+
+        rows = np.searchsorted(self.dates, frame_dates)
+        position = {symbol: i for i, symbol in enumerate(self.symbols)}
+        cols = frame["symbol"].map(position).to_numpy(dtype=np.intp)
+        for name in PANEL_FIELDS:
+            self.fields[name][rows, cols] = frame[name].to_numpy(dtype=float, na_value=np.nan)
+
+        if len(self.dates) > self.max_days:
+            self.dates = self.dates[-self.max_days:]
+            for name in PANEL_FIELDS:
+                self.fields[name] = self.fields[name][-self.max_days:]
+
+        logger.info(
+            f"Merged {len(frame)} bars into the screening panel "
+            f"({self.shape[0]} dates x {self.shape[1]} symbols)"
+        )
+        return len(frame)
+
+    def save(self, path: str) -> None:
+        """Atomically write the panel to an .npz file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(
+            tmp_path,
+            dates=self.dates,
+            symbols=np.array(self.symbols, dtype=str),
+            max_days=np.array(self.max_days),
+            **self.fields
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, max_days: Optional[int] = None) -> "MarketPanel":
+        """
+        Read a panel written by save()
+
+        Args:
+            path: .npz file
+            max_days: Override the stored number of rows kept
+
+        Returns:
+            MarketPanel
+        """
+        with np.load(path, allow_pickle=False) as data:
+            panel = cls(max_days or int(data["max_days"]))
+            panel.dates = data["dates"]
+            panel.symbols = data["symbols"].tolist()
+            panel.fields = {name: data[name] for name in PANEL_FIELDS}
+        return panel
+
+
+class Screener:
+    """
+    Ranked screens evaluated on a MarketPanel
+
+    Every screen is a handful of NumPy reductions over the panel's last
+    rows, so a universe of thousands of symbols screens in milliseconds.
+    Screens return a DataFrame ranked best first, indexed by symbol.
+    """
+
+    def __init__(self, panel: MarketPanel):
+        self.panel = panel
+
+    def _ranked(self, columns: Dict[str, np.ndarray], key: str, top: int, ascending: bool):
+        if not len(self.panel.dates):
+            return pd.DataFrame(columns=list(columns), index=pd.Index([], name="symbol"))
+        frame = pd.DataFrame(columns, index=pd.Index(self.panel.symbols, name="symbol"))
+        frame = frame[np.isfinite(frame[key])]
+        return frame.sort_values(key, ascending=ascending).head(top)
+
+    def movers(self, top: int = 10, ascending: bool = False) -> pd.DataFrame:
+        """
+        Largest moves between each symbol's last two closes
+
+        Args:
+            top: Number of symbols returned
+            ascending: Biggest losers instead of gainers
+
+        Returns:
+            DataFrame with date, close, prev_close and change_pct
+        """
+        close = self.panel.fields["close_price"]
+        rows = _last_valid_rows(close)
+        latest = _last_valid(close)
+        # Hide each symbol's latest close to find the one before it
+        earlier = np.where(np.arange(len(close))[:, None] < rows, close, np.nan)
+        previous = _last_valid(earlier)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change = (latest / previous - 1) * 100
+        return self._ranked(
+            {
+                "date": self.panel.dates[np.maximum(rows, 0)] if len(close) else rows,
+                "close": latest,
+                "prev_close": previous,
+                "change_pct": change,
+            },
+            "change_pct", top, ascending
+        )
+
+    def price_range(self, days: int = 30, top: int = 10) -> pd.DataFrame:
+        """
+        Widest close-price range over the last days
+
+        Args:
+            days: Trading days in the window
+            top: Number of symbols returned
+
+        Returns:
+            DataFrame with trading_days, avg_price, min_price, max_price, range_pct
+        """
+        fields = self.panel.fields
+        close = fields["close_price"][-days:]
+        if not len(close):
+            names = ["trading_days", "avg_price", "min_price", "max_price", "range_pct"]
+            return self._ranked(dict.fromkeys(names), "range_pct", top, ascending=False)
+        # All-NaN columns (symbols without bars in the window) yield NaN and are dropped
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            result = {
+                "trading_days": np.sum(~np.isnan(close), axis=0),
+                "avg_price": np.nanmean(close, axis=0),
+                "min_price": np.nanmin(fields["low_price"][-days:], axis=0),
+                "max_price": np.nanmax(fields["high_price"][-days:], axis=0),
+                "range_pct": (np.nanmax(close, axis=0) / np.nanmin(close, axis=0) - 1) * 100,
+            }
+        return self._ranked(result, "range_pct", top, ascending=False)
+
+    def volume_spikes(self, days: int = 30, top: int = 10) -> pd.DataFrame:
+        """
+        Latest volume against the average of the previous days
+
+        Args:
+            days: Trading days in the baseline average
+            top: Number of symbols returned
+
+        Returns:
+            DataFrame with volume, avg_volume and volume_ratio
+        """
+        volume = self.panel.fields["volume"]
+        # All-NaN columns (symbols without bars in the window) yield NaN and are dropped
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            baseline = np.nanmean(volume[-days - 1:-1], axis=0)
+            latest = volume[-1] if len(volume) else np.array([])
+            ratio = latest / baseline
+        return self._ranked(
+            {"volume": latest, "avg_volume": baseline, "volume_ratio": ratio},
+            "volume_ratio", top, ascending=False
+        )
+
+    def lowest_pe(self, top: int = 10) -> pd.DataFrame:
+        """
+        Lowest positive latest P/E ratios
+
+        Args:
+            top: Number of symbols returned
+
+        Returns:
+            DataFrame with pe_ratio, close and market_cap_billion
+        """
+        fields = self.panel.fields
+        pe = _last_valid(fields["pe_ratio"])
+        pe = np.where(pe > 0, pe, np.nan)
+        return self._ranked(
+            {
+                "pe_ratio": pe,
+                "close": _last_valid(fields["close_price"]),
+                "market_cap_billion": _last_valid(fields["market_cap"]) / 1e9,
+            },
+            "pe_ratio", top, ascending=True
+        )
+
+    def largest_market_cap(self, top: int = 10) -> pd.DataFrame:
+        """
+        Largest latest market capitalisations
+
+        Args:
+            top: Number of symbols returned
+
+        Returns:
+            DataFrame with market_cap_billion, pe_ratio and close
+        """
+        fields = self.panel.fields
+        return self._ranked(
+            {
+                "market_cap_billion": _last_valid(fields["market_cap"]) / 1e9,
+                "pe_ratio": _last_valid(fields["pe_ratio"]),
+                "close": _last_valid(fields["close_price"]),
+            },
+            "market_cap_billion", top, ascending=False
+        )
+
+
+def load_panel(
+    storage,
+    cache_path: Optional[str] = None,
+    max_days: int = 260,
+    changed_since: Optional[date] = None
+) -> MarketPanel:
+    """
+    Get a current panel, reusing the cache file when there is one
+
+    With a cache only bars from its last date onwards (or from
+    changed_since, if earlier) are read from storage; without one the panel
+    is built from scratch. The refreshed panel is written back to the cache.
+
+    Args:
+        storage: Connected storage backend
+        cache_path: .npz cache file (optional)
+        max_days: Most recent dates kept
+        changed_since: Earliest date rewritten since the cache was saved (optional)
+
+    Returns:
+        MarketPanel
+    """
+    panel = None
+    if cache_path and Path(cache_path).exists():
+        try:
+            panel = MarketPanel.load(cache_path, max_days)
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable screening cache {cache_path}: {e}")
+
+    if panel is None or panel.last_date is None:
+        panel = MarketPanel(max_days)
+        panel.refresh(storage)
+    else:
+        since = panel.last_date
+        if changed_since is not None:
+            since = min(since, changed_since)
+        panel.refresh(storage, since=since)
+
+    if cache_path:
+        panel.save(cache_path)
+    return panel
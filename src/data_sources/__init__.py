@@ -1,8 +1,39 @@
 """Data sources module"""
 
-from .base import BaseDataSource
-from .yfinance_source import YFinanceDataSource
-from .alphavantage_source import AlphaVantageDataSource
+from typing import TYPE_CHECKING
 
-__all__ = ["BaseDataSource", "YFinanceDataSource", "AlphaVantageDataSource"]
+from src.utils.lazy import lazy_module
 
+from .base import BaseDataSource, DataSourceError, RateLimitError
+
+if TYPE_CHECKING:
+    from .yfinance_source import YFinanceDataSource
+    from .alphavantage_source import AlphaVantageDataSource
+    from .synthetic_source import SyntheticDataSource
+    from .failover_source import FailoverDataSource
+    from .circuit_breaker import CircuitBreaker, CircuitBreakerDataSource, CircuitOpenError
+    from .rate_controller import AdaptiveRateController
+    from .http_cassette import create_cassette_session
+
+# Sources pull in yfinance/pandas/requests, so they are imported on first use
+_LAZY_ATTRIBUTES = {
+    "YFinanceDataSource": ".yfinance_source",
+    "AlphaVantageDataSource": ".alphavantage_source",
+    "SyntheticDataSource": ".synthetic_source",
+    "FailoverDataSource": ".failover_source",
+    "CircuitBreaker": ".circuit_breaker",
+    "CircuitBreakerDataSource": ".circuit_breaker",
+    "CircuitOpenError": ".circuit_breaker",
+    "AdaptiveRateController": ".rate_controller",
+    "create_cassette_session": ".http_cassette",
+}
+
+__all__ = [
+    "BaseDataSource", "DataSourceError", "RateLimitError",
+    "YFinanceDataSource", "AlphaVantageDataSource", "SyntheticDataSource",
+    "FailoverDataSource", "CircuitBreaker", "CircuitBreakerDataSource", "CircuitOpenError",
+    "AdaptiveRateController", "create_cassette_session",
+]
+
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_ATTRIBUTES)
@@ -1,13 +1,14 @@
 """Alpha Vantage data source implementation"""
 
 import logging
-import time
 import json
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date, timedelta
 import requests
 
-from .base import BaseDataSource, StockDataDTO
+from src.utils.metrics import HTTP_REQUEST_SECONDS, RATE_LIMIT_HITS, timed_sleep
+from src.utils.tracing import span, traced
+from .base import BaseDataSource, DataSourceError, RateLimitError, StockDataDTO
 
 logger = logging.getLogger(__name__)
 
@@ -23,13 +24,16 @@ class AlphaVantageDataSource(BaseDataSource):
         api_key: str,
         request_delay: float = 12.0,  # Free tier: 5 calls/minute = 12s delay
         max_retries: int = 3,
-        retry_delay: float = 15.0
+        retry_delay: float = 15.0,
+        session: Optional[requests.Session] = None
     ):
         super().__init__(source_name="alphavantage")
         self.api_key = api_key
         self.request_delay = request_delay
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        # Reused HTTP session (keep-alive); may be a record/replay cassette session
+        self.session = session or requests.Session()
         
         if not api_key:
             raise ValueError("Alpha Vantage API key is required")
@@ -39,6 +43,7 @@ class AlphaVantageDataSource(BaseDataSource):
             f"retries={max_retries}, api_key={'***' + api_key[-4:]}"
         )
     
+    @traced(category="fetch")
     def fetch_raw_data(
         self,
         symbol: str,
@@ -59,7 +64,7 @@ class AlphaVantageDataSource(BaseDataSource):
         for attempt in range(self.max_retries):
             try:
                 # Add delay to respect rate limits
-                time.sleep(self.request_delay)
+                self._pace(self.request_delay)
                 
                 # Build request parameters
                 params = {
@@ -72,7 +77,9 @@ class AlphaVantageDataSource(BaseDataSource):
                 logger.info(f"Fetching {function} data for {symbol} from Alpha Vantage...")
                 
                 # Make request
-                response = requests.get(self.BASE_URL, params=params, timeout=30)
+                with span(f"alphavantage.{function}", "http", symbol=symbol), \
+                        HTTP_REQUEST_SECONDS.time(source=self.source_name, endpoint=function):
+                    response = self.session.get(self.BASE_URL, params=params, timeout=30)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -89,15 +96,19 @@ class AlphaVantageDataSource(BaseDataSource):
                         'api_params': json.dumps(params)
                     }
                 
-                # Check for rate limit message
-                if 'Note' in data:
-                    note_msg = data['Note']
+                # Check for rate limit message (older responses use Note,
+                # newer ones Information)
+                if 'Note' in data or 'Information' in data:
+                    note_msg = data.get('Note') or data['Information']
                     if 'API call frequency' in note_msg or 'premium' in note_msg.lower():
                         logger.warning(f"Rate limit hit for {symbol}: {note_msg}")
+                        RATE_LIMIT_HITS.inc(source=self.source_name)
+                        self._report_throttle()
                         if attempt < self.max_retries - 1:
-                            wait_time = self.retry_delay * (attempt + 1)
+                            # With a rate controller the reduced rate paces the retry
+                            wait_time = 0 if self.rate_controller else self.retry_delay * (attempt + 1)
                             logger.info(f"Retrying in {wait_time}s...")
-                            time.sleep(wait_time)
+                            timed_sleep(wait_time, self.source_name, "backoff")
                             continue
                         else:
                             return {
@@ -108,6 +119,8 @@ class AlphaVantageDataSource(BaseDataSource):
                                 'api_params': json.dumps(params)
                             }
                 
+                self._report_success()
+                
                 # Determine date range from response
                 date_range = self._extract_date_range(data, function)
                 
@@ -125,7 +138,7 @@ class AlphaVantageDataSource(BaseDataSource):
                 logger.error(f"Request error for {symbol} (attempt {attempt + 1}): {e}")
                 if attempt < self.max_retries - 1:
                     wait_time = self.retry_delay * (attempt + 1)
-                    time.sleep(wait_time)
+                    timed_sleep(wait_time, self.source_name, "backoff")
                 else:
                     return {
                         'status': 'error',
@@ -184,25 +197,80 @@ class AlphaVantageDataSource(BaseDataSource):
         end_date: Optional[date] = None
     ) -> List[StockDataDTO]:
         """
-        Fetch stock data (for backward compatibility with old interface)
-        Note: This is deprecated. Use fetch_raw_data() instead.
+        Fetch daily bars parsed from TIME_SERIES_DAILY
+        
+        Used when Alpha Vantage serves as a fallback source; for archiving
+        the untouched API response use fetch_raw_data().
+        
+        Args:
+            symbol: Stock ticker symbol
+            start_date: Start date for data fetch
+            end_date: End date for data fetch (inclusive)
+        
+        Returns:
+            List of StockDataDTO objects
         """
-        logger.warning(
-            "fetch_stock_data() is deprecated for Alpha Vantage. "
-            "Use fetch_raw_data() to get raw JSON responses."
-        )
-        return []
+        if end_date is None:
+            end_date = date.today()
+        if start_date is None:
+            start_date = end_date - timedelta(days=30)
+        
+        # compact returns the latest 100 trading days (~140 calendar days);
+        # full is premium-only, and its notice would be mistaken for throttling
+        earliest = date.today() - timedelta(days=140)
+        if start_date < earliest:
+            logger.warning(
+                f"Alpha Vantage serves the last 100 trading days only, "
+                f"fetching {symbol} from {earliest} instead of {start_date}"
+            )
+            start_date = earliest
+        result = self.fetch_raw_data(symbol, 'TIME_SERIES_DAILY', outputsize='compact')
+        
+        if result['status'] != 'success':
+            message = result.get('error_message') or 'unknown error'
+            if self.raise_errors:
+                error_class = RateLimitError if message.startswith('Rate limit') else DataSourceError
+                raise error_class(f"Error fetching {symbol}: {message}", self.source_name)
+            logger.error(f"Error fetching data for {symbol}: {message}")
+            return []
+        
+        series = json.loads(result['response_json']).get('Time Series (Daily)', {})
+        results = []
+        for day, values in series.items():
+            bar_date = datetime.strptime(day, '%Y-%m-%d').date()
+            if not start_date <= bar_date <= end_date:
+                continue
+            # TIME_SERIES_DAILY prices are not split/dividend adjusted (unlike
+            # yfinance's), so there is no adjusted close to report
+            results.append(StockDataDTO(
+                symbol=symbol.upper(),
+                date=bar_date,
+                open_price=float(values['1. open']),
+                high_price=float(values['2. high']),
+                low_price=float(values['3. low']),
+                close_price=float(values['4. close']),
+                adj_close_price=None,
+                volume=int(values['5. volume']),
+                data_source=self.source_name
+            ))
+        
+        results.sort(key=lambda x: x.date)
+        logger.info(f"Fetched {len(results)} records for {symbol}")
+        return results
     
     def fetch_latest_stock_data(self, symbol: str) -> Optional[StockDataDTO]:
         """
-        Fetch latest stock data (for backward compatibility)
-        Note: This is deprecated. Use fetch_raw_data() instead.
+        Fetch the latest daily bar for a symbol
+        
+        Args:
+            symbol: Stock ticker symbol
+        
+        Returns:
+            StockDataDTO object or None
         """
-        logger.warning(
-            "fetch_latest_stock_data() is deprecated for Alpha Vantage. "
-            "Use fetch_raw_data() to get raw JSON responses."
-        )
-        return None
+        end_date = date.today()
+        results = self.fetch_stock_data(symbol, end_date - timedelta(days=7), end_date)
+        return results[-1] if results else None
     
     def is_available(self) -> bool:
         """
@@ -215,7 +283,7 @@ class AlphaVantageDataSource(BaseDataSource):
                 'apikey': self.api_key
             }
             
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
+            response = self.session.get(self.BASE_URL, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -1,9 +1,37 @@
 """Base data source abstract class"""
 
+import json
+import logging
+import time
 from abc import ABC, abstractmethod
+from pathlib import Path
 from typing import List, Optional
 from datetime import datetime, date
 
+from src.utils.metrics import timed_sleep
+
+logger = logging.getLogger(__name__)
+
+
+class DataSourceError(Exception):
+    """Raised by a data source in raise_errors mode when a fetch fails"""
+    
+    def __init__(self, message: str, source: str = "unknown"):
+        super().__init__(message)
+        self.source = source
+
+
+class RateLimitError(DataSourceError):
+    """Raised in raise_errors mode when the provider is throttling requests"""
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check whether an exception looks like an HTTP 429 / throttling error"""
+    if isinstance(error, RateLimitError):
+        return True
+    message = str(error)
+    return "429" in message or "Too Many Requests" in message or "Rate limit" in message
+
 
 class StockDataDTO:
     """Data Transfer Object for stock data"""
@@ -48,6 +76,28 @@ class BaseDataSource(ABC):
     
     def __init__(self, source_name: str):
         self.source_name = source_name
+        # When True, failed fetches raise DataSourceError/RateLimitError instead
+        # of returning an empty list, so a composite source can fail over
+        self.raise_errors = False
+        # Optional AdaptiveRateController replacing the fixed request delay
+        self.rate_controller = None
+    
+    def _pace(self, delay: float) -> None:
+        """Wait before a request: adaptive rate if configured, else a fixed delay"""
+        if self.rate_controller is not None:
+            self.rate_controller.acquire()
+        else:
+            timed_sleep(delay, self.source_name, "pacing")
+    
+    def _report_success(self) -> None:
+        """Tell the rate controller a request succeeded"""
+        if self.rate_controller is not None:
+            self.rate_controller.on_success()
+    
+    def _report_throttle(self) -> None:
+        """Tell the rate controller a request was throttled"""
+        if self.rate_controller is not None:
+            self.rate_controller.on_throttle()
     
     @abstractmethod
     def fetch_stock_data(
@@ -82,6 +132,10 @@ class BaseDataSource(ABC):
         """
         pass
     
+    def close(self) -> None:
+        """Release resources held by the source (threads, sessions)"""
+        pass
+    
     @abstractmethod
     def is_available(self) -> bool:
         """
@@ -91,4 +145,47 @@ class BaseDataSource(ABC):
             True if available, False otherwise
         """
         pass
+    
+    def check_availability(self, cache_path: Optional[str] = None, ttl: float = 0.0) -> bool:
+        """
+        Check availability, reusing a recent successful probe if one is cached
+        
+        Only successful probes are cached, so an outage is always re-checked.
+        
+        Args:
+            cache_path: JSON file holding the last successful probe per source
+                (None always probes live)
+            ttl: Seconds a successful probe stays valid
+        
+        Returns:
+            True if available, False otherwise
+        """
+        cache = {}
+        path = Path(cache_path) if cache_path else None
+        
+        if path and ttl > 0 and path.exists():
+            try:
+                cache = json.loads(path.read_text())
+                checked_at = cache.get(self.source_name, 0.0)
+                if time.time() - checked_at < ttl:
+                    logger.info(
+                        f"Skipping {self.source_name} health probe "
+                        f"(last success {time.time() - checked_at:.0f}s ago)"
+                    )
+                    return True
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable health check cache {path}: {str(e)}")
+                cache = {}
+        
+        available = self.is_available()
+        
+        if available and path:
+            try:
+                cache[self.source_name] = time.time()
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps(cache))
+            except OSError as e:
+                logger.warning(f"Could not write health check cache {path}: {str(e)}")
+        
+        return available
 
@@ -0,0 +1,243 @@
+"""Per-source circuit breaker"""
+
+import logging
+import threading
+import time
+from datetime import date, timedelta
+from typing import Callable, List, Optional
+
+from src.utils.metrics import CIRCUIT_STATE
+from .base import BaseDataSource, DataSourceError, StockDataDTO
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(DataSourceError):
+    """Raised instead of calling a source whose circuit is open"""
+
+    def __init__(self, message: str, source: str = "unknown", retry_after: float = 0.0):
+        super().__init__(message, source)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    closed: requests flow; failures are counted and the circuit opens after
+    failure_threshold in a row. open: requests are rejected until the
+    cooldown elapses. half_open: a limited number of probe requests are let
+    through; a success closes the circuit, a failure reopens it with the
+    cooldown doubled (up to max_cooldown).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # Gauge values exported per state
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        cooldown: float = 300.0,
+        max_cooldown: float = 3600.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the breaker
+
+        Args:
+            name: Name used in logs and metrics (usually the source name)
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown: Seconds the circuit stays open before probing
+            max_cooldown: Upper bound for the cooldown after repeated failed probes
+            half_open_max_calls: Concurrent probe requests allowed while half-open
+            clock: Monotonic time function (injectable for tests)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._cooldown = cooldown
+        self._opened_at = 0.0
+        self._probes = 0
+        CIRCUIT_STATE.set(0, source=name)
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            logger.info(f"Circuit for {self.name}: {self._state} -> {state}")
+        self._state = state
+        CIRCUIT_STATE.set(self._STATE_VALUES[state], source=self.name)
+
+    def _refresh(self) -> None:
+        """Move open -> half_open once the cooldown has elapsed (lock held)"""
+        if self._state == self.OPEN and self._clock() >= self._opened_at + self._cooldown:
+            self._probes = 0
+            self._set_state(self.HALF_OPEN)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def retry_after(self) -> float:
+        """
+        Seconds until the circuit lets a probe through
+
+        Returns:
+            0 when requests are currently allowed
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == self.OPEN:
+                return max(self._opened_at + self._cooldown - self._clock(), 0.0)
+            if self._state == self.HALF_OPEN and self._probes >= self.half_open_max_calls:
+                # A probe is in flight; its outcome decides
+                return min(self.base_cooldown, 1.0)
+            return 0.0
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent, reserving a probe slot if half-open
+
+        Returns:
+            True if the caller may send the request
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful request"""
+        with self._lock:
+            self._failures = 0
+            if self._state != self.CLOSED:
+                self._cooldown = self.base_cooldown
+                self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed request"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                # Failed probe: back off harder before the next one
+                self._cooldown = min(self._cooldown * 2, self.max_cooldown)
+                self._open()
+                return
+
+            self._failures += 1
+            if self._state == self.CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        self._opened_at = self._clock()
+        self._probes = 0
+        self._set_state(self.OPEN)
+        logger.warning(f"Circuit for {self.name} open, next probe in {self._cooldown:.0f}s")
+
+
+class CircuitBreakerDataSource(BaseDataSource):
+    """
+    Wraps a data source with a circuit breaker
+
+    The wrapped source's own per-symbol retries are reduced (to one attempt
+    by default) so throttling trips the breaker quickly and the caller can
+    pause the whole work queue instead of sleeping symbol by symbol.
+    """
+
+    def __init__(
+        self,
+        source: BaseDataSource,
+        breaker: Optional[CircuitBreaker] = None,
+        max_retries: Optional[int] = 1
+    ):
+        """
+        Initialize the wrapper
+
+        Args:
+            source: Data source to protect
+            breaker: Circuit breaker (defaults to one named after the source)
+            max_retries: Attempts per fetch for the wrapped source (None keeps its setting)
+        """
+        super().__init__(source_name=source.source_name)
+        self.source = source
+        self.breaker = breaker or CircuitBreaker(source.source_name)
+        self.source.raise_errors = True
+        if max_retries is not None and hasattr(source, "max_retries"):
+            source.max_retries = max_retries
+
+    def fetch_stock_data(
+        self,
+        symbol: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[StockDataDTO]:
+        """
+        Fetch stock data unless the circuit is open
+
+        Args:
+            symbol: Stock ticker symbol
+            start_date: Start date for data fetch
+            end_date: End date for data fetch
+
+        Returns:
+            List of StockDataDTO objects
+
+        Raises:
+            CircuitOpenError: Circuit is open (raise_errors mode)
+            DataSourceError: The wrapped fetch failed (raise_errors mode)
+        """
+        if not self.breaker.allow_request():
+            retry_after = self.breaker.retry_after()
+            message = f"Circuit open for {self.source_name}, retry in {retry_after:.0f}s"
+            if self.raise_errors:
+                raise CircuitOpenError(message, self.source_name, retry_after)
+            logger.warning(f"Skipping {symbol}: {message}")
+            return []
+
+        try:
+            data = self.source.fetch_stock_data(symbol, start_date, end_date)
+        except Exception as e:
+            self.breaker.record_failure()
+            if self.raise_errors:
+                raise
+            logger.error(f"Error fetching data for {symbol}: {str(e)}")
+            return []
+
+        self.breaker.record_success()
+        return data
+
+    def fetch_latest_stock_data(self, symbol: str) -> Optional[StockDataDTO]:
+        """
+        Fetch the latest stock data for a symbol
+
+        Args:
+            symbol: Stock ticker symbol
+
+        Returns:
+            StockDataDTO object or None
+        """
+        end_date = date.today()
+        results = self.fetch_stock_data(symbol, end_date - timedelta(days=5), end_date)
+        return max(results, key=lambda x: x.date) if results else None
+
+    def is_available(self) -> bool:
+        return self.source.is_available()
+
+    def close(self) -> None:
+        self.source.close()
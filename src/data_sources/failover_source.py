@@ -0,0 +1,290 @@
+"""Composite data source with per-symbol routing, failover and hedged requests"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError, wait
+from datetime import date, timedelta
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from src.utils.metrics import HEDGED_REQUESTS, SOURCE_FAILOVERS
+from src.utils.tracing import span
+from .base import BaseDataSource, DataSourceError, StockDataDTO, is_rate_limit_error
+
+logger = logging.getLogger(__name__)
+
+
+class FailoverDataSource(BaseDataSource):
+    """
+    Routes each symbol through an ordered list of data sources
+
+    The preferred source for a symbol is its configured route, or the first
+    source. When it raises (errors, exhausted 429 retries) the next source is
+    tried. An empty result is a valid answer (no new bars) and is not failed
+    over, so quiet days don't double the request volume.
+
+    With hedging enabled, if the preferred source has not answered within
+    its recent latency percentile, the same fetch is issued to the next
+    source and whichever succeeds first is returned.
+    """
+
+    def __init__(
+        self,
+        sources: List[BaseDataSource],
+        routes: Optional[Dict[str, str]] = None,
+        hedge: bool = False,
+        hedge_percentile: float = 95.0,
+        hedge_min_samples: int = 20,
+        latency_window: int = 200,
+        max_workers: int = 4
+    ):
+        """
+        Initialize the composite source
+
+        Args:
+            sources: Data sources in failover order (first is the default primary)
+            routes: Optional symbol -> source_name map overriding the primary
+            hedge: Issue hedged requests to the next source on slow fetches
+            hedge_percentile: Latency percentile of the primary that triggers a hedge
+            hedge_min_samples: Successful fetches needed before hedging starts
+            latency_window: Number of recent latencies kept per source
+            max_workers: Threads available for hedged fetches
+        """
+        if not sources:
+            raise ValueError("At least one data source is required")
+
+        super().__init__(source_name="failover")
+        self.sources = list(sources)
+        self._by_name = {source.source_name: source for source in self.sources}
+
+        self.routes = {symbol.upper(): name for symbol, name in (routes or {}).items()}
+        unknown = set(self.routes.values()) - set(self._by_name)
+        if unknown:
+            raise ValueError(f"Routes reference unknown data sources: {sorted(unknown)}")
+
+        # Child sources must raise on failure for failover to see it
+        for source in self.sources:
+            source.raise_errors = True
+
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self._latencies: Dict[str, Deque[float]] = {
+            name: deque(maxlen=latency_window) for name in self._by_name
+        }
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hedged-fetch"
+        ) if hedge else None
+
+        logger.info(
+            f"Failover data source: order={[s.source_name for s in self.sources]}, "
+            f"routes={len(self.routes)}, hedge={hedge} (p{hedge_percentile:g})"
+        )
+
+    def sources_for(self, symbol: str) -> List[BaseDataSource]:
+        """
+        Get the sources to try for a symbol, preferred source first
+
+        Args:
+            symbol: Stock ticker symbol
+
+        Returns:
+            Ordered list of data sources
+        """
+        preferred = self.routes.get(symbol.upper())
+        if preferred is None:
+            return list(self.sources)
+        return [self._by_name[preferred]] + [
+            source for source in self.sources if source.source_name != preferred
+        ]
+
+    def hedge_delay(self, source: BaseDataSource) -> Optional[float]:
+        """
+        Seconds to wait for a source before hedging
+
+        Args:
+            source: Data source being waited on
+
+        Returns:
+            Latency at hedge_percentile, or None until enough samples exist
+        """
+        with self._lock:
+            samples = sorted(self._latencies[source.source_name])
+        if len(samples) < self.hedge_min_samples:
+            return None
+        rank = (len(samples) - 1) * self.hedge_percentile / 100
+        lower = int(rank)
+        upper = min(lower + 1, len(samples) - 1)
+        return samples[lower] + (samples[upper] - samples[lower]) * (rank - lower)
+
+    def _timed_fetch(
+        self,
+        source: BaseDataSource,
+        symbol: str,
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> List[StockDataDTO]:
+        """Fetch from one source, recording its latency on success"""
+        start = time.perf_counter()
+        with span(f"{source.source_name}.fetch", "fetch", symbol=symbol):
+            data = source.fetch_stock_data(symbol, start_date, end_date)
+        with self._lock:
+            self._latencies[source.source_name].append(time.perf_counter() - start)
+        return data
+
+    def _fetch_hedged(
+        self,
+        primary: BaseDataSource,
+        backup: BaseDataSource,
+        symbol: str,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        tried: Set[str]
+    ) -> Tuple[List[StockDataDTO], BaseDataSource]:
+        """
+        Fetch from primary, hedging to backup if primary is slow
+
+        Returns:
+            Tuple of (data, source that produced it)
+
+        Raises:
+            Exception: The last error if every issued request failed
+        """
+        delay = self.hedge_delay(primary)
+        primary_future = self._executor.submit(
+            self._timed_fetch, primary, symbol, start_date, end_date
+        )
+        if delay is None:
+            return primary_future.result(), primary
+
+        try:
+            return primary_future.result(timeout=delay), primary
+        except TimeoutError:
+            pass
+
+        logger.info(
+            f"{primary.source_name} slower than p{self.hedge_percentile:g} ({delay:.2f}s) "
+            f"for {symbol}, hedging to {backup.source_name}"
+        )
+        tried.add(backup.source_name)
+        backup_future = self._executor.submit(
+            self._timed_fetch, backup, symbol, start_date, end_date
+        )
+        pending = {primary_future: primary, backup_future: backup}
+        last_error: Optional[Exception] = None
+
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                source = pending.pop(future)
+                try:
+                    data = future.result()
+                except Exception as e:
+                    logger.warning(f"Hedged fetch from {source.source_name} failed: {str(e)}")
+                    last_error = e
+                    continue
+                # The slower request keeps running in the background; its result is dropped
+                HEDGED_REQUESTS.inc(winner="hedge" if source is backup else "primary")
+                return data, source
+
+        raise last_error
+
+    @staticmethod
+    def _next_untried(
+        candidates: List[BaseDataSource],
+        index: int,
+        tried: Set[str]
+    ) -> Optional[BaseDataSource]:
+        """First candidate after index that has not been tried yet"""
+        return next(
+            (c for c in candidates[index + 1:] if c.source_name not in tried), None
+        )
+
+    def fetch_stock_data(
+        self,
+        symbol: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[StockDataDTO]:
+        """
+        Fetch stock data, failing over between sources
+
+        Args:
+            symbol: Stock ticker symbol
+            start_date: Start date for data fetch
+            end_date: End date for data fetch
+
+        Returns:
+            List of StockDataDTO objects (empty if every source failed)
+        """
+        candidates = self.sources_for(symbol)
+        tried: Set[str] = set()
+
+        for index, source in enumerate(candidates):
+            if source.source_name in tried:
+                continue
+            tried.add(source.source_name)
+            backup = self._next_untried(candidates, index, tried)
+
+            try:
+                if self._executor is not None and backup is not None:
+                    data, _ = self._fetch_hedged(
+                        source, backup, symbol, start_date, end_date, tried
+                    )
+                    return data
+                return self._timed_fetch(source, symbol, start_date, end_date)
+
+            except Exception as e:
+                reason = "rate_limit" if is_rate_limit_error(e) else "error"
+                following = self._next_untried(candidates, index, tried)
+                if following is None:
+                    logger.error(f"All data sources failed for {symbol}: {str(e)}")
+                    break
+                logger.warning(
+                    f"{source.source_name} failed for {symbol} ({reason}), "
+                    f"failing over to {following.source_name}"
+                )
+                SOURCE_FAILOVERS.inc(
+                    from_source=source.source_name,
+                    to_source=following.source_name,
+                    reason=reason
+                )
+
+        if self.raise_errors:
+            raise DataSourceError(f"All data sources failed for {symbol}", self.source_name)
+        return []
+
+    def fetch_latest_stock_data(self, symbol: str) -> Optional[StockDataDTO]:
+        """
+        Fetch the latest stock data for a symbol
+
+        Args:
+            symbol: Stock ticker symbol
+
+        Returns:
+            StockDataDTO object or None
+        """
+        end_date = date.today()
+        results = self.fetch_stock_data(symbol, end_date - timedelta(days=5), end_date)
+        return max(results, key=lambda x: x.date) if results else None
+
+    def is_available(self) -> bool:
+        """
+        Check whether any underlying source is available
+
+        Returns:
+            True if at least one source is available
+        """
+        for source in self.sources:
+            if source.is_available():
+                return True
+            logger.warning(f"Data source {source.source_name} is not available")
+        return False
+
+    def close(self) -> None:
+        """Stop the hedging thread pool without waiting for abandoned fetches"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,290 @@
+"""Record/replay of HTTP traffic at the data source boundary"""
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.cookies import cookiejar_from_dict
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+
+from src.utils.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+
+# Cassette modes
+MODE_OFF = "off"
+MODE_RECORD = "record"    # Always hit the network and record every response
+MODE_REPLAY = "replay"    # Never hit the network; unknown requests fail
+MODE_AUTO = "auto"        # Replay known requests, record the rest
+CASSETTE_MODES = (MODE_OFF, MODE_RECORD, MODE_REPLAY, MODE_AUTO)
+
+# Query parameters excluded from matching: credentials/session tokens, and the
+# yfinance date window, which the crawler derives from today's date
+DEFAULT_IGNORED_PARAMS = ("apikey", "crumb", "period1", "period2")
+
+# Query parameters whose values are never written to a cassette
+SECRET_PARAMS = ("apikey", "crumb")
+
+# Response headers never written to a cassette (cookies are stored redacted)
+SECRET_HEADERS = ("set-cookie",)
+
+# Response headers that no longer apply to the decoded body a cassette stores
+ENCODING_HEADERS = ("content-encoding", "transfer-encoding", "content-length")
+
+# Endpoints whose response body is a session secret (the Yahoo crumb)
+SECRET_BODY_PATHS = ("/v1/test/getcrumb",)
+
+
+class CassetteMissError(requests.exceptions.ConnectionError):
+    """Raised in replay mode when a request has no recorded response"""
+
+
+class Cassette:
+    """
+    Gzip-compressed store of recorded HTTP interactions
+
+    Interactions are matched by method, URL and query parameters (minus
+    ignored ones). Repeated identical requests are replayed in recorded
+    order; once exhausted, the last response is reused.
+    """
+
+    def __init__(self, path: str, ignored_params: Tuple[str, ...] = DEFAULT_IGNORED_PARAMS):
+        """
+        Initialize a cassette
+
+        Args:
+            path: Cassette file path (conventionally ``*.json.gz``)
+            ignored_params: Query parameters excluded from request matching
+        """
+        self.path = Path(path)
+        self.ignored_params = {p.lower() for p in ignored_params}
+        self._interactions: List[Dict[str, Any]] = []
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        if self.path.exists():
+            self.load()
+
+    def request_key(self, request: PreparedRequest) -> str:
+        """Build the matching key for a request"""
+        parts = urlsplit(request.url)
+        params = sorted(
+            (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if k.lower() not in self.ignored_params
+        )
+        key = f"{request.method} {parts.scheme}://{parts.netloc}{parts.path}?{urlencode(params)}"
+
+        if request.body:
+            body = request.body if isinstance(request.body, bytes) else str(request.body).encode()
+            key += f" body={hashlib.sha1(body).hexdigest()}"
+        return key
+
+    @staticmethod
+    def redact_url(url: str) -> str:
+        """Replace secret query parameter values in a URL"""
+        parts = urlsplit(url)
+        params = [
+            (k, "REDACTED" if k.lower() in SECRET_PARAMS else v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        ]
+        return parts._replace(query=urlencode(params)).geturl()
+
+    @staticmethod
+    def redact_cookies(cookies: Dict[str, str]) -> Dict[str, str]:
+        """Keep cookie names, which clients check for, but not their values"""
+        return {name: "REDACTED" for name in cookies}
+
+    def load(self) -> None:
+        """Load interactions from disk"""
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            self._interactions = json.load(f)["interactions"]
+
+        self._by_key.clear()
+        for interaction in self._interactions:
+            self._by_key.setdefault(interaction["key"], []).append(interaction)
+        logger.info(f"Loaded {len(self._interactions)} HTTP interactions from {self.path}")
+
+    def save(self) -> None:
+        """Write interactions to disk if anything was recorded"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(self.path, "wt", encoding="utf-8") as f:
+                json.dump({"version": 1, "interactions": self._interactions}, f)
+            self._dirty = False
+        logger.info(f"Saved {len(self._interactions)} HTTP interactions to {self.path}")
+
+    def find(self, key: str) -> Optional[Dict[str, Any]]:
+        """Find the next recorded interaction for a key"""
+        with self._lock:
+            candidates = self._by_key.get(key)
+            if not candidates:
+                return None
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            return candidates[min(index, len(candidates) - 1)]
+
+    def record(self, key: str, response: Response, elapsed: float) -> None:
+        """Record a live response, redacting cookies and session secrets"""
+        body = response.content
+        if urlsplit(response.url).path.endswith(SECRET_BODY_PATHS):
+            body = b"REDACTED"
+        interaction = {
+            "key": key,
+            "url": self.redact_url(response.url),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                k: v for k, v in response.headers.items()
+                if k.lower() not in ENCODING_HEADERS + SECRET_HEADERS
+            },
+            "cookies": self.redact_cookies(response.cookies.get_dict()),
+            "body": base64.b64encode(body).decode("ascii"),
+            "elapsed": round(elapsed, 6),
+        }
+        with self._lock:
+            self._interactions.append(interaction)
+            self._by_key.setdefault(key, []).append(interaction)
+            self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._interactions)
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    requests transport adapter that records or replays through a Cassette
+
+    In replay, responses can be delayed (fixed seconds or the recorded
+    latency) and HTTP 429 responses injected at random, so throttling
+    behaviour can be exercised deterministically without network access.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        mode: str = MODE_AUTO,
+        latency: Optional[float] = None,
+        rate_limit_probability: float = 0.0,
+        seed: int = 42
+    ):
+        """
+        Initialize the adapter
+
+        Args:
+            cassette: Cassette to record into / replay from
+            mode: One of record, replay or auto
+            latency: Replay delay in seconds; None replays the recorded latency,
+                0 disables delays
+            rate_limit_probability: Chance of answering a replayed request with 429
+            seed: Seed for rate-limit injection
+        """
+        super().__init__()
+        if mode not in (MODE_RECORD, MODE_REPLAY, MODE_AUTO):
+            raise ValueError(f"Invalid cassette mode: {mode}")
+
+        self.cassette = cassette
+        self.mode = mode
+        self.latency = latency
+        self.rate_limit_probability = rate_limit_probability
+        self._random = random.Random(seed)
+        self._live = HTTPAdapter()
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        key = self.cassette.request_key(request)
+
+        if self.mode != MODE_RECORD:
+            interaction = self.cassette.find(key)
+            record_cache("http_cassette", interaction is not None)
+            if interaction is not None:
+                return self._replay(request, interaction)
+            if self.mode == MODE_REPLAY:
+                raise CassetteMissError(f"No recorded response for {key}", request=request)
+
+        start = time.perf_counter()
+        response = self._live.send(request, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        # Reading content here makes the body available for both caller and cassette
+        _ = response.content
+        self.cassette.record(key, response, elapsed)
+        return response
+
+    def _replay(self, request: PreparedRequest, interaction: Dict[str, Any]) -> Response:
+        """Build a Response from a recorded interaction"""
+        delay = interaction.get("elapsed", 0.0) if self.latency is None else self.latency
+        if delay:
+            time.sleep(delay)
+
+        response = Response()
+        response.request = request
+        response.url = interaction.get("url") or request.url
+        response.encoding = None
+
+        if self._random.random() < self.rate_limit_probability:
+            response.status_code = 429
+            response.reason = "Too Many Requests"
+            response.headers = CaseInsensitiveDict({"Content-Type": "text/plain"})
+            response._content = b"Too Many Requests"
+            return response
+
+        response.status_code = interaction["status"]
+        response.reason = interaction.get("reason")
+        response.headers = CaseInsensitiveDict(interaction.get("headers", {}))
+        response.cookies = cookiejar_from_dict(interaction.get("cookies", {}))
+        response._content = base64.b64decode(interaction["body"])
+        return response
+
+    def close(self) -> None:
+        self._live.close()
+        self.cassette.save()
+
+
+def create_cassette_session(
+    path: str,
+    mode: str = MODE_AUTO,
+    latency: Optional[float] = None,
+    rate_limit_probability: float = 0.0,
+    ignored_params: Tuple[str, ...] = DEFAULT_IGNORED_PARAMS
+) -> requests.Session:
+    """
+    Create a requests session whose HTTP(S) traffic goes through a cassette
+
+    The cassette is written when the session is closed.
+
+    Args:
+        path: Cassette file path
+        mode: One of record, replay or auto
+        latency: Replay delay in seconds (None replays recorded latency)
+        rate_limit_probability: Chance of injecting a 429 on replay
+        ignored_params: Query parameters excluded from request matching
+
+    Returns:
+        Configured requests.Session
+    """
+    adapter = CassetteAdapter(
+        Cassette(path, ignored_params=ignored_params),
+        mode=mode,
+        latency=latency,
+        rate_limit_probability=rate_limit_probability
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    logger.info(f"HTTP cassette enabled: {path} (mode={mode})")
+    return session
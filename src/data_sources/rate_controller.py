@@ -0,0 +1,137 @@
+"""Adaptive (AIMD) request rate control per data source"""
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from src.utils.metrics import REQUEST_RATE, timed_sleep
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveRateController:
+    """
+    Paces requests to a data source with additive-increase/multiplicative-decrease
+
+    Every successful response raises the allowed rate by a fixed step; a
+    throttled response (HTTP 429, provider rate-limit note) multiplies it by
+    a factor below one. At most one cut is applied per request interval, so a
+    burst of 429s from the same congestion event only halves the rate once.
+    The learned rate is persisted per source so the next run starts near it.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        initial_rate: float,
+        min_rate: float = 0.02,
+        max_rate: float = 5.0,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+        state_path: Optional[str] = None
+    ):
+        """
+        Initialize the controller
+
+        Args:
+            source: Data source name (key in the state file)
+            initial_rate: Requests per second when no learned rate is stored
+            min_rate: Lower bound in requests per second
+            max_rate: Upper bound in requests per second
+            increase: Requests per second added after each success
+            decrease: Factor applied to the rate on throttling (0 < decrease < 1)
+            state_path: JSON file persisting learned rates (None disables persistence)
+        """
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+
+        self.source = source
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.state_path = Path(state_path) if state_path else None
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._last_cut = 0.0
+
+        stored = self._load()
+        self.rate = self._clamp(stored if stored is not None else initial_rate)
+        REQUEST_RATE.set(self.rate, source=source)
+        logger.info(
+            f"Request rate for {source}: {self.rate:.3f}/s "
+            f"({'learned' if stored is not None else 'initial'})"
+        )
+
+    def _clamp(self, rate: float) -> float:
+        return min(max(rate, self.min_rate), self.max_rate)
+
+    @property
+    def interval(self) -> float:
+        """Seconds between requests at the current rate"""
+        return 1.0 / self.rate
+
+    def acquire(self) -> None:
+        """Block until the next request may be sent"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        timed_sleep(slot - now, self.source, "pacing")
+
+    def on_success(self) -> None:
+        """Additively increase the rate after a successful response"""
+        with self._lock:
+            self.rate = self._clamp(self.rate + self.increase)
+            REQUEST_RATE.set(self.rate, source=self.source)
+
+    def on_throttle(self) -> None:
+        """Multiplicatively decrease the rate after a throttled response"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_cut < self.interval:
+                return
+            self._last_cut = now
+            previous = self.rate
+            self.rate = self._clamp(self.rate * self.decrease)
+            # The next request waits a full interval at the reduced rate
+            self._next_slot = max(self._next_slot, now + self.interval)
+            REQUEST_RATE.set(self.rate, source=self.source)
+        logger.warning(
+            f"Throttled by {self.source}: request rate {previous:.3f}/s -> {self.rate:.3f}/s"
+        )
+
+    def _load(self) -> Optional[float]:
+        """Read the learned rate for this source, if any"""
+        if self.state_path is None or not self.state_path.exists():
+            return None
+        try:
+            state = json.loads(self.state_path.read_text())
+            entry = state.get(self.source)
+            return float(entry["rate"]) if entry else None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable rate state {self.state_path}: {str(e)}")
+            return None
+
+    def save(self) -> None:
+        """Persist the current rate, merging with other sources' entries"""
+        if self.state_path is None:
+            return
+        try:
+            state = {}
+            if self.state_path.exists():
+                state = json.loads(self.state_path.read_text())
+            state[self.source] = {
+                "rate": round(self.rate, 6),
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(state, indent=2, sort_keys=True))
+            tmp_path.replace(self.state_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not save rate state {self.state_path}: {str(e)}")
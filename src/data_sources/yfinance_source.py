@@ -1,13 +1,18 @@
 """Yahoo Finance data source implementation"""
 
 import logging
-import time
+import threading
 from typing import List, Optional
 from datetime import datetime, date, timedelta
+import requests
 import yfinance as yf
 import pandas as pd
 
-from .base import BaseDataSource, StockDataDTO
+from src.utils.metrics import HTTP_REQUEST_SECONDS, RATE_LIMIT_HITS, timed_sleep
+from src.utils.tracing import span, traced
+from .base import (
+    BaseDataSource, DataSourceError, RateLimitError, StockDataDTO, is_rate_limit_error,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +20,22 @@ logger = logging.getLogger(__name__)
 class YFinanceDataSource(BaseDataSource):
     """Yahoo Finance data source implementation"""
     
-    def __init__(self, request_delay: float = 2.0, max_retries: int = 5, retry_delay: float = 10.0):
+    def __init__(
+        self,
+        request_delay: float = 2.0,
+        max_retries: int = 5,
+        retry_delay: float = 10.0,
+        session: Optional[requests.Session] = None
+    ):
         super().__init__(source_name="yfinance")
         self.request_delay = request_delay
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        # HTTP session shared with yfinance, e.g. a record/replay cassette session;
+        # its response hook records the status codes the fetching thread saw
+        self.session = session or requests.Session()
+        self.session.hooks["response"].append(self._record_response)
+        self._http = threading.local()
         logger.info(
             f"YFinance initialized with: delay={request_delay}s, "
             f"retries={max_retries}, retry_delay={retry_delay}s"
@@ -44,23 +60,77 @@ class YFinanceDataSource(BaseDataSource):
         """
         for attempt in range(self.max_retries):
             try:
-                return self._fetch_with_retry(symbol, start_date, end_date)
+                results = self._fetch_with_retry(symbol, start_date, end_date)
+                # An empty result (no bars in the range, or a swallowed error) says
+                # nothing about the provider's capacity, so it does not raise the rate
+                if results:
+                    self._report_success()
+                return results
             except Exception as e:
-                if "429" in str(e) or "Too Many Requests" in str(e):
+                if is_rate_limit_error(e):
+                    RATE_LIMIT_HITS.inc(source=self.source_name)
+                    self._report_throttle()
                     if attempt < self.max_retries - 1:
-                        wait_time = self.retry_delay * (attempt + 1)
+                        # With a rate controller the reduced rate paces the retry
+                        wait_time = 0 if self.rate_controller else self.retry_delay * (attempt + 1)
                         logger.warning(
                             f"Rate limit hit for {symbol}, retrying in {wait_time}s "
                             f"(attempt {attempt + 1}/{self.max_retries})"
                         )
-                        time.sleep(wait_time)
+                        timed_sleep(wait_time, self.source_name, "backoff")
                         continue
+                    if self.raise_errors:
+                        raise RateLimitError(
+                            f"Rate limited fetching {symbol}: {str(e)}", self.source_name
+                        ) from e
                 logger.error(f"Error fetching data for {symbol}: {str(e)}", exc_info=True)
+                if self.raise_errors:
+                    raise DataSourceError(
+                        f"Error fetching {symbol}: {str(e)}", self.source_name
+                    ) from e
                 return []
         
         logger.error(f"Max retries reached for {symbol}")
         return []
     
+    def _record_response(self, response: requests.Response, *args, **kwargs) -> None:
+        """Session response hook remembering the last status and any HTTP 429"""
+        self._http.status = response.status_code
+        if response.status_code == 429:
+            self._http.throttled = True
+    
+    def _history(self, ticker: yf.Ticker, symbol: str, start_date: date, end_date: date) -> pd.DataFrame:
+        """
+        Fetch daily bars, raising on provider errors instead of returning an empty frame
+        
+        Args:
+            ticker: yfinance Ticker using self.session
+            symbol: Stock ticker symbol
+            start_date: Start date for data fetch
+            end_date: End date for data fetch
+        
+        Returns:
+            History DataFrame (empty when Yahoo has no bars in the range)
+        
+        Raises:
+            RateLimitError: Yahoo answered with HTTP 429
+            Exception: Any other yfinance error
+        """
+        self._http.status = None
+        self._http.throttled = False
+        try:
+            return ticker.history(start=start_date, end=end_date, raise_errors=True)
+        except Exception as e:
+            if self._http.throttled:
+                raise RateLimitError(
+                    f"Yahoo returned HTTP 429 for {symbol}", self.source_name
+                ) from e
+            # A valid chart without quotes: the range holds no trading days
+            if self._http.status == 200 and "No price data found" in str(e):
+                return pd.DataFrame()
+            raise
+    
+    @traced("yfinance.fetch_attempt", category="fetch")
     def _fetch_with_retry(
         self,
         symbol: str,
@@ -70,7 +140,7 @@ class YFinanceDataSource(BaseDataSource):
         """Internal method to fetch data with rate limiting"""
         try:
             # Add delay to avoid hitting rate limits
-            time.sleep(self.request_delay)
+            self._pace(self.request_delay)
             # Set default dates if not provided
             if end_date is None:
                 end_date = date.today()
@@ -82,52 +152,60 @@ class YFinanceDataSource(BaseDataSource):
             )
             
             # Create ticker object
-            ticker = yf.Ticker(symbol)
+            ticker = yf.Ticker(symbol, session=self.session)
             
             # Fetch historical data
-            hist = ticker.history(start=start_date, end=end_date)
+            with span("yfinance.history", "http", symbol=symbol), \
+                    HTTP_REQUEST_SECONDS.time(source=self.source_name, endpoint="history"):
+                hist = self._history(ticker, symbol, start_date, end_date)
             
             if hist.empty:
                 logger.warning(f"No historical data found for {symbol}")
                 return []
             
             # Get additional info
-            info = ticker.info
+            with span("yfinance.info", "http", symbol=symbol), \
+                    HTTP_REQUEST_SECONDS.time(source=self.source_name, endpoint="info"):
+                info = ticker.info
             market_cap = info.get('marketCap')
             pe_ratio = info.get('trailingPE') or info.get('forwardPE')
             
             # Convert to StockDataDTO list
-            results = []
-            for idx, row in hist.iterrows():
-                # Calculate turnover rate if possible
-                turnover_rate = None
-                if market_cap and row.get('Volume') and row.get('Close'):
-                    try:
-                        # Rough approximation: (Volume * Price) / Market Cap
-                        turnover_rate = (row['Volume'] * row['Close']) / market_cap * 100
-                    except (ZeroDivisionError, TypeError):
-                        pass
-                
-                stock_data = StockDataDTO(
-                    symbol=symbol.upper(),
-                    date=idx.date(),
-                    open_price=float(row['Open']) if not pd.isna(row['Open']) else None,
-                    high_price=float(row['High']) if not pd.isna(row['High']) else None,
-                    low_price=float(row['Low']) if not pd.isna(row['Low']) else None,
-                    close_price=float(row['Close']) if not pd.isna(row['Close']) else None,
-                    adj_close_price=float(row['Close']) if not pd.isna(row['Close']) else None,
-                    volume=int(row['Volume']) if not pd.isna(row['Volume']) else None,
-                    market_cap=market_cap,
-                    pe_ratio=pe_ratio,
-                    turnover_rate=turnover_rate,
-                    data_source=self.source_name
-                )
-                results.append(stock_data)
+            with span("yfinance.to_dtos", "fetch", symbol=symbol, rows=len(hist)):
+                results = []
+                for idx, row in hist.iterrows():
+                    # Calculate turnover rate if possible
+                    turnover_rate = None
+                    if market_cap and row.get('Volume') and row.get('Close'):
+                        try:
+                            # Rough approximation: (Volume * Price) / Market Cap
+                            turnover_rate = (row['Volume'] * row['Close']) / market_cap * 100
+                        except (ZeroDivisionError, TypeError):
+                            pass
+                    
+                    stock_data = StockDataDTO(
+                        symbol=symbol.upper(),
+                        date=idx.date(),
+                        open_price=float(row['Open']) if not pd.isna(row['Open']) else None,
+                        high_price=float(row['High']) if not pd.isna(row['High']) else None,
+                        low_price=float(row['Low']) if not pd.isna(row['Low']) else None,
+                        close_price=float(row['Close']) if not pd.isna(row['Close']) else None,
+                        adj_close_price=float(row['Close']) if not pd.isna(row['Close']) else None,
+                        volume=int(row['Volume']) if not pd.isna(row['Volume']) else None,
+                        market_cap=market_cap,
+                        pe_ratio=pe_ratio,
+                        turnover_rate=turnover_rate,
+                        data_source=self.source_name
+                    )
+                    results.append(stock_data)
             
             logger.info(f"Fetched {len(results)} records for {symbol}")
             return results
         
         except Exception as e:
+            # Let fetch_stock_data() retry throttled requests and surface errors
+            if self.raise_errors or is_rate_limit_error(e):
+                raise
             logger.error(f"Error fetching data for {symbol}: {str(e)}", exc_info=True)
             return []
     
@@ -172,13 +250,13 @@ class YFinanceDataSource(BaseDataSource):
         """
         try:
             # Use a simpler check to avoid rate limits
-            ticker = yf.Ticker("AAPL")
+            ticker = yf.Ticker("AAPL", session=self.session)
             # Just try to get basic history instead of full info
             hist = ticker.history(period="1d")
             return not hist.empty
         except Exception as e:
             # If we get rate limited, consider it "available" but warn
-            if "429" in str(e) or "Too Many Requests" in str(e):
+            if is_rate_limit_error(e):
                 logger.warning(f"Yahoo Finance rate limited (will retry later): {str(e)}")
                 return True  # Consider it available, just rate limited
             logger.error(f"Yahoo Finance is not available: {str(e)}")
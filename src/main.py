@@ -1,15 +1,24 @@
 """Main application entry point"""
 
+import os
+import socket
 import sys
+import time
 import logging
-from datetime import datetime, timedelta
-from typing import List
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
 
 from src.config import get_settings
-from src.data_sources import YFinanceDataSource
-from src.storage import MySQLStorage
-from src.scheduler import JobScheduler
+from src.data_sources.base import DataSourceError
+from src.scheduler.distributed_queue import DistributedSymbolQueue
+from src.scheduler.symbol_queue import SymbolQueue
 from src.utils import setup_logging
+from src.utils.metrics import (
+    REGISTRY, JOB_DURATION_SECONDS, SYMBOLS_PROCESSED, MetricsServer, measure_save,
+    timed_sleep,
+)
+from src.utils.tracing import PROFILE_MODES, TRACER, run_profiler, span
 
 logger = logging.getLogger(__name__)
 
@@ -17,15 +26,35 @@ logger = logging.getLogger(__name__)
 class StockCrawlerApp:
     """Main application class for stock data crawler"""
     
-    def __init__(self):
-        """Initialize the application"""
+    def __init__(self, profile: Optional[str] = None, trace: bool = False):
+        """
+        Initialize the application
+        
+        Args:
+            profile: Profile every run with cprofile or sampling (None disables)
+            trace: Write a Chrome trace file per run (also enabled by TRACE_ENABLED)
+        """
         self.settings = get_settings()
+        self.profile = profile
+        self.trace_enabled = trace or self.settings.trace_enabled
         self.data_source = None
         self.storage = None
         self.scheduler = None
+        self.http_session = None
+        self.metrics_server = None
+        self.breakers = []
+        self.rate_controllers = []
+        self.work_queue = None
+        self.rollups = None
+        self.quality = None
         
         # Setup logging
-        setup_logging(log_level=self.settings.log_level)
+        setup_logging(
+            log_level=self.settings.log_level,
+            log_format=self.settings.log_format,
+            max_bytes=self.settings.log_max_bytes,
+            backup_count=self.settings.log_backup_count
+        )
     
     def initialize(self) -> bool:
         """
@@ -37,21 +66,98 @@ class StockCrawlerApp:
         try:
             logger.info("Initializing Stock Crawler Application...")
             
+            # Deferred so --help and import-only use stay fast
+            from src.data_sources import (
+                AdaptiveRateController, AlphaVantageDataSource, CircuitBreaker,
+                CircuitBreakerDataSource, FailoverDataSource, YFinanceDataSource,
+                create_cassette_session,
+            )
+            from src.storage import create_storage
+            
+            # Optional record/replay of data source HTTP traffic
+            if self.settings.http_cassette_mode != "off":
+                self.http_session = create_cassette_session(
+                    self.settings.http_cassette_path,
+                    mode=self.settings.http_cassette_mode,
+                    latency=self.settings.http_replay_latency,
+                    rate_limit_probability=self.settings.http_replay_rate_limit_probability
+                )
+            
             # Initialize data source
             logger.info(f"Initializing data source: {self.settings.default_data_source}")
-            self.data_source = YFinanceDataSource(
-                request_delay=self.settings.api_request_delay,
-                max_retries=self.settings.api_max_retries,
-                retry_delay=self.settings.api_retry_delay
-            )
+            sources = [
+                YFinanceDataSource(
+                    request_delay=self.settings.api_request_delay,
+                    max_retries=self.settings.api_max_retries,
+                    retry_delay=self.settings.api_retry_delay,
+                    session=self.http_session
+                )
+            ]
+            
+            # Fall back to Alpha Vantage on errors/429s when enabled
+            if self.settings.alphavantage_enabled and self.settings.alphavantage_api_key:
+                logger.info("Enabling Alpha Vantage fallback")
+                sources.append(AlphaVantageDataSource(
+                    api_key=self.settings.alphavantage_api_key,
+                    session=self.http_session
+                ))
             
-            if not self.data_source.is_available():
+            # Learned per-source request rates replace the fixed delays
+            if self.settings.adaptive_rate_enabled:
+                for source in sources:
+                    source.rate_controller = AdaptiveRateController(
+                        source.source_name,
+                        initial_rate=1.0 / max(source.request_delay, 0.01),
+                        min_rate=self.settings.adaptive_rate_min,
+                        max_rate=self.settings.adaptive_rate_max,
+                        increase=self.settings.adaptive_rate_increase,
+                        decrease=self.settings.adaptive_rate_decrease,
+                        state_path=self.settings.adaptive_rate_state_path
+                    )
+                    self.rate_controllers.append(source.rate_controller)
+            
+            # Per-source circuit breakers; throttling pauses the whole queue
+            if self.settings.circuit_breaker_enabled:
+                self.breakers = [
+                    CircuitBreaker(
+                        source.source_name,
+                        failure_threshold=self.settings.circuit_failure_threshold,
+                        cooldown=self.settings.circuit_cooldown,
+                        max_cooldown=self.settings.circuit_max_cooldown
+                    )
+                    for source in sources
+                ]
+                sources = [
+                    CircuitBreakerDataSource(source, breaker)
+                    for source, breaker in zip(sources, self.breakers)
+                ]
+            
+            if len(sources) > 1:
+                self.data_source = FailoverDataSource(
+                    sources,
+                    routes=self.settings.source_routes_map,
+                    hedge=self.settings.hedge_requests,
+                    hedge_percentile=self.settings.hedge_latency_percentile
+                )
+            else:
+                self.data_source = sources[0]
+            
+            # Failed fetches raise so the symbol can be requeued
+            self.data_source.raise_errors = bool(self.breakers)
+            
+            if self.settings.health_check_mode == "off":
+                logger.info("Data source health check disabled")
+            elif not self.data_source.check_availability(
+                cache_path=self.settings.health_check_cache_path
+                if self.settings.health_check_mode == "cached" else None,
+                ttl=self.settings.health_check_ttl
+            ):
                 logger.error("Data source is not available")
                 return False
             
             # Initialize storage
             logger.info("Initializing storage...")
-            self.storage = MySQLStorage(self.settings.get_database_url())
+            self.storage = create_storage(self.settings)
             
             if not self.storage.connect():
                 logger.error("Failed to connect to storage")
@@ -61,9 +167,47 @@ class StockCrawlerApp:
                 logger.error("Failed to initialize database schema")
                 return False
             
-            # Initialize scheduler
-            logger.info("Initializing scheduler...")
-            self.scheduler = JobScheduler()
+            # Replicas sharing the database split the symbols between them
+            if self.settings.work_queue_enabled:
+                engine = getattr(self.storage, "engine", None)
+                if engine is None:
+                    logger.error("The distributed work queue needs a SQL storage backend")
+                    return False
+                from src.storage import WorkQueue
+                self.work_queue = WorkQueue(
+                    engine,
+                    worker_id=self.worker_id,
+                    lease_seconds=self.settings.work_queue_lease_seconds,
+                    max_attempts=self.settings.symbol_max_attempts
+                )
+                logger.info(f"Distributed work queue enabled as worker {self.worker_id}")
+            
+            # Weekly/monthly bars are derived from the stored daily bars
+            if self.settings.rollup_periods_list:
+                if hasattr(self.storage, "read_frame"):
+                    from src.analytics import RollupEngine
+                    self.rollups = RollupEngine(self.storage, self.settings.rollup_periods_list)
+                else:
+                    logger.warning("Rollups need a SQL storage backend, disabled")
+            
+            # Correlations are updated from the screening panel refreshed after each crawl
+            if self.settings.correlation_dir and not self.settings.screening_cache_path:
+                logger.warning(
+                    "Rolling correlations need SCREENING_CACHE_PATH, disabled "
+                    "(CORRELATION_DIR is set but the screening panel is not refreshed)"
+                )
+            
+            # Fetched bars are checked before they reach storage
+            if self.settings.quality_checks_enabled:
+                from src.validation import QualityGate
+                engine = getattr(self.storage, "engine", None)
+                if engine is None:
+                    logger.info("No SQL storage backend: quarantined bars are only logged")
+                self.quality = QualityGate(
+                    engine,
+                    max_jump=self.settings.quality_max_jump,
+                    worker_id=self.worker_id
+                )
             
             logger.info("Application initialized successfully")
             return True
@@ -72,23 +216,223 @@ class StockCrawlerApp:
             logger.error(f"Initialization failed: {str(e)}", exc_info=True)
             return False
     
-    def fetch_and_store_data(self) -> None:
-        """Fetch data for all configured symbols and store in database"""
+    @property
+    def worker_id(self) -> str:
+        """Name of this replica in the work queue and scheduler lease"""
+        return self.settings.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    
+    def _refresh_screening_panel(self, changed_since: date) -> None:
+        """Merge the run's new bars into the cached screening panel and correlations"""
+        from src.analytics import load_panel, update_correlations
+        try:
+            with span("screening_panel", "stage"):
+                panel = load_panel(
+                    self.storage,
+                    self.settings.screening_cache_path,
+                    max_days=self.settings.screening_max_days,
+                    changed_since=changed_since
+                )
+        except Exception as e:
+            logger.error(f"Failed to refresh the screening panel: {str(e)}", exc_info=True)
+            return
+        
+        if not self.settings.correlation_dir:
+            return
+        try:
+            with span("correlations", "stage"):
+                update_correlations(
+                    panel,
+                    self.settings.correlation_dir,
+                    self.settings.correlation_windows_list
+                )
+        except Exception as e:
+            logger.error(f"Failed to update rolling correlations: {str(e)}", exc_info=True)
+    
+    def maintain_partitions(self) -> None:
+        """
+        Create upcoming MySQL partitions and drop expired raw partitions
+        
+        Tables that are not partitioned yet are only reported: converting
+        rebuilds them, which would block the crawl, so it is left to
+        ``python utils.py partitions --apply``.
+        """
+        engine = getattr(self.storage, "engine", None)
+        if engine is None:
+            logger.warning("Partitioning needs a SQL storage backend, skipping")
+            return
+        
+        from src.storage import PartitionManager
+        from src.storage.partitioning import default_specs
+        try:
+            manager = PartitionManager(
+                engine,
+                default_specs(self.settings.raw_retention_months),
+                ahead=self.settings.partitions_ahead,
+                retention_action=self.settings.raw_retention_action,
+                convert=False
+            )
+        except ValueError as e:
+            logger.error(f"Invalid partition settings: {str(e)}")
+            return
+        
+        with span("maintain_partitions", "job"):
+            statements = manager.maintain()
+        logger.info(f"Partition maintenance ran {len(statements)} statements")
+    
+    def archive_raw_data(self) -> None:
+        """Move raw API responses past the archive horizon to compressed files"""
+        from src.storage import RawDataStorage
+        from src.storage.engine import pool_options_from_settings
+        
+        raw_storage = RawDataStorage(
+            self.settings.get_database_url(),
+            pool_options=pool_options_from_settings(self.settings),
+            archive_dir=self.settings.raw_archive_dir
+        )
+        if not raw_storage.connect():
+            return
+        try:
+            before = datetime.utcnow() - timedelta(days=self.settings.raw_archive_after_days)
+            with span("archive_raw_data", "job"):
+                raw_storage.archive_raw_data(before)
+        finally:
+            raw_storage.disconnect()
+    
+    def fetch_and_store_data(self, symbols: Optional[List[str]] = None) -> None:
+        """
+        Run one fetch job, with optional tracing and profiling
+        
+        Args:
+            symbols: Symbols to process (defaults to all configured symbols)
+        """
+        run_id = datetime.now().strftime("run-%Y%m%d-%H%M%S")
+        if self.trace_enabled:
+            TRACER.start()
+        
+        try:
+            with run_profiler(self.profile, self.settings.profile_dir, run_id):
+                with span("fetch_and_store_data", "job"):
+                    self._fetch_and_store_all(symbols)
+        
+        finally:
+            if self.trace_enabled:
+                TRACER.stop()
+                TRACER.write(str(Path(self.settings.trace_dir) / f"{run_id}.json"))
+                for entry in TRACER.summary(top=10):
+                    logger.info(
+                        f"Span {entry['name']}: {entry['count']} calls, "
+                        f"total {entry['total_seconds']:.3f}s, self {entry['self_seconds']:.3f}s"
+                    )
+    
+    def _circuit_wait(self) -> float:
+        """
+        Seconds until any data source accepts requests again
+        
+        Returns:
+            0 if at least one source's circuit lets requests through
+        """
+        if not self.breakers:
+            return 0.0
+        return min(breaker.retry_after() for breaker in self.breakers)
+    
+    def _reschedule(self, symbols: List[str], delay: float) -> None:
+        """Run the remaining symbols as a one-off job once sources recover"""
+        run_date = datetime.now() + timedelta(seconds=delay)
+        self.scheduler.add_date_job(
+            func=self.fetch_and_store_data,
+            run_date=run_date,
+            job_id="fetch_stock_data_resume",
+            job_name="Resume Fetch Stock Data",
+            args=(symbols,)
+        )
+        logger.warning(
+            f"Data sources unavailable for {delay:.0f}s; rescheduled "
+            f"{len(symbols)} remaining symbols for {run_date:%Y-%m-%d %H:%M:%S}"
+        )
+    
+    def _fetch_and_store_all(self, symbols: Optional[List[str]] = None) -> None:
+        """Fetch data for the given (default: all configured) symbols and store in database"""
+        job_start = time.perf_counter()
+        
         try:
             logger.info("=" * 60)
             logger.info(f"Starting data fetch job at {datetime.now()}")
             
-            symbols = self.settings.symbols_list
+            symbols = symbols or self.settings.symbols_list
             logger.info(f"Fetching data for {len(symbols)} symbols: {symbols}")
             
             total_saved = 0
+            # Earliest new or changed date per symbol, for the rollups
+            changed_since = {}
+            if self.quality is not None:
+                self.quality.start_run()
+            # The price jump rule compares with the latest stored close, read with the dates
+            closes = self.quality is not None and self.settings.quality_max_jump > 0
             
-            for symbol in symbols:
+            # Work queue: most valuable symbols first; failures go behind the others
+            with span("build_queue", "stage", symbols=len(symbols)):
+                queue = SymbolQueue.from_storage(
+                    symbols,
+                    self.storage,
+                    ordering=self.settings.symbol_ordering,
+                    priorities=self.settings.symbol_priorities_map,
+                    closes=closes
+                )
+            logger.info(
+                f"Symbol order ({self.settings.symbol_ordering}): {queue.symbols()}"
+            )
+            
+            # Shared queue: this replica only fetches the symbols it claims
+            if self.work_queue is not None:
+                run_key = datetime.now().strftime(self.settings.work_queue_run_key)
+                ordered = queue.symbols()
+                queue = DistributedSymbolQueue(
+                    self.work_queue, self.storage, run_key,
+                    batch_size=self.settings.work_queue_batch_size,
+                    closes=closes
+                )
+                queue.enqueue(ordered)
+            
+            budget = self.settings.run_time_budget
+            deadline = time.monotonic() + budget if budget > 0 else None
+            
+            while queue:
+                if deadline is not None and time.monotonic() >= deadline:
+                    skipped = queue.symbols()
+                    SYMBOLS_PROCESSED.inc(len(skipped), status="skipped")
+                    logger.warning(
+                        f"Time budget of {budget:g}s exhausted, skipping "
+                        f"{len(skipped)} lowest-priority symbols: {skipped}"
+                    )
+                    queue.release()
+                    break
+                
+                # Pause the whole queue, not each symbol, while every circuit is open
+                wait = self._circuit_wait()
+                if wait > 0:
+                    if self.scheduler is not None and wait > self.settings.circuit_max_pause:
+                        self._reschedule(queue.symbols(), wait)
+                        queue.release()
+                        break
+                    if deadline is not None and time.monotonic() + wait >= deadline:
+                        # Sleeping would only end the run; leave the rest for the next one
+                        deadline = time.monotonic()
+                        continue
+                    logger.warning(
+                        f"All data sources paused by circuit breaker, waiting {wait:.0f}s "
+                        f"({len(queue)} symbols remaining)"
+                    )
+                    timed_sleep(wait, "crawler", "circuit_open")
+                    continue
+                
+                task = queue.pop()
+                symbol = task.symbol
+                symbol_start = time.perf_counter()
                 try:
                     logger.info(f"Processing {symbol}...")
                     
-                    # Get latest date in database
-                    latest_date = self.storage.get_latest_date(symbol)
+                    # Latest stored date was read in bulk when the queue was built
+                    latest_date = task.latest_date
                     
                     # Determine date range
                     if latest_date:
@@ -100,31 +444,89 @@ class StockCrawlerApp:
                         logger.info(f"No existing data for {symbol}, fetching last 30 days")
                     
                     # Fetch data
-                    data = self.data_source.fetch_stock_data(
-                        symbol=symbol,
-                        start_date=start_date
-                    )
+                    with span("fetch", "stage", symbol=symbol):
+                        data = self.data_source.fetch_stock_data(
+                            symbol=symbol,
+                            start_date=start_date
+                        )
+                    
+                    if data and self.quality is not None:
+                        with span("validate", "stage", symbol=symbol, rows=len(data)):
+                            prev_close = task.latest_close
+                            data = self.quality.validate(
+                                data, {symbol.upper(): prev_close} if prev_close is not None else None
+                            )
                     
                     if data:
                         # Save to database
-                        saved = self.storage.save_stock_data(data)
+                        with span("save", "stage", symbol=symbol, rows=len(data)), \
+                                measure_save(self.storage.backend_name) as outcome:
+                            saved = self.storage.save_stock_data(data)
+                            outcome["rows"] = saved
                         total_saved += saved
+                        if saved:
+                            changed_since[symbol] = min(dto.date for dto in data)
+                        SYMBOLS_PROCESSED.inc(status="saved")
                         logger.info(f"Saved {saved} records for {symbol}")
                     else:
+                        SYMBOLS_PROCESSED.inc(status="empty")
                         logger.warning(f"No new data available for {symbol}")
+                    queue.complete(task)
+                
+                except DataSourceError as e:
+                    if task.attempts + 1 < self.settings.symbol_max_attempts:
+                        SYMBOLS_PROCESSED.inc(status="requeued")
+                        logger.warning(f"Fetch failed for {symbol}, requeued: {str(e)}")
+                        queue.requeue(task, str(e))
+                    else:
+                        SYMBOLS_PROCESSED.inc(status="error")
+                        queue.give_up(task, str(e))
+                        logger.error(
+                            f"Giving up on {symbol} after {task.attempts + 1} attempts: {str(e)}"
+                        )
+                    continue
                 
                 except Exception as e:
+                    SYMBOLS_PROCESSED.inc(status="error")
+                    queue.give_up(task, str(e))
                     logger.error(
                         f"Error processing {symbol}: {str(e)}",
                         exc_info=True
                     )
                     continue
+                
+                finally:
+                    TRACER.add_span(
+                        f"symbol.{symbol}", symbol_start, time.perf_counter(), "symbol",
+                        {"symbol": symbol}
+                    )
             
             logger.info(f"Data fetch job completed. Total records saved: {total_saved}")
+            if self.quality is not None:
+                self.quality.finish_run()
+            if self.rollups is not None and changed_since:
+                with span("rollups", "stage", symbols=len(changed_since)):
+                    self.rollups.refresh(changed_since)
+            if self.settings.screening_cache_path and changed_since:
+                self._refresh_screening_panel(min(changed_since.values()))
+            if isinstance(queue, DistributedSymbolQueue):
+                stats = self.work_queue.stats(queue.run_key)
+                logger.info(f"Work queue for run {queue.run_key}: {stats}")
+            for controller in self.rate_controllers:
+                controller.save()
+                logger.info(f"Learned request rate for {controller.source}: {controller.rate:.3f}/s")
+            from src.storage import get_pool_metrics
+            for url, pool_stats in get_pool_metrics().items():
+                logger.info(f"Connection pool {url}: {pool_stats}")
             logger.info("=" * 60)
         
         except Exception as e:
             logger.error(f"Error in fetch_and_store_data: {str(e)}", exc_info=True)
+        
+        finally:
+            JOB_DURATION_SECONDS.observe(
+                time.perf_counter() - job_start, job="fetch_stock_data"
+            )
     
     def run_once(self) -> None:
         """Run data fetch once and exit"""
@@ -136,6 +538,9 @@ class StockCrawlerApp:
             logger.info("Running in one-time mode")
             self.fetch_and_store_data()
             
+            if self.settings.metrics_json_path:
+                REGISTRY.dump_json(self.settings.metrics_json_path)
+            
             logger.info("One-time run completed successfully")
         
         except Exception as e:
@@ -145,6 +550,10 @@ class StockCrawlerApp:
         finally:
             if self.storage:
                 self.storage.disconnect()
+            if self.data_source:
+                self.data_source.close()
+            if self.http_session:
+                self.http_session.close()
     
     def run_scheduled(self) -> None:
         """Run with scheduler for periodic data fetching"""
@@ -153,6 +562,29 @@ class StockCrawlerApp:
                 logger.error("Initialization failed, exiting")
                 sys.exit(1)
             
+            # Initialize scheduler (APScheduler is only imported in this mode)
+            logger.info("Initializing scheduler...")
+            from src.scheduler import JobScheduler
+            leader_lease = None
+            if self.settings.leader_election_enabled:
+                engine = getattr(self.storage, "engine", None)
+                if engine is None:
+                    logger.error("Leader election needs a SQL storage backend")
+                    sys.exit(1)
+                from src.storage import LeaderLease
+                leader_lease = LeaderLease(
+                    engine,
+                    name=self.settings.leader_lease_name,
+                    holder=self.worker_id,
+                    ttl=self.settings.leader_lease_seconds
+                )
+            self.scheduler = JobScheduler(leader_lease=leader_lease)
+            
+            # Expose Prometheus metrics while the scheduler runs
+            if self.settings.metrics_port:
+                self.metrics_server = MetricsServer(self.settings.metrics_port)
+                self.metrics_server.start()
+            
             # Add scheduled job
             self.scheduler.add_cron_job(
                 func=self.fetch_and_store_data,
@@ -161,9 +593,26 @@ class StockCrawlerApp:
                 job_name="Fetch Stock Data"
             )
             
-            # Run immediately on startup
+            if self.settings.partitioning_enabled:
+                self.scheduler.add_cron_job(
+                    func=self.maintain_partitions,
+                    cron_expression=self.settings.partition_maintenance_schedule,
+                    job_id="maintain_partitions",
+                    job_name="Maintain Partitions"
+                )
+                self.scheduler.run_now(self.maintain_partitions, job_id="maintain_partitions")
+            
+            if self.settings.raw_archive_after_days > 0:
+                self.scheduler.add_cron_job(
+                    func=self.archive_raw_data,
+                    cron_expression=self.settings.raw_archive_schedule,
+                    job_id="archive_raw_data",
+                    job_name="Archive Raw Data"
+                )
+            
+            # Run immediately on startup (on the leader only, when electing)
             logger.info("Running initial data fetch...")
-            self.fetch_and_store_data()
+            self.scheduler.run_now(self.fetch_and_store_data, job_id="fetch_stock_data")
             
             # Start scheduler (blocking)
             logger.info("Starting scheduled mode...")
@@ -179,8 +628,14 @@ class StockCrawlerApp:
         finally:
             if self.scheduler:
                 self.scheduler.shutdown()
+            if self.metrics_server:
+                self.metrics_server.stop()
             if self.storage:
                 self.storage.disconnect()
+            if self.data_source:
+                self.data_source.close()
+            if self.http_session:
+                self.http_session.close()
 
 
 def main():
@@ -197,9 +652,22 @@ def main():
         help='Run mode: once (single run) or scheduled (continuous with cron)'
     )
     
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='cprofile',
+        choices=PROFILE_MODES,
+        help='Profile each run: cprofile (default) or sampling; output goes to PROFILE_DIR'
+    )
+    parser.add_argument(
+        '--trace',
+        action='store_true',
+        help='Write a Chrome trace file per run to TRACE_DIR'
+    )
+    
     args = parser.parse_args()
     
-    app = StockCrawlerApp()
+    app = StockCrawlerApp(profile=args.profile, trace=args.trace)
     
     if args.mode == 'once':
         app.run_once()
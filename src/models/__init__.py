@@ -2,6 +2,15 @@
 
 from .stock_data import StockData, Base
 from .stock_price_raw import StockPriceRaw
+from .crawl_task import CrawlTask
+from .scheduler_lease import SchedulerLease
+from .intraday_bar import IntradayBar
+from .stock_rollup import StockRollup
+from .quarantined_bar import QuarantinedBar
+from .data_quality_run import DataQualityRun
 
-__all__ = ["StockData", "StockPriceRaw", "Base"]
+__all__ = [
+    "StockData", "StockPriceRaw", "CrawlTask", "SchedulerLease", "IntradayBar", "StockRollup",
+    "QuarantinedBar", "DataQualityRun", "Base",
+]
 
@@ -0,0 +1,82 @@
+"""Distributed crawl work-queue model"""
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Integer, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .stock_data import Base
+
+
+class CrawlTask(Base):
+    """One symbol to crawl in one run, claimed by crawler replicas under a lease"""
+    
+    __tablename__ = "crawl_queue"
+    
+    # Primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    
+    # Work item
+    run_key: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+        comment="Run the task belongs to, e.g. the fetch date"
+    )
+    symbol: Mapped[str] = mapped_column(String(20), nullable=False)
+    priority: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Claim order within the run (lower first)"
+    )
+    
+    # Lease state
+    status: Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+        default="pending",
+        comment="pending, leased, done or failed"
+    )
+    owner: Mapped[Optional[str]] = mapped_column(
+        String(100),
+        nullable=True,
+        comment="Worker holding or last holding the lease"
+    )
+    lease_token: Mapped[Optional[str]] = mapped_column(
+        String(32),
+        nullable=True,
+        comment="Identifies the batch claim that holds the lease"
+    )
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        nullable=True,
+        comment="Lease deadline (UTC); expired leases can be claimed again"
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    
+    # Metadata
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow
+    )
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_crawl_run_symbol', 'run_key', 'symbol', unique=True),
+        Index('idx_crawl_claim', 'run_key', 'status', 'priority'),
+        Index('idx_crawl_lease_token', 'lease_token'),
+    )
+    
+    def __repr__(self) -> str:
+        return (
+            f"<CrawlTask(run_key='{self.run_key}', symbol='{self.symbol}', "
+            f"status='{self.status}')>"
+        )
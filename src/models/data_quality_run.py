@@ -0,0 +1,38 @@
+"""Data-quality statistics model"""
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Integer, DateTime, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .stock_data import Base
+
+
+class DataQualityRun(Base):
+    """Per-crawl totals of the data-quality checks on fetched daily bars"""
+    
+    __tablename__ = "data_quality_runs"
+    
+    # Primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    
+    worker_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    
+    # Totals
+    symbols: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rows_checked: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rows_passed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rows_quarantined: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rule_counts: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+        comment="JSON object of rows failing each rule (a row can fail several)"
+    )
+    
+    def __repr__(self) -> str:
+        return (
+            f"<DataQualityRun(id={self.id}, checked={self.rows_checked}, "
+            f"quarantined={self.rows_quarantined})>"
+        )
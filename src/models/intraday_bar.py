@@ -0,0 +1,55 @@
+"""Intraday bar model"""
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, SmallInteger, Integer, DateTime, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .stock_data import Base
+
+
+# Exact 6-byte prices (MySQL DECIMAL(12,4)) returned to Python as floats
+Price = Numeric(12, 4, asdecimal=False)
+
+
+class IntradayBar(Base):
+    """
+    Intraday OHLCV bar keyed by (symbol, interval, bar start time)
+
+    Minute data is hundreds of rows per symbol per day, so the row is kept
+    narrow: no surrogate key, audit columns or per-row source name (the
+    raw response the bars came from keeps those), and the clustered
+    primary key stores each symbol's bars contiguously in time order.
+    """
+
+    __tablename__ = "intraday_bars"
+
+    # Primary key (clustered)
+    symbol: Mapped[str] = mapped_column(String(20), primary_key=True)
+    interval_minutes: Mapped[int] = mapped_column(
+        SmallInteger,
+        primary_key=True,
+        comment="Bar length in minutes: 1, 5, 15, 30, 60"
+    )
+    ts: Mapped[datetime] = mapped_column(
+        DateTime,
+        primary_key=True,
+        comment="Bar start time in the exchange time zone reported by the source"
+    )
+
+    # Price data
+    open_price: Mapped[Optional[float]] = mapped_column(Price, nullable=True)
+    high_price: Mapped[Optional[float]] = mapped_column(Price, nullable=True)
+    low_price: Mapped[Optional[float]] = mapped_column(Price, nullable=True)
+    close_price: Mapped[Optional[float]] = mapped_column(Price, nullable=True)
+    volume: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    __table_args__ = (
+        {'sqlite_with_rowid': False},
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<IntradayBar(symbol='{self.symbol}', interval={self.interval_minutes}, "
+            f"ts='{self.ts}', close={self.close_price})>"
+        )
@@ -0,0 +1,72 @@
+"""Quarantined daily bar model"""
+
+from datetime import datetime, date
+from typing import Optional
+from sqlalchemy import String, Float, BigInteger, Integer, DateTime, Date, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .stock_data import Base
+
+
+class QuarantinedBar(Base):
+    """
+    Daily bar rejected by the data-quality checks before reaching stock_data
+
+    Holds the bar as fetched plus the rules it failed, so bad rows can be
+    inspected, fixed at the source or re-saved by hand.
+    """
+    
+    __tablename__ = "stock_data_quarantine"
+    
+    # Primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    
+    # Bar identification
+    symbol: Mapped[str] = mapped_column(String(20), nullable=False)
+    date: Mapped[date] = mapped_column(Date, nullable=False)
+    
+    # Price data as fetched
+    open_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    high_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    low_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    close_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    adj_close_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    volume: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    market_cap: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    pe_ratio: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    turnover_rate: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    data_source: Mapped[str] = mapped_column(String(50), nullable=False)
+    
+    # Validation outcome
+    reasons: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+        comment="Comma-separated failed rules, e.g. ohlc_inconsistent,price_jump"
+    )
+    prev_close: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="Close the price_jump rule compared against"
+    )
+    run_id: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="data_quality_runs.id of the crawl that fetched the bar"
+    )
+    quarantined_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow
+    )
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_quarantine_symbol_date', 'symbol', 'date'),
+        Index('idx_quarantine_run', 'run_id'),
+    )
+    
+    def __repr__(self) -> str:
+        return (
+            f"<QuarantinedBar(symbol='{self.symbol}', date='{self.date}', "
+            f"reasons='{self.reasons}')>"
+        )
@@ -0,0 +1,49 @@
+"""Scheduler leader lease model"""
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .stock_data import Base
+
+
+class SchedulerLease(Base):
+    """Named lease held by the scheduler replica allowed to run jobs"""
+    
+    __tablename__ = "scheduler_leases"
+    
+    # Primary key
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    
+    # Lease state
+    holder: Mapped[Optional[str]] = mapped_column(
+        String(100),
+        nullable=True,
+        comment="Replica currently holding the lease"
+    )
+    term: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Incremented on every change of holder"
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        comment="Lease deadline (UTC); another replica may take over afterwards"
+    )
+    
+    # Metadata
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow
+    )
+    
+    def __repr__(self) -> str:
+        return (
+            f"<SchedulerLease(name='{self.name}', holder='{self.holder}', "
+            f"term={self.term})>"
+        )
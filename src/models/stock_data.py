@@ -12,16 +12,20 @@ class Base(DeclarativeBase):
 
 
 class StockData(Base):
-    """Stock data model for storing daily stock information"""
+    """
+    Stock data model for storing daily stock information
     
-    __tablename__ = "stock_data"
+    The primary key is (symbol, date), so InnoDB (and SQLite, as a WITHOUT
+    ROWID table) stores each symbol's bars contiguously in date order:
+    a symbol's date range is one clustered index range scan and there is
+    no surrogate key or duplicate unique index to maintain on insert.
+    """
     
-    # Primary key
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    __tablename__ = "stock_data"
     
-    # Stock identification
-    symbol: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
-    date: Mapped[datetime] = mapped_column(Date, nullable=False, index=True)
+    # Primary key (clustered): stock identification
+    symbol: Mapped[str] = mapped_column(String(20), primary_key=True)
+    date: Mapped[datetime] = mapped_column(Date, primary_key=True)
     
     # Price data
     open_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
@@ -52,11 +56,11 @@ class StockData(Base):
         onupdate=datetime.utcnow
     )
     
-    # Indexes
+    # Secondary indexes (symbol lookups are served by the primary key)
     __table_args__ = (
-        Index('idx_symbol_date', 'symbol', 'date', unique=True),
         Index('idx_date', 'date'),
         Index('idx_created_at', 'created_at'),
+        {'sqlite_with_rowid': False},
     )
     
     def __repr__(self) -> str:
@@ -0,0 +1,65 @@
+"""Rolled-up (weekly, monthly, ...) bar model"""
+
+from datetime import datetime, date
+from typing import Optional
+from sqlalchemy import String, Float, BigInteger, SmallInteger, DateTime, Date
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .stock_data import Base
+
+
+class StockRollup(Base):
+    """
+    OHLCV bar aggregated from daily stock_data rows over a calendar period
+
+    Derived locally by analytics.rollups instead of being fetched, and
+    rewritten whenever a daily bar inside the period changes.
+    """
+
+    __tablename__ = "stock_rollups"
+
+    # Primary key (clustered)
+    symbol: Mapped[str] = mapped_column(String(20), primary_key=True)
+    period: Mapped[str] = mapped_column(
+        String(10),
+        primary_key=True,
+        comment="Pandas period alias: W (weeks ending Friday), M, Q, Y, W-WED, ..."
+    )
+    period_start: Mapped[date] = mapped_column(
+        Date,
+        primary_key=True,
+        comment="First calendar day of the period"
+    )
+
+    period_end: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+        comment="Last trading day in the period so far"
+    )
+    trading_days: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+    # Price data
+    open_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    high_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    low_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    close_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    adj_close_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    volume: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+
+    # Metadata
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow
+    )
+
+    __table_args__ = (
+        {'sqlite_with_rowid': False},
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<StockRollup(symbol='{self.symbol}', period='{self.period}', "
+            f"start='{self.period_start}', close={self.close_price})>"
+        )
@@ -1,6 +1,23 @@
 """Scheduler module"""
 
-from .job_scheduler import JobScheduler
+from typing import TYPE_CHECKING
 
-__all__ = ["JobScheduler"]
+from src.utils.lazy import lazy_module
 
+if TYPE_CHECKING:
+    from .job_scheduler import JobScheduler
+    from .symbol_queue import SymbolQueue, SymbolTask
+    from .distributed_queue import DistributedSymbolQueue
+
+# APScheduler is only needed in scheduled mode, so it is imported on first use
+_LAZY_ATTRIBUTES = {
+    "JobScheduler": ".job_scheduler",
+    "SymbolQueue": ".symbol_queue",
+    "SymbolTask": ".symbol_queue",
+    "DistributedSymbolQueue": ".distributed_queue",
+}
+
+__all__ = ["JobScheduler", "SymbolQueue", "SymbolTask", "DistributedSymbolQueue"]
+
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_ATTRIBUTES)
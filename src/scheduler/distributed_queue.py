@@ -0,0 +1,151 @@
+"""Symbol queue fed by the database work queue shared between replicas"""
+
+import logging
+import threading
+from collections import deque
+from typing import Deque, List, Optional
+
+from .symbol_queue import SymbolTask, read_latest
+
+logger = logging.getLogger(__name__)
+
+
+class DistributedSymbolQueue:
+    """
+    Drop-in for SymbolQueue that claims symbols from a WorkQueue
+
+    Symbols are claimed in small batches, so throughput grows with the
+    number of replicas and a crashed replica only strands one batch until
+    its lease expires. While a batch is held a background thread renews
+    its lease; if the lease is lost anyway, the rest of the batch is
+    dropped because another worker now owns it.
+    """
+
+    def __init__(self, work_queue, storage, run_key: str, batch_size: int = 5,
+                 closes: bool = False):
+        """
+        Initialize the queue
+
+        Args:
+            work_queue: storage.work_queue.WorkQueue shared by all replicas
+            storage: Storage backend used to look up each batch's latest dates
+            run_key: Run identifier shared by all replicas
+            batch_size: Symbols claimed at a time
+            closes: Carry each symbol's latest stored close on its task
+        """
+        self.work_queue = work_queue
+        self.storage = storage
+        self.run_key = run_key
+        self.batch_size = batch_size
+        self.closes = closes
+        self._buffer: Deque[SymbolTask] = deque()
+        self._batch = None
+        self._exhausted = False
+        self._lease_lost = threading.Event()
+        self._stop_renewal = threading.Event()
+        self._renewal_thread: Optional[threading.Thread] = None
+
+    def enqueue(self, symbols: List[str]) -> int:
+        """
+        Add the run's symbols in priority order (ignored if already queued)
+
+        Args:
+            symbols: Symbols, highest priority first
+
+        Returns:
+            Number of symbols this replica added
+        """
+        return self.work_queue.enqueue(self.run_key, symbols)
+
+    def _renew_lease(self, batch, interval: float) -> None:
+        while not self._stop_renewal.wait(interval):
+            if not self.work_queue.renew(batch):
+                logger.warning(f"Lost lease on {batch.symbols}; dropping the rest of the batch")
+                self._lease_lost.set()
+                return
+
+    def _stop_renewing(self) -> None:
+        self._stop_renewal.set()
+        if self._renewal_thread is not None:
+            self._renewal_thread.join(timeout=5)
+            self._renewal_thread = None
+
+    def _claim(self) -> bool:
+        """Claim the next batch; False when the run has no claimable symbols left"""
+        self._stop_renewing()
+        batch = self.work_queue.claim(self.run_key, self.batch_size)
+        if batch is None:
+            self._batch = None
+            self._exhausted = True
+            return False
+
+        latest = read_latest(self.storage, batch.symbols, self.closes)
+        self._batch = batch
+        self._buffer = deque(
+            SymbolTask(
+                symbol=symbol,
+                latest_date=latest.get(symbol, (None, None))[0],
+                latest_close=latest.get(symbol, (None, None))[1],
+                position=position,
+                attempts=batch.attempts[symbol] - 1,
+            )
+            for position, symbol in enumerate(batch.symbols)
+        )
+
+        self._lease_lost.clear()
+        self._stop_renewal.clear()
+        self._renewal_thread = threading.Thread(
+            target=self._renew_lease,
+            args=(batch, self.work_queue.lease_seconds / 3),
+            name="lease-renewal",
+            daemon=True
+        )
+        self._renewal_thread.start()
+        return True
+
+    def pop(self) -> SymbolTask:
+        """
+        Remove and return the next claimed task, claiming a batch if needed
+
+        Raises:
+            IndexError: No claimable symbols are left
+        """
+        if not self:
+            raise IndexError("pop from an empty queue")
+        return self._buffer.popleft()
+
+    def requeue(self, task: SymbolTask, error: str = "") -> None:
+        """Return a failed symbol to the shared queue for any replica to retry"""
+        self.work_queue.fail(self._batch, task.symbol, error, retry=True)
+
+    def complete(self, task: SymbolTask) -> None:
+        """Mark a symbol done for every replica"""
+        self.work_queue.complete(self._batch, task.symbol)
+
+    def give_up(self, task: SymbolTask, error: str = "") -> None:
+        """Mark a symbol failed for every replica"""
+        self.work_queue.fail(self._batch, task.symbol, error, retry=False)
+
+    def release(self) -> None:
+        """Hand the unprocessed part of the batch back and stop claiming"""
+        self._stop_renewing()
+        if self._batch is not None and self._buffer:
+            self.work_queue.release(self._batch, self.symbols())
+        self._buffer.clear()
+        self._exhausted = True
+
+    def symbols(self) -> List[str]:
+        """Symbols of the current batch not processed yet"""
+        return [task.symbol for task in self._buffer]
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __bool__(self) -> bool:
+        if self._lease_lost.is_set():
+            self._buffer.clear()
+        if self._buffer:
+            return True
+        if self._exhausted:
+            return False
+        return self._claim()
@@ -1,7 +1,9 @@
 """Job scheduler for periodic data fetching"""
 
+import functools
 import logging
-from typing import List, Callable
+import threading
+from typing import List, Callable, Optional
 from datetime import datetime, timedelta
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
@@ -10,12 +12,74 @@ logger = logging.getLogger(__name__)
 
 
 class JobScheduler:
-    """Job scheduler for managing periodic tasks"""
+    """
+    Job scheduler for managing periodic tasks
     
-    def __init__(self):
-        """Initialize the job scheduler"""
+    With a leader lease, every replica registers the same jobs but only the
+    current leader executes them; standbys keep trying to take the lease and
+    start executing within one renewal interval of the leader's lease
+    expiring (immediately if the leader shuts down cleanly).
+    """
+    
+    def __init__(self, leader_lease=None, renew_interval: Optional[float] = None):
+        """
+        Initialize the job scheduler
+        
+        Args:
+            leader_lease: Optional storage.leader_lease.LeaderLease gating job execution
+            renew_interval: Seconds between lease renewals (default: a third of its TTL)
+        """
         self.scheduler = BlockingScheduler()
         self._jobs = []
+        self.leader_lease = leader_lease
+        self._stop_election = threading.Event()
+        self._election_thread: Optional[threading.Thread] = None
+        
+        if leader_lease is not None:
+            leader_lease.try_acquire()
+            self._election_thread = threading.Thread(
+                target=self._run_election,
+                args=(renew_interval or leader_lease.ttl / 3,),
+                name="leader-election",
+                daemon=True
+            )
+            self._election_thread.start()
+    
+    def _run_election(self, interval: float) -> None:
+        """Renew the lease while leader, or try to take it over while standby"""
+        while not self._stop_election.wait(interval):
+            self.leader_lease.try_acquire()
+    
+    @property
+    def is_leader(self) -> bool:
+        """Whether this replica may run jobs (always true without a lease)"""
+        return self.leader_lease is None or self.leader_lease.is_leader
+    
+    def _leader_only(self, func: Callable, job_id: str) -> Callable:
+        """Wrap a job so it only runs on the leader"""
+        if self.leader_lease is None:
+            return func
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Renew right before running so a stale local view can't double-fire
+            if not self.leader_lease.try_acquire():
+                logger.info(f"Skipping job {job_id}: standby replica")
+                return None
+            return func(*args, **kwargs)
+        
+        return wrapper
+    
+    def run_now(self, func: Callable, job_id: str, args: tuple = ()) -> None:
+        """
+        Run a function immediately, subject to leader election
+        
+        Args:
+            func: Function to execute
+            job_id: Job identifier used in logs
+            args: Positional arguments passed to func
+        """
+        self._leader_only(func, job_id)(*args)
     
     def add_cron_job(
         self,
@@ -53,7 +117,7 @@ class JobScheduler:
             )
             
             self.scheduler.add_job(
-                func,
+                self._leader_only(func, job_id),
                 trigger=trigger,
                 id=job_id,
                 name=job_name or job_id,
@@ -93,7 +157,7 @@ class JobScheduler:
         """
         try:
             self.scheduler.add_job(
-                func,
+                self._leader_only(func, job_id),
                 'interval',
                 minutes=interval_minutes,
                 id=job_id,
@@ -116,6 +180,47 @@ class JobScheduler:
             logger.error(f"Failed to add job {job_id}: {str(e)}", exc_info=True)
             raise
     
+    def add_date_job(
+        self,
+        func: Callable,
+        run_date: datetime,
+        job_id: str,
+        job_name: str = None,
+        args: tuple = ()
+    ) -> None:
+        """
+        Add a one-off job that runs at a given time
+        
+        Args:
+            func: Function to execute
+            run_date: When to run the job
+            job_id: Unique job identifier
+            job_name: Human-readable job name (optional)
+            args: Positional arguments passed to func
+        """
+        try:
+            self.scheduler.add_job(
+                self._leader_only(func, job_id),
+                'date',
+                run_date=run_date,
+                args=args,
+                id=job_id,
+                name=job_name or job_id,
+                replace_existing=True
+            )
+            
+            self._jobs.append({
+                'id': job_id,
+                'name': job_name or job_id,
+                'run_date': run_date.isoformat()
+            })
+            
+            logger.info(f"Added one-off job: {job_name or job_id} at {run_date}")
+        
+        except Exception as e:
+            logger.error(f"Failed to add job {job_id}: {str(e)}", exc_info=True)
+            raise
+    
     def remove_job(self, job_id: str) -> None:
         """
         Remove a scheduled job
@@ -172,4 +277,9 @@ class JobScheduler:
         
         except Exception as e:
             logger.error(f"Error during shutdown: {str(e)}", exc_info=True)
-
+        
+        finally:
+            self._stop_election.set()
+            if self.leader_lease is not None:
+                # Hand over to a standby right away instead of after the TTL
+                self.leader_lease.release()
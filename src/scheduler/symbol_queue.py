@@ -0,0 +1,189 @@
+"""Priority work queue ordering symbols by staleness, liquidity or user priority"""
+
+import heapq
+import itertools
+import math
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+
+# Orderings accepted by SymbolQueue
+ORDERINGS = ("config", "staleness", "liquidity")
+
+
+@dataclass
+class SymbolTask:
+    """A symbol waiting to be fetched, with the values it is ranked by"""
+
+    symbol: str
+    latest_date: Optional[date] = None
+    latest_close: Optional[float] = None
+    liquidity: float = 0.0
+    priority: float = 0.0
+    position: int = 0
+    attempts: int = 0
+
+    def staleness(self, today: date) -> float:
+        """Days since the latest stored bar (infinite for symbols with no data)"""
+        if self.latest_date is None:
+            return math.inf
+        return float((today - self.latest_date).days)
+
+
+def read_latest(
+    storage,
+    symbols: List[str],
+    closes: bool = False
+) -> Dict[str, Tuple[Optional[date], Optional[float]]]:
+    """
+    Latest stored date (and optionally its close) per symbol in one batched call
+
+    Args:
+        storage: Storage backend
+        symbols: Stock ticker symbols
+        closes: Also read each latest bar's close (get_latest_closes)
+
+    Returns:
+        Mapping of symbol to (latest date, close); close is None unless requested
+    """
+    if closes:
+        return storage.get_latest_closes(symbols)
+    return {symbol: (day, None) for symbol, day in storage.get_latest_dates(symbols).items()}
+
+
+class SymbolQueue:
+    """
+    Heap of symbols, highest-value first
+
+    User-defined priority always ranks first. Within equal priority the
+    ordering decides: "staleness" fetches the symbols furthest behind first
+    (liquidity breaks ties), "liquidity" fetches the most traded symbols
+    first (staleness breaks ties), "config" keeps the configured order.
+    Requeued symbols go behind every symbol that has not been tried yet, so
+    a failing symbol cannot starve the rest of the run.
+    """
+
+    def __init__(
+        self,
+        tasks: List[SymbolTask],
+        ordering: str = "staleness",
+        today: Optional[date] = None
+    ):
+        """
+        Initialize the queue
+
+        Args:
+            tasks: Symbols to schedule
+            ordering: config, staleness or liquidity
+            today: Reference date for staleness (defaults to today)
+        """
+        if ordering not in ORDERINGS:
+            raise ValueError(f"Unknown symbol ordering: {ordering}")
+
+        self.ordering = ordering
+        self.today = today or date.today()
+        self._heap: List[Tuple[tuple, int, SymbolTask]] = []
+        self._counter = itertools.count()
+        for task in tasks:
+            self.push(task)
+
+    @classmethod
+    def from_storage(
+        cls,
+        symbols: List[str],
+        storage,
+        ordering: str = "staleness",
+        priorities: Optional[Dict[str, float]] = None,
+        liquidity_days: int = 30,
+        today: Optional[date] = None,
+        closes: bool = False
+    ) -> "SymbolQueue":
+        """
+        Build a queue from what is already stored
+
+        Latest dates (with their closes if requested and, unless ordering is
+        "config", liquidity) are read with one batched call each rather than
+        one query per symbol.
+
+        Args:
+            symbols: Symbols in configured order
+            storage: Storage backend providing get_latest_dates/get_latest_closes
+            ordering: config, staleness or liquidity
+            priorities: Optional symbol -> user priority (higher runs first)
+            liquidity_days: Calendar days of history averaged for liquidity
+            today: Reference date for staleness (defaults to today)
+            closes: Carry each symbol's latest stored close on its task
+
+        Returns:
+            SymbolQueue holding every symbol
+        """
+        today = today or date.today()
+        priorities = priorities or {}
+        latest = read_latest(storage, symbols, closes)
+        liquidity: Dict[str, float] = {}
+        if ordering != "config":
+            liquidity = storage.get_average_dollar_volume(
+                symbols, start_date=today - timedelta(days=liquidity_days)
+            )
+
+        tasks = [
+            SymbolTask(
+                symbol=symbol,
+                latest_date=latest.get(symbol, (None, None))[0],
+                latest_close=latest.get(symbol, (None, None))[1],
+                liquidity=liquidity.get(symbol) or 0.0,
+                priority=priorities.get(symbol, 0.0),
+                position=position,
+            )
+            for position, symbol in enumerate(symbols)
+        ]
+        return cls(tasks, ordering=ordering, today=today)
+
+    def _key(self, task: SymbolTask) -> tuple:
+        """Heap key; smaller runs first"""
+        if self.ordering == "staleness":
+            rank = (-task.staleness(self.today), -task.liquidity)
+        elif self.ordering == "liquidity":
+            rank = (-task.liquidity, -task.staleness(self.today))
+        else:
+            rank = ()
+        return (task.attempts, -task.priority) + rank + (task.position,)
+
+    def push(self, task: SymbolTask) -> None:
+        """Add a task to the queue"""
+        heapq.heappush(self._heap, (self._key(task), next(self._counter), task))
+
+    def pop(self) -> SymbolTask:
+        """
+        Remove and return the highest-value task
+
+        Raises:
+            IndexError: The queue is empty
+        """
+        return heapq.heappop(self._heap)[2]
+
+    def requeue(self, task: SymbolTask, error: str = "") -> None:
+        """Count a failed attempt and put the task back behind untried symbols"""
+        task.attempts += 1
+        self.push(task)
+
+    def complete(self, task: SymbolTask) -> None:
+        """Record a processed task (nothing to record for a local queue)"""
+
+    def give_up(self, task: SymbolTask, error: str = "") -> None:
+        """Record a task that ran out of attempts (nothing to record locally)"""
+
+    def release(self) -> None:
+        """Drop the remaining tasks, e.g. when a run stops early"""
+        self._heap.clear()
+
+    def symbols(self) -> List[str]:
+        """Remaining symbols in the order they would be fetched"""
+        return [task.symbol for _, _, task in sorted(self._heap)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
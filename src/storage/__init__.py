@@ -1,8 +1,53 @@
 """Storage module"""
 
+from typing import TYPE_CHECKING
+
+from src.utils.lazy import lazy_module
+
 from .base import BaseStorage
-from .mysql_storage import MySQLStorage
-from .raw_storage import RawDataStorage
 
-__all__ = ["BaseStorage", "MySQLStorage", "RawDataStorage"]
+if TYPE_CHECKING:
+    from .mysql_storage import MySQLStorage
+    from .raw_storage import RawDataStorage
+    from .raw_archive import RawArchive
+    from .intraday_storage import IntradayStorage
+    from .parquet_mirror import ParquetMirror
+    from .mmap_storage import MmapStorage
+    from .sqlite_storage import SQLiteStorage
+    from .factory import create_storage
+    from .engine import acquire_engine, release_engine, get_pool_metrics
+    from .work_queue import WorkQueue
+    from .leader_lease import LeaderLease
+    from .migrations import migrate_stock_data, stock_data_layout
+    from .partitioning import PartitionManager
+
+# Backends pull in SQLAlchemy/pandas/pyarrow/numpy, so they are imported on first use
+_LAZY_ATTRIBUTES = {
+    "MySQLStorage": ".mysql_storage",
+    "RawDataStorage": ".raw_storage",
+    "RawArchive": ".raw_archive",
+    "IntradayStorage": ".intraday_storage",
+    "ParquetMirror": ".parquet_mirror",
+    "MmapStorage": ".mmap_storage",
+    "SQLiteStorage": ".sqlite_storage",
+    "create_storage": ".factory",
+    "acquire_engine": ".engine",
+    "release_engine": ".engine",
+    "get_pool_metrics": ".engine",
+    "WorkQueue": ".work_queue",
+    "LeaderLease": ".leader_lease",
+    "migrate_stock_data": ".migrations",
+    "stock_data_layout": ".migrations",
+    "PartitionManager": ".partitioning",
+}
+
+__all__ = [
+    "BaseStorage", "MySQLStorage", "RawDataStorage", "RawArchive", "IntradayStorage",
+    "ParquetMirror", "MmapStorage", "SQLiteStorage", "create_storage",
+    "acquire_engine", "release_engine", "get_pool_metrics",
+    "WorkQueue", "LeaderLease", "migrate_stock_data", "stock_data_layout",
+    "PartitionManager",
+]
+
 
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_ATTRIBUTES)
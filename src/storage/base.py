@@ -1,7 +1,7 @@
 """Base storage abstract class"""
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import date
 
 from src.data_sources.base import StockDataDTO
@@ -10,6 +10,9 @@ from src.data_sources.base import StockDataDTO
 class BaseStorage(ABC):
     """Abstract base class for all storage implementations"""
     
+    # Label of the backend in metrics
+    backend_name = "unknown"
+    
     @abstractmethod
     def connect(self) -> bool:
         """
@@ -80,4 +83,67 @@ class BaseStorage(ABC):
             Latest date or None if no data exists
         """
         pass
-
+    
+    def get_latest_dates(self, symbols: List[str]) -> Dict[str, Optional[date]]:
+        """
+        Get the latest date for many symbols
+        
+        Backends that can answer this in a single round trip should override it.
+        
+        Args:
+            symbols: Stock ticker symbols
+        
+        Returns:
+            Mapping of symbol to latest date (None if no data exists)
+        """
+        return {symbol: self.get_latest_date(symbol) for symbol in symbols}
+    
+    def get_latest_closes(
+        self,
+        symbols: List[str]
+    ) -> Dict[str, Tuple[Optional[date], Optional[float]]]:
+        """
+        Get the latest stored date and its close for many symbols
+        
+        Backends that can answer this in a single round trip should override it.
+        
+        Args:
+            symbols: Stock ticker symbols
+        
+        Returns:
+            Mapping of symbol to (latest date, close) ((None, None) if no data exists)
+        """
+        latest = {}
+        for symbol in symbols:
+            latest_date = self.get_latest_date(symbol)
+            bars = self.get_stock_data(symbol, latest_date, latest_date) if latest_date else []
+            latest[symbol] = (latest_date, bars[-1].close_price if bars else None)
+        return latest
+    
+    def get_average_dollar_volume(
+        self,
+        symbols: List[str],
+        start_date: Optional[date] = None
+    ) -> Dict[str, Optional[float]]:
+        """
+        Get the average daily traded value (close * volume) for many symbols
+        
+        Used as a liquidity measure when ordering work. Backends that can
+        aggregate in a single round trip should override it.
+        
+        Args:
+            symbols: Stock ticker symbols
+            start_date: Only average bars on or after this date (optional)
+        
+        Returns:
+            Mapping of symbol to average traded value (None if no bars)
+        """
+        averages: Dict[str, Optional[float]] = {}
+        for symbol in symbols:
+            values = [
+                bar.close_price * bar.volume
+                for bar in self.get_stock_data(symbol, start_date=start_date)
+                if bar.close_price is not None and bar.volume is not None
+            ]
+            averages[symbol] = sum(values) / len(values) if values else None
+        return averages
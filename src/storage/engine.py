@@ -0,0 +1,353 @@
+"""Shared SQLAlchemy engine and connection pool management"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+from src.config import Settings
+from src.utils.metrics import track_db_statements
+from src.utils.tracing import trace_db_statements
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Counters describing connection pool usage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.overflow = 0
+        self.overflow_peak = 0
+        self.validations = 0
+        self.validation_failures = 0
+        self._local = threading.local()
+
+    @contextmanager
+    def paused(self):
+        """Leave the calling thread's checkouts and waits out of the counters"""
+        self._local.paused = True
+        try:
+            yield
+        finally:
+            self._local.paused = False
+
+    @property
+    def is_paused(self) -> bool:
+        """Whether the calling thread is inside paused()"""
+        return getattr(self._local, "paused", False)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increment a counter attribute"""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def record_wait(self, seconds: float) -> None:
+        """Record time spent waiting for a pooled connection"""
+        if self.is_paused:
+            return
+        with self._lock:
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+
+    def record_overflow(self, overflow: int) -> None:
+        """Record the pool's current overflow (connections beyond pool_size)"""
+        with self._lock:
+            self.overflow = max(overflow, 0)
+            self.overflow_peak = max(self.overflow_peak, self.overflow)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a copy of the current metric values
+
+        Returns:
+            Dictionary of metric name to value
+        """
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "wait_time_total": round(self.wait_time_total, 6),
+                "wait_time_max": round(self.wait_time_max, 6),
+                "wait_time_avg": round(
+                    self.wait_time_total / self.checkouts, 6
+                ) if self.checkouts else 0.0,
+                "overflow": self.overflow,
+                "overflow_peak": self.overflow_peak,
+                "validations": self.validations,
+                "validation_failures": self.validation_failures,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that measures how long callers wait for a connection"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep accumulating into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class EngineManager:
+    """
+    Owns one engine and its pool for a database URL
+
+    Instead of pinging on every checkout (pool_pre_ping), idle connections can
+    be validated periodically by a background thread, removing a round trip
+    from every session.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = 3600,
+        pool_pre_ping: bool = False,
+        validation_interval: float = 30.0,
+        on_connect: Optional[Callable] = None
+    ):
+        """
+        Initialize the engine manager
+
+        Args:
+            database_url: SQLAlchemy database URL
+            pool_size: Number of persistent connections kept in the pool
+            max_overflow: Extra connections allowed beyond pool_size under load
+            pool_timeout: Seconds to wait for a connection before failing
+            pool_recycle: Recycle connections older than this many seconds
+            pool_pre_ping: Ping each connection on checkout (costs a round trip)
+            validation_interval: Seconds between background validation of idle
+                connections (0 disables it)
+            on_connect: Optional DBAPI connect listener, e.g. to set pragmas
+        """
+        self.database_url = database_url
+        self.validation_interval = validation_interval
+        self.metrics = PoolMetrics()
+        self.refcount = 0
+
+        options: Dict[str, Any] = {"echo": False, "pool_pre_ping": pool_pre_ping}
+        url = make_url(database_url)
+        in_memory = url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+        if not in_memory:
+            options.update(
+                poolclass=InstrumentedQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=pool_recycle,
+            )
+
+        self.engine: Engine = create_engine(database_url, **options)
+        self.engine.pool.metrics = self.metrics
+
+        if on_connect is not None:
+            event.listen(self.engine, "connect", on_connect)
+        self._register_pool_events()
+        track_db_statements(self.engine)
+        trace_db_statements(self.engine)
+
+        self._stop = threading.Event()
+        self._validator: Optional[threading.Thread] = None
+
+    def _register_pool_events(self) -> None:
+        """Hook pool events into the metrics"""
+        metrics = self.metrics
+        engine = self.engine
+
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            metrics.increment("connects")
+
+        @event.listens_for(engine, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            if metrics.is_paused:
+                return
+            metrics.increment("checkouts")
+            pool = engine.pool
+            if isinstance(pool, QueuePool):
+                metrics.record_overflow(pool.overflow())
+
+        @event.listens_for(engine, "checkin")
+        def _on_checkin(dbapi_connection, connection_record):
+            if metrics.is_paused:
+                return
+            metrics.increment("checkins")
+
+        @event.listens_for(engine, "invalidate")
+        def _on_invalidate(dbapi_connection, connection_record, exception):
+            metrics.increment("invalidations")
+
+    def start_validation(self) -> None:
+        """Start the background validation thread if enabled"""
+        if self.validation_interval <= 0 or not isinstance(self.engine.pool, QueuePool):
+            return
+        if self._validator and self._validator.is_alive():
+            return
+
+        self._stop.clear()
+        self._validator = threading.Thread(
+            target=self._validation_loop,
+            name="db-pool-validator",
+            daemon=True
+        )
+        self._validator.start()
+
+    def _validation_loop(self) -> None:
+        while not self._stop.wait(self.validation_interval):
+            try:
+                self.validate_idle_connections()
+            except Exception as e:
+                logger.warning(f"Connection pool validation failed: {str(e)}")
+
+    def validate_idle_connections(self) -> int:
+        """
+        Ping every idle pooled connection, invalidating dead ones
+
+        Returns:
+            Number of connections that failed validation
+        """
+        pool = self.engine.pool
+        failures = 0
+
+        # QueuePool hands out idle connections FIFO and a returned connection
+        # goes to the back, so taking them one at a time visits each idle
+        # connection once while the rest stay available to other callers
+        with self.metrics.paused():
+            for _ in range(pool.checkedin()):
+                if pool.checkedin() == 0:
+                    break
+                conn = pool.connect()
+                self.metrics.increment("validations")
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute("SELECT 1")
+                    cursor.close()
+                except Exception:
+                    failures += 1
+                    self.metrics.increment("validation_failures")
+                    conn.invalidate()
+                finally:
+                    conn.close()
+
+        if failures:
+            logger.warning(f"Invalidated {failures} stale pooled connections")
+        return failures
+
+    def dispose(self) -> None:
+        """Stop validation and close all pooled connections"""
+        self._stop.set()
+        if self._validator:
+            self._validator.join(timeout=5)
+            self._validator = None
+        self.engine.dispose()
+
+
+# Engines shared across storage classes, keyed by database URL
+_managers: Dict[str, EngineManager] = {}
+_registry_lock = threading.Lock()
+
+
+def acquire_engine(database_url: str, **options: Any) -> Engine:
+    """
+    Get the shared engine for a database URL, creating it on first use
+
+    Options only apply when the engine is created; later callers share the
+    existing pool. Every call must be paired with release_engine().
+
+    Args:
+        database_url: SQLAlchemy database URL
+        **options: EngineManager options (pool_size, max_overflow, ...)
+
+    Returns:
+        Shared SQLAlchemy engine
+    """
+    with _registry_lock:
+        manager = _managers.get(database_url)
+        if manager is None:
+            manager = EngineManager(database_url, **options)
+            manager.start_validation()
+            _managers[database_url] = manager
+            logger.info(f"Created shared engine for {manager.engine.url!r}")
+
+        manager.refcount += 1
+        return manager.engine
+
+
+def release_engine(database_url: str) -> None:
+    """
+    Release a reference to a shared engine, disposing it when unused
+
+    Args:
+        database_url: SQLAlchemy database URL passed to acquire_engine()
+    """
+    with _registry_lock:
+        manager = _managers.get(database_url)
+        if manager is None:
+            return
+
+        manager.refcount -= 1
+        if manager.refcount <= 0:
+            del _managers[database_url]
+            manager.dispose()
+            logger.info(f"Disposed shared engine for {manager.engine.url!r}")
+
+
+def get_pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Get pool metrics for every live shared engine
+
+    Returns:
+        Mapping of masked database URL to metric snapshot
+    """
+    with _registry_lock:
+        return {
+            repr(manager.engine.url): manager.metrics.snapshot()
+            for manager in _managers.values()
+        }
+
+
+def pool_options_from_settings(settings: Settings) -> Dict[str, Any]:
+    """
+    Build EngineManager options from application settings
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Keyword arguments for acquire_engine()
+    """
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "validation_interval": settings.db_pool_validation_interval,
+    }
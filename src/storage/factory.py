@@ -0,0 +1,50 @@
+"""Storage backend factory"""
+
+import logging
+
+from src.config import Settings
+from .base import BaseStorage
+from .engine import pool_options_from_settings
+
+logger = logging.getLogger(__name__)
+
+
+# Backends selectable through the STORAGE_BACKEND setting
+STORAGE_BACKENDS = ("mysql", "sqlite", "mmap")
+
+
+def create_storage(settings: Settings) -> BaseStorage:
+    """
+    Create the storage backend selected by settings
+    
+    Args:
+        settings: Application settings
+    
+    Returns:
+        Unconnected storage instance
+    """
+    backend = settings.storage_backend.strip().lower()
+    logger.info(f"Using storage backend: {backend}")
+    
+    if backend == "mysql":
+        from .mysql_storage import MySQLStorage
+        return MySQLStorage(
+            settings.get_database_url(),
+            pool_options=pool_options_from_settings(settings)
+        )
+    
+    if backend == "sqlite":
+        from .sqlite_storage import SQLiteStorage
+        return SQLiteStorage(
+            settings.sqlite_path,
+            pool_options=pool_options_from_settings(settings)
+        )
+    
+    if backend == "mmap":
+        from .mmap_storage import MmapStorage
+        return MmapStorage(settings.mmap_data_dir)
+    
+    raise ValueError(
+        f"Unknown storage backend: {settings.storage_backend}. "
+        f"Expected one of: {', '.join(STORAGE_BACKENDS)}"
+    )
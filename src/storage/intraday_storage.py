@@ -0,0 +1,323 @@
+"""Storage and ingestion of intraday bars"""
+
+import json
+import logging
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.models import Base, IntradayBar, StockPriceRaw
+from .engine import acquire_engine, release_engine
+
+logger = logging.getLogger(__name__)
+
+
+# Bar columns written and read besides the key
+BAR_COLUMNS = ["open_price", "high_price", "low_price", "close_price", "volume"]
+
+# Alpha Vantage field names of an intraday bar
+_FIELD_MAP = {
+    "1. open": "open_price",
+    "2. high": "high_price",
+    "3. low": "low_price",
+    "4. close": "close_price",
+    "5. volume": "volume",
+}
+
+_SERIES_KEY = re.compile(r"^Time Series \((\d+)min\)$")
+
+
+def parse_intraday_response(response_json: str, symbol: str) -> pd.DataFrame:
+    """
+    Normalize an Alpha Vantage TIME_SERIES_INTRADAY response into bars
+
+    Args:
+        response_json: Raw JSON response
+        symbol: Stock ticker symbol
+
+    Returns:
+        DataFrame with symbol, interval_minutes, ts and BAR_COLUMNS
+        (empty if the response holds no intraday series)
+    """
+    data = json.loads(response_json)
+    for key, series in data.items():
+        match = _SERIES_KEY.match(key)
+        if match and series:
+            break
+    else:
+        return pd.DataFrame(columns=["symbol", "interval_minutes", "ts"] + BAR_COLUMNS)
+
+    frame = pd.DataFrame.from_dict(series, orient="index").rename(columns=_FIELD_MAP)
+    frame = frame[BAR_COLUMNS].apply(pd.to_numeric, errors="coerce")
+    frame["volume"] = frame["volume"].astype("Int64")
+    frame.insert(0, "ts", pd.to_datetime(frame.index))
+    frame.insert(0, "interval_minutes", int(match.group(1)))
+    frame.insert(0, "symbol", symbol.upper())
+    return frame.sort_values("ts").reset_index(drop=True)
+
+
+class IntradayStorage:
+    """
+    Intraday bars in the intraday_bars table
+
+    Writes are bulk upserts of whole responses (a full Alpha Vantage month
+    is ~8k one-minute bars per symbol), so re-ingesting a response is
+    harmless. Reads return DataFrames and hit the clustered
+    (symbol, interval, ts) key as one range scan per symbol.
+    """
+
+    # Symbols per IN list when reading many symbols
+    SYMBOL_CHUNK = 500
+
+    # Raw responses parsed per bulk write when ingesting
+    RESPONSE_CHUNK = 20
+
+    def __init__(
+        self,
+        database_url: str,
+        pool_options: Optional[Dict[str, Any]] = None,
+        batch_size: int = 5000
+    ):
+        """
+        Initialize intraday storage
+
+        Args:
+            database_url: SQLAlchemy database URL
+            pool_options: Shared engine/pool options (see storage.engine.EngineManager)
+            batch_size: Rows per executemany batch when saving
+        """
+        self.database_url = database_url
+        self.pool_options = pool_options or {}
+        self.batch_size = batch_size
+        self.engine = None
+
+    def connect(self) -> bool:
+        """
+        Establish connection to database
+
+        Returns:
+            True if connection successful, False otherwise
+        """
+        try:
+            self.engine = acquire_engine(self.database_url, **self.pool_options)
+            with self.engine.connect() as conn:
+                conn.execute(select(1))
+            logger.info("Connected to database for intraday storage")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to connect to database: {str(e)}", exc_info=True)
+            # Callers do not disconnect after a failed connect; drop the engine reference now
+            if self.engine is not None:
+                release_engine(self.database_url)
+                self.engine = None
+            return False
+
+    def disconnect(self) -> None:
+        """Disconnect from database"""
+        if self.engine:
+            release_engine(self.database_url)
+            self.engine = None
+
+    def initialize_schema(self) -> bool:
+        """
+        Create the intraday_bars table if needed
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            Base.metadata.create_all(bind=self.engine, tables=[IntradayBar.__table__])
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to initialize schema: {str(e)}", exc_info=True)
+            return False
+
+    def _upsert_statement(self):
+        """INSERT that overwrites an existing bar with the same key"""
+        table = IntradayBar.__table__
+        if self.engine.dialect.name == "sqlite":
+            stmt = sqlite_insert(table)
+            return stmt.on_conflict_do_update(
+                index_elements=["symbol", "interval_minutes", "ts"],
+                set_={name: stmt.excluded[name] for name in BAR_COLUMNS}
+            )
+        stmt = mysql_insert(table)
+        return stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in BAR_COLUMNS})
+
+    def save_bars(self, bars: pd.DataFrame) -> int:
+        """
+        Upsert bars
+
+        Args:
+            bars: DataFrame as returned by parse_intraday_response()
+
+        Returns:
+            Number of bars written
+        """
+        if not self.engine:
+            logger.error("Cannot save bars: not connected to database")
+            return 0
+        if bars.empty:
+            return 0
+
+        bars = bars.drop_duplicates(["symbol", "interval_minutes", "ts"], keep="last")
+        # NaN/NA become NULL; Timestamps become datetimes
+        rows = bars.astype(object).where(bars.notna(), None).to_dict("records")
+        for row in rows:
+            row["ts"] = row["ts"].to_pydatetime()
+
+        try:
+            with self.engine.begin() as conn:
+                stmt = self._upsert_statement()
+                for start in range(0, len(rows), self.batch_size):
+                    conn.execute(stmt, rows[start:start + self.batch_size])
+            return len(rows)
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while saving intraday bars: {str(e)}", exc_info=True)
+            return 0
+
+    def ingest_raw(self, since: Optional[datetime] = None) -> int:
+        """
+        Normalize stored intraday raw responses into bars
+
+        Args:
+            since: Only responses crawled at or after this time (optional)
+
+        Returns:
+            Number of bars written
+        """
+        if not self.engine:
+            logger.error("Cannot ingest bars: not connected to database")
+            return 0
+
+        stmt = select(StockPriceRaw.id).where(
+            StockPriceRaw.time_granularity.like("intraday%"),
+            StockPriceRaw.response_status == "success",
+        )
+        if since:
+            stmt = stmt.where(StockPriceRaw.crawl_save_time >= since)
+        # Oldest first, so a later response wins when responses overlap
+        stmt = stmt.order_by(StockPriceRaw.crawl_save_time, StockPriceRaw.id)
+
+        saved = responses = 0
+        try:
+            with self.engine.connect() as conn:
+                ids = conn.scalars(stmt).all()
+
+            # Payloads are loaded a few at a time and no cursor is held while writing
+            for start in range(0, len(ids), self.RESPONSE_CHUNK):
+                chunk = ids[start:start + self.RESPONSE_CHUNK]
+                with self.engine.connect() as conn:
+                    rows = conn.execute(
+                        select(StockPriceRaw.stock_code, StockPriceRaw.response_json)
+                        .where(StockPriceRaw.id.in_(chunk))
+                        .order_by(StockPriceRaw.crawl_save_time, StockPriceRaw.id)
+                    ).all()
+                frames = [
+                    parse_intraday_response(response_json, stock_code)
+                    for stock_code, response_json in rows
+                ]
+                responses += len(frames)
+                frames = [frame for frame in frames if not frame.empty]
+                if frames:
+                    saved += self.save_bars(pd.concat(frames, ignore_index=True))
+
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error(f"Failed to ingest intraday responses: {str(e)}", exc_info=True)
+
+        logger.info(f"Ingested {saved} intraday bars from {responses} raw responses")
+        return saved
+
+    def get_bars(
+        self,
+        symbols: Optional[List[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        interval_minutes: int = 1,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Load bars into a DataFrame
+
+        Args:
+            symbols: Stock ticker symbols (optional, defaults to all symbols)
+            start: Earliest bar start, inclusive (optional)
+            end: Latest bar start, inclusive (optional)
+            interval_minutes: Bar length
+            columns: Columns to load besides symbol and ts (optional, defaults to all)
+
+        Returns:
+            DataFrame ordered by symbol and ts
+        """
+        if not self.engine:
+            logger.error("Cannot read bars: not connected to database")
+            return pd.DataFrame()
+
+        names = ["symbol", "ts"] + [name for name in (columns or BAR_COLUMNS) if name in BAR_COLUMNS]
+        base = select(*[getattr(IntradayBar, name) for name in names]) \
+            .where(IntradayBar.interval_minutes == interval_minutes)
+        if start:
+            base = base.where(IntradayBar.ts >= start)
+        if end:
+            base = base.where(IntradayBar.ts <= end)
+
+        symbol_chunks = [None] if not symbols else [
+            sorted(symbols)[i:i + self.SYMBOL_CHUNK]
+            for i in range(0, len(symbols), self.SYMBOL_CHUNK)
+        ]
+        frames = []
+        with self.engine.connect() as conn:
+            for chunk in symbol_chunks:
+                stmt = base if chunk is None else base.where(IntradayBar.symbol.in_(chunk))
+                frames.append(pd.read_sql(
+                    stmt.order_by(IntradayBar.symbol, IntradayBar.ts), conn, parse_dates=["ts"]
+                ))
+
+        frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        # SQLite stores whole-number prices as integers; keep price columns float
+        prices = [name for name in names if name.endswith("_price")]
+        frame[prices] = frame[prices].astype(float)
+        return frame
+
+    def get_latest_timestamps(
+        self,
+        symbols: List[str],
+        interval_minutes: int = 1
+    ) -> Dict[str, datetime]:
+        """
+        Get the latest stored bar start per symbol in one query
+
+        Args:
+            symbols: Stock ticker symbols
+            interval_minutes: Bar length
+
+        Returns:
+            Mapping of symbol to latest bar start (symbols without bars are omitted)
+        """
+        if not self.engine or not symbols:
+            return {}
+
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    select(IntradayBar.symbol, func.max(IntradayBar.ts))
+                    .where(
+                        IntradayBar.symbol.in_(symbols),
+                        IntradayBar.interval_minutes == interval_minutes,
+                    )
+                    .group_by(IntradayBar.symbol)
+                ).all()
+            return {symbol: latest for symbol, latest in rows}
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while retrieving latest bars: {str(e)}", exc_info=True)
+            return {}
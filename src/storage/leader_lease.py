@@ -0,0 +1,150 @@
+"""Database lease electing one leader among scheduler replicas"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, insert, or_, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.models import SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderLease:
+    """
+    Lease row in scheduler_leases; whoever holds it unexpired is the leader
+
+    Acquiring and renewing are the same conditional UPDATE, which succeeds
+    only if the row is free, expired or already ours, so two replicas can
+    never both win. The holder trusts its leadership only until
+    ``ttl - margin`` after the last successful renewal by its own
+    monotonic clock, which leaves room for clock skew and slow renewals.
+    """
+
+    def __init__(self, engine: Engine, name: str, holder: str, ttl: float = 15.0):
+        """
+        Initialize the lease
+
+        Args:
+            engine: SQLAlchemy engine of the shared database
+            name: Lease name (one per group of competing replicas)
+            holder: Name of this replica
+            ttl: Seconds a renewal keeps the lease
+        """
+        self.engine = engine
+        self.name = name
+        self.holder = holder
+        self.ttl = ttl
+        self.margin = min(ttl / 5, 5.0)
+        self.term = None
+        self._valid_until = 0.0
+        self._lock = threading.Lock()
+        self._row_created = False
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this replica holds an unexpired lease"""
+        return time.monotonic() < self._valid_until
+
+    def _ensure_row(self, conn) -> None:
+        """Create the lease row (expired, no holder) if it doesn't exist"""
+        if self._row_created:
+            return
+        stmt = insert(SchedulerLease).prefix_with("OR IGNORE", dialect="sqlite") \
+            .prefix_with("IGNORE", dialect="mysql")
+        conn.execute(stmt, {
+            "name": self.name,
+            "holder": None,
+            "term": 0,
+            "expires_at": datetime(1970, 1, 1),
+            "updated_at": datetime.utcnow(),
+        })
+        self._row_created = True
+
+    def try_acquire(self) -> bool:
+        """
+        Acquire or renew the lease
+
+        Returns:
+            True if this replica is the leader after the call
+        """
+        with self._lock:
+            started = time.monotonic()
+            now = datetime.utcnow()
+            try:
+                with self.engine.begin() as conn:
+                    self._ensure_row(conn)
+                    result = conn.execute(
+                        update(SchedulerLease)
+                        .where(
+                            SchedulerLease.name == self.name,
+                            or_(
+                                SchedulerLease.holder == self.holder,
+                                SchedulerLease.holder.is_(None),
+                                SchedulerLease.expires_at < now,
+                            ),
+                        )
+                        # term first: MySQL evaluates SET assignments left to right
+                        .ordered_values(
+                            (SchedulerLease.term, case(
+                                (SchedulerLease.holder == self.holder, SchedulerLease.term),
+                                else_=SchedulerLease.term + 1,
+                            )),
+                            (SchedulerLease.holder, self.holder),
+                            (SchedulerLease.expires_at, now + timedelta(seconds=self.ttl)),
+                            (SchedulerLease.updated_at, now),
+                        )
+                    )
+                    acquired = result.rowcount == 1
+                    if acquired:
+                        self.term = conn.scalar(
+                            select(SchedulerLease.term).where(SchedulerLease.name == self.name)
+                        )
+
+            except SQLAlchemyError as e:
+                logger.error(
+                    f"Database error while renewing leader lease: {str(e)}", exc_info=True
+                )
+                acquired = False
+
+            was_leader = self.is_leader
+            if acquired:
+                self._valid_until = started + self.ttl - self.margin
+                if not was_leader:
+                    logger.info(f"{self.holder} is now leader for {self.name} (term {self.term})")
+            else:
+                self._valid_until = 0.0
+                if was_leader:
+                    logger.warning(f"{self.holder} lost leadership for {self.name}")
+            return acquired
+
+    def release(self) -> None:
+        """Give up the lease so a standby can take over immediately"""
+        with self._lock:
+            if not self.is_leader:
+                return
+            self._valid_until = 0.0
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(
+                        update(SchedulerLease)
+                        .where(
+                            SchedulerLease.name == self.name,
+                            SchedulerLease.holder == self.holder,
+                        )
+                        .values(
+                            holder=None,
+                            expires_at=datetime(1970, 1, 1),
+                            updated_at=datetime.utcnow()
+                        )
+                    )
+                logger.info(f"{self.holder} released leadership for {self.name}")
+
+            except SQLAlchemyError as e:
+                logger.error(
+                    f"Database error while releasing leader lease: {str(e)}", exc_info=True
+                )
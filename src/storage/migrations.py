@@ -0,0 +1,140 @@
+"""Schema migrations for existing databases"""
+
+import logging
+
+from sqlalchemy import (
+    Column, Date, DateTime, Float, Index, Integer, MetaData, String, Table, inspect, text,
+)
+from sqlalchemy.engine import Engine
+
+from src.models import StockData
+
+logger = logging.getLogger(__name__)
+
+
+# Table layouts reported by stock_data_layout()
+LAYOUT_MISSING = "missing"
+LAYOUT_LEGACY = "legacy"
+LAYOUT_CLUSTERED = "clustered"
+
+
+def legacy_stock_data_table(metadata: MetaData, name: str = "stock_data") -> Table:
+    """
+    Original stock_data layout: surrogate id key plus overlapping indexes
+
+    Kept for benchmarking the migration; new databases use StockData.
+    Index names are prefixed with the table name so copies can share a
+    database.
+
+    Args:
+        metadata: MetaData to attach the table to
+        name: Table name
+
+    Returns:
+        Table definition
+    """
+    return Table(
+        name, metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("symbol", String(20), nullable=False, index=True),
+        Column("date", Date, nullable=False, index=True),
+        Column("open_price", Float),
+        Column("high_price", Float),
+        Column("low_price", Float),
+        Column("close_price", Float),
+        Column("adj_close_price", Float),
+        Column("volume", Integer),
+        Column("market_cap", Float),
+        Column("pe_ratio", Float),
+        Column("turnover_rate", Float),
+        Column("data_source", String(50), nullable=False),
+        Column("created_at", DateTime, nullable=False),
+        Column("updated_at", DateTime, nullable=False),
+        Index(f"idx_{name}_symbol_date", "symbol", "date", unique=True),
+        Index(f"idx_{name}_date", "date"),
+        Index(f"idx_{name}_created_at", "created_at"),
+    )
+
+
+def stock_data_layout(engine: Engine) -> str:
+    """
+    Detect the layout of the stock_data table
+
+    Args:
+        engine: SQLAlchemy engine
+
+    Returns:
+        LAYOUT_MISSING, LAYOUT_LEGACY (surrogate id key) or LAYOUT_CLUSTERED
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(StockData.__tablename__):
+        return LAYOUT_MISSING
+    columns = {column["name"] for column in inspector.get_columns(StockData.__tablename__)}
+    return LAYOUT_LEGACY if "id" in columns else LAYOUT_CLUSTERED
+
+
+def migrate_stock_data(engine: Engine, keep_backup: bool = True) -> int:
+    """
+    Rebuild a legacy stock_data table clustered on (symbol, date)
+
+    Rows are copied in key order into a table created from StockData, then
+    swapped in; the old table is kept as stock_data_old unless keep_backup
+    is False. On MySQL the copy runs beside the live table and the swap is
+    a single atomic RENAME TABLE, but rows written during the copy are not
+    carried over, so crawlers should be stopped first. On SQLite the whole
+    migration is one transaction.
+
+    Args:
+        engine: SQLAlchemy engine
+        keep_backup: Keep the original table as stock_data_old
+
+    Returns:
+        Number of rows copied (0 if there was nothing to migrate)
+
+    Raises:
+        RuntimeError: A stock_data_old table from an earlier migration exists
+    """
+    layout = stock_data_layout(engine)
+    if layout != LAYOUT_LEGACY:
+        logger.info(f"stock_data layout is {layout}, nothing to migrate")
+        return 0
+
+    if inspect(engine).has_table("stock_data_old"):
+        raise RuntimeError("stock_data_old exists; drop it before migrating again")
+
+    columns = ", ".join(column.name for column in StockData.__table__.columns)
+    copy_sql = (
+        "INSERT INTO {target} ({columns}) "
+        "SELECT {columns} FROM {source} ORDER BY symbol, date"
+    )
+
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ALTER TABLE stock_data RENAME TO stock_data_old")
+            # SQLite index names are database-wide; free them for the new table
+            for index in inspect(conn).get_indexes("stock_data_old"):
+                conn.exec_driver_sql(f'DROP INDEX "{index["name"]}"')
+            StockData.__table__.create(conn)
+            copied = conn.execute(text(copy_sql.format(
+                target="stock_data", source="stock_data_old", columns=columns
+            ))).rowcount
+            if not keep_backup:
+                conn.exec_driver_sql("DROP TABLE stock_data_old")
+
+    else:
+        new_table = StockData.__table__.to_metadata(MetaData(), name="stock_data_new")
+        new_table.drop(engine, checkfirst=True)
+        new_table.create(engine)
+        with engine.begin() as conn:
+            copied = conn.execute(text(copy_sql.format(
+                target="stock_data_new", source="stock_data", columns=columns
+            ))).rowcount
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "RENAME TABLE stock_data TO stock_data_old, stock_data_new TO stock_data"
+            )
+            if not keep_backup:
+                conn.exec_driver_sql("DROP TABLE stock_data_old")
+
+    logger.info(f"Migrated {copied} stock_data rows to the clustered (symbol, date) layout")
+    return copied
@@ -0,0 +1,368 @@
+"""Memory-mapped per-symbol binary time-series storage"""
+
+import logging
+import os
+import struct
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.data_sources.base import StockDataDTO
+from src.utils.metrics import ROWS_SAVED, record_cache
+from src.utils.tracing import traced
+from .base import BaseStorage
+
+logger = logging.getLogger(__name__)
+
+
+# Fixed-width bar record; one file per symbol holds these back to back, sorted by date
+BAR_DTYPE = np.dtype([
+    ("date", "<M8[D]"),
+    ("open_price", "<f8"),
+    ("high_price", "<f8"),
+    ("low_price", "<f8"),
+    ("close_price", "<f8"),
+    ("adj_close_price", "<f8"),
+    ("volume", "<i8"),
+    ("market_cap", "<f8"),
+    ("pe_ratio", "<f8"),
+    ("turnover_rate", "<f8"),
+    ("data_source", "S16"),
+])
+
+# File header: magic + number of committed records
+_MAGIC = b"SSCBARS1"
+_HEADER = struct.Struct("<8sQ")
+HEADER_SIZE = _HEADER.size
+
+# Volume is integral, so missing values need a sentinel instead of NaN
+_MISSING_VOLUME = -1
+
+_FLOAT_FIELDS = (
+    "open_price", "high_price", "low_price", "close_price",
+    "adj_close_price", "market_cap", "pe_ratio", "turnover_rate",
+)
+
+
+class MmapStorage(BaseStorage):
+    """
+    Append-only binary bar files accessed through numpy.memmap
+
+    Each symbol is stored in ``<data_dir>/<SYMBOL>.bars`` as a header followed
+    by fixed-width records ordered by date. Appends write the new records past
+    the committed end and only then bump the record count in the header, so a
+    crash mid-write never exposes a partial bar. Writes that touch existing
+    dates rewrite the file to a temporary path and atomically replace it.
+    """
+
+    FILE_SUFFIX = ".bars"
+
+    backend_name = "mmap"
+
+    def __init__(self, data_dir: str):
+        """
+        Initialize memory-mapped storage
+
+        Args:
+            data_dir: Directory holding one bar file per symbol
+        """
+        self.data_dir = Path(data_dir)
+        self._maps: Dict[str, Tuple[int, int, np.memmap]] = {}
+        self._lock = threading.Lock()
+        self._connected = False
+
+    def connect(self) -> bool:
+        """
+        Open the storage directory
+
+        Returns:
+            True if the directory is usable, False otherwise
+        """
+        try:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            self._connected = True
+            logger.info(f"Using memory-mapped bar storage at {self.data_dir}")
+            return True
+
+        except OSError as e:
+            logger.error(f"Failed to open bar storage directory: {str(e)}", exc_info=True)
+            return False
+
+    def disconnect(self) -> None:
+        """Release all open memory maps"""
+        with self._lock:
+            self._maps.clear()
+        self._connected = False
+        logger.info("Closed memory-mapped bar storage")
+
+    def initialize_schema(self) -> bool:
+        """
+        Bar files are created lazily, so only the directory is required
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.connect()
+
+    def _path(self, symbol: str) -> Path:
+        """Bar file path for a symbol"""
+        return self.data_dir / f"{symbol.upper()}{self.FILE_SUFFIX}"
+
+    @staticmethod
+    def _read_count(path: Path) -> int:
+        """Read the committed record count from a bar file header"""
+        with open(path, "rb") as f:
+            magic, count = _HEADER.unpack(f.read(HEADER_SIZE))
+
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a bar file")
+        return count
+
+    def _load(self, symbol: str) -> np.ndarray:
+        """
+        Map the committed records of a symbol
+
+        Returns:
+            Read-only structured array backed by the file (empty if no data)
+        """
+        path = self._path(symbol)
+        if not path.exists():
+            return np.empty(0, dtype=BAR_DTYPE)
+
+        count = self._read_count(path)
+        inode = path.stat().st_ino
+
+        cached = self._maps.get(symbol)
+        hit = bool(cached) and cached[0] == inode and cached[1] == count
+        record_cache("mmap", hit)
+        if hit:
+            return cached[2]
+
+        if count == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+
+        bars = np.memmap(path, dtype=BAR_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+        self._maps[symbol] = (inode, count, bars)
+        return bars
+
+    @staticmethod
+    def _to_records(data: List[StockDataDTO]) -> np.ndarray:
+        """Convert DTOs to a date-sorted record array, keeping the last value per date"""
+        records = np.empty(len(data), dtype=BAR_DTYPE)
+
+        records["date"] = [np.datetime64(dto.date, "D") for dto in data]
+        for field in _FLOAT_FIELDS:
+            records[field] = [
+                np.nan if getattr(dto, field) is None else getattr(dto, field)
+                for dto in data
+            ]
+        records["volume"] = [
+            _MISSING_VOLUME if dto.volume is None else dto.volume for dto in data
+        ]
+        records["data_source"] = [dto.data_source.encode("utf-8")[:16] for dto in data]
+
+        # Later duplicates win, matching the upsert semantics of the SQL backends
+        _, last = np.unique(records["date"][::-1], return_index=True)
+        return records[len(records) - 1 - last]
+
+    def _append(self, path: Path, count: int, records: np.ndarray) -> None:
+        """Append records past the committed end, then commit the new count"""
+        if not path.exists():
+            with open(path, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, 0))
+
+        with open(path, "r+b") as f:
+            f.seek(HEADER_SIZE + count * BAR_DTYPE.itemsize)
+            f.write(records.tobytes())
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, count + len(records)))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _rewrite(self, path: Path, records: np.ndarray) -> None:
+        """Write a complete bar file to a temporary path and swap it in"""
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, len(records)))
+            f.write(records.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @traced(category="storage")
+    def save_stock_data(self, data: List[StockDataDTO]) -> int:
+        """
+        Save stock data to per-symbol bar files
+
+        Args:
+            data: List of StockDataDTO objects to save
+
+        Returns:
+            Number of records saved
+        """
+        if not data:
+            logger.warning("No data to save")
+            return 0
+
+        if not self._connected:
+            logger.error("Cannot save data: storage not connected")
+            return 0
+
+        by_symbol: Dict[str, List[StockDataDTO]] = {}
+        for dto in data:
+            by_symbol.setdefault(dto.symbol.upper(), []).append(dto)
+
+        saved_count = 0
+
+        with self._lock:
+            for symbol, items in by_symbol.items():
+                try:
+                    records = self._to_records(items)
+                    existing = self._load(symbol)
+                    path = self._path(symbol)
+
+                    replaced = 0
+                    if len(existing) == 0 or records["date"][0] > existing["date"][-1]:
+                        self._append(path, len(existing), records)
+                    else:
+                        # Overlapping dates: merge, letting new records replace old ones
+                        keep = ~np.isin(existing["date"], records["date"])
+                        replaced = int((~keep).sum())
+                        merged = np.concatenate([np.asarray(existing)[keep], records])
+                        merged = merged[np.argsort(merged["date"], kind="stable")]
+                        self._rewrite(path, merged)
+
+                    self._maps.pop(symbol, None)
+                    saved_count += len(records)
+                    backend = self.backend_name
+                    ROWS_SAVED.inc(len(records) - replaced, backend=backend, outcome="inserted")
+                    ROWS_SAVED.inc(replaced, backend=backend, outcome="updated")
+
+                except (OSError, ValueError) as e:
+                    logger.error(
+                        f"Failed to write bars for {symbol}: {str(e)}",
+                        exc_info=True
+                    )
+
+        logger.info(f"Successfully saved/updated {saved_count} records")
+        return saved_count
+
+    def read_range(
+        self,
+        symbol: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> np.ndarray:
+        """
+        Zero-copy read of a symbol's bars within a date range
+
+        Args:
+            symbol: Stock ticker symbol
+            start_date: Start date filter (optional, inclusive)
+            end_date: End date filter (optional, inclusive)
+
+        Returns:
+            Structured array view (BAR_DTYPE) into the memory-mapped file
+        """
+        bars = self._load(symbol.upper())
+        dates = bars["date"]
+
+        lo = 0 if start_date is None else np.searchsorted(
+            dates, np.datetime64(start_date, "D"), side="left"
+        )
+        hi = len(bars) if end_date is None else np.searchsorted(
+            dates, np.datetime64(end_date, "D"), side="right"
+        )
+        return bars[lo:hi]
+
+    def get_stock_data(
+        self,
+        symbol: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[StockDataDTO]:
+        """
+        Retrieve stock data as DTOs
+
+        Args:
+            symbol: Stock ticker symbol
+            start_date: Start date filter (optional)
+            end_date: End date filter (optional)
+
+        Returns:
+            List of StockDataDTO objects
+        """
+        bars = self.read_range(symbol, start_date, end_date)
+        results = []
+
+        for bar in bars.tolist():
+            values = dict(zip(BAR_DTYPE.names, bar))
+            floats = {
+                field: None if np.isnan(values[field]) else values[field]
+                for field in _FLOAT_FIELDS
+            }
+            results.append(StockDataDTO(
+                symbol=symbol.upper(),
+                date=values["date"],
+                volume=None if values["volume"] == _MISSING_VOLUME else values["volume"],
+                data_source=values["data_source"].decode("utf-8"),
+                **floats
+            ))
+
+        logger.info(f"Retrieved {len(results)} records for {symbol}")
+        return results
+
+    @traced(category="storage")
+    def get_latest_date(self, symbol: str) -> Optional[date]:
+        """
+        Get the latest date for which data exists for a symbol
+
+        Args:
+            symbol: Stock ticker symbol
+
+        Returns:
+            Latest date or None if no data exists
+        """
+        bars = self._load(symbol.upper())
+        if len(bars) == 0:
+            return None
+        return bars["date"][-1].item()
+
+    def get_latest_closes(
+        self,
+        symbols: List[str]
+    ) -> Dict[str, Tuple[Optional[date], Optional[float]]]:
+        """
+        Get the latest date and its close for many symbols
+
+        Args:
+            symbols: Stock ticker symbols
+
+        Returns:
+            Mapping of symbol to (latest date, close) ((None, None) if no data exists)
+        """
+        latest = {}
+        for symbol in symbols:
+            bars = self._load(symbol.upper())
+            if len(bars) == 0:
+                latest[symbol] = (None, None)
+                continue
+            close = float(bars["close_price"][-1])
+            latest[symbol] = (bars["date"][-1].item(), None if np.isnan(close) else close)
+        return latest
+
+    def list_symbols(self) -> List[str]:
+        """
+        List symbols that have a bar file
+
+        Returns:
+            Sorted list of symbols
+        """
+        return sorted(path.stem for path in self.data_dir.glob(f"*{self.FILE_SUFFIX}"))
@@ -1,15 +1,22 @@
 """MySQL storage implementation"""
 
 import logging
-from typing import List, Optional
-from datetime import date
-from sqlalchemy import create_engine, select, func
+import math
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import date, datetime
+import pandas as pd
+from sqlalchemy import bindparam, select, func, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.exc import SQLAlchemyError
 
 from src.models import StockData, Base
 from src.data_sources.base import StockDataDTO
+from src.utils.metrics import ROWS_SAVED
+from src.utils.tracing import traced
 from .base import BaseStorage
+from .engine import acquire_engine, release_engine
+from .migrations import LAYOUT_LEGACY, stock_data_layout
 
 logger = logging.getLogger(__name__)
 
@@ -17,14 +24,34 @@ logger = logging.getLogger(__name__)
 class MySQLStorage(BaseStorage):
     """MySQL storage implementation using SQLAlchemy"""
     
-    def __init__(self, database_url: str):
+    backend_name = "mysql"
+    
+    # Value columns returned by read_frame() when none are requested
+    FRAME_COLUMNS = [
+        "open_price", "high_price", "low_price", "close_price", "adj_close_price",
+        "volume", "market_cap", "pe_ratio", "turnover_rate", "data_source",
+    ]
+    
+    # Relative tolerance when comparing with stored values (MySQL FLOAT keeps ~7 digits)
+    CHANGE_TOLERANCE = 1e-6
+    
+    def __init__(
+        self,
+        database_url: str,
+        pool_options: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000
+    ):
         """
         Initialize MySQL storage
         
         Args:
             database_url: SQLAlchemy database URL
+            pool_options: Shared engine/pool options (see storage.engine.EngineManager)
+            batch_size: Rows per executemany batch when saving
         """
         self.database_url = database_url
+        self.pool_options = pool_options or {}
+        self.batch_size = batch_size
         self.engine = None
         self.SessionLocal = None
     
@@ -37,12 +64,8 @@ class MySQLStorage(BaseStorage):
         """
         try:
             logger.info("Connecting to MySQL database...")
-            self.engine = create_engine(
-                self.database_url,
-                echo=False,
-                pool_pre_ping=True,  # Enable connection health checks
-                pool_recycle=3600,   # Recycle connections after 1 hour
-            )
+            # Engine and pool are shared with other storage classes on the same URL
+            self.engine = acquire_engine(self.database_url, **self.pool_options)
             
             # Test connection
             with self.engine.connect() as conn:
@@ -59,12 +82,18 @@ class MySQLStorage(BaseStorage):
         
         except Exception as e:
             logger.error(f"Failed to connect to MySQL: {str(e)}", exc_info=True)
+            # Callers do not disconnect after a failed connect; drop the engine reference now
+            if self.engine is not None:
+                release_engine(self.database_url)
+                self.engine = None
             return False
     
     def disconnect(self) -> None:
         """Disconnect from MySQL database"""
         if self.engine:
-            self.engine.dispose()
+            release_engine(self.database_url)
+            self.engine = None
+            self.SessionLocal = None
             logger.info("Disconnected from MySQL database")
     
     def initialize_schema(self) -> bool:
@@ -81,6 +110,14 @@ class MySQLStorage(BaseStorage):
             
             logger.info("Initializing database schema...")
             Base.metadata.create_all(bind=self.engine)
+            
+            # create_all() leaves an existing table as it is
+            if stock_data_layout(self.engine) == LAYOUT_LEGACY:
+                logger.warning(
+                    "stock_data still has the legacy id primary key; run "
+                    "'python utils.py migrate-schema' to cluster it on (symbol, date) "
+                    "(partitioning stock_data needs the new layout)"
+                )
             logger.info("Database schema initialized successfully")
             return True
         
@@ -88,88 +125,173 @@ class MySQLStorage(BaseStorage):
             logger.error(f"Failed to initialize schema: {str(e)}", exc_info=True)
             return False
     
+    @staticmethod
+    def _to_rows(data: List[StockDataDTO]) -> List[Dict[str, Any]]:
+        """Convert DTOs to column dicts, keeping the last DTO per (symbol, date)"""
+        now = datetime.utcnow()
+        rows = {}
+        for dto in data:
+            rows[(dto.symbol, dto.date)] = {
+                "symbol": dto.symbol,
+                "date": dto.date,
+                "open_price": dto.open_price,
+                "high_price": dto.high_price,
+                "low_price": dto.low_price,
+                "close_price": dto.close_price,
+                "adj_close_price": dto.adj_close_price,
+                "volume": dto.volume,
+                "market_cap": dto.market_cap,
+                "pe_ratio": dto.pe_ratio,
+                "turnover_rate": dto.turnover_rate,
+                "data_source": dto.data_source,
+                "created_at": now,
+                "updated_at": now,
+            }
+        return list(rows.values())
+    
+    @classmethod
+    def _unchanged(cls, row: Dict[str, Any], stored) -> bool:
+        """Whether a new row carries the same values as the stored one"""
+        for name in cls.FRAME_COLUMNS:
+            new, old = row[name], getattr(stored, name)
+            if new is None or old is None:
+                if new is not old:
+                    return False
+            elif isinstance(new, float) or isinstance(old, float):
+                if not math.isclose(new, old, rel_tol=cls.CHANGE_TOLERANCE, abs_tol=1e-12):
+                    return False
+            elif new != old:
+                return False
+        return True
+    
+    def _plan_writes(self, conn, rows: List[Dict[str, Any]]):
+        """
+        Split rows into inserts, updates and unchanged rows
+        
+        The stored values for the whole batch come from one range SELECT.
+        
+        Returns:
+            Tuple of (rows to insert, rows to update, number of unchanged rows)
+        """
+        stmt = self._range_query(
+            select(StockData.symbol, StockData.date,
+                   *[getattr(StockData, name) for name in self.FRAME_COLUMNS]),
+            sorted({row["symbol"] for row in rows}),
+            min(row["date"] for row in rows),
+            max(row["date"] for row in rows)
+        )
+        stored = {(r.symbol, r.date): r for r in conn.execute(stmt)}
+        
+        inserts, updates, unchanged = [], [], 0
+        for row in rows:
+            existing = stored.get((row["symbol"], row["date"]))
+            if existing is None:
+                inserts.append(row)
+            elif self._unchanged(row, existing):
+                unchanged += 1
+            else:
+                updates.append(row)
+        return inserts, updates, unchanged
+    
+    def _insert_statement(self):
+        """
+        INSERT used for new rows
+        
+        Upserts, so a row inserted by another writer since the change check
+        is overwritten instead of failing the batch.
+        """
+        stmt = mysql_insert(StockData.__table__)
+        return stmt.on_duplicate_key_update({
+            name: stmt.inserted[name] for name in self.FRAME_COLUMNS + ["updated_at"]
+        })
+    
+    @staticmethod
+    def _update_statement():
+        """UPDATE used for changed rows (executemany over row dicts)"""
+        table = StockData.__table__
+        return update(table).where(
+            table.c.symbol == bindparam("key_symbol"),
+            table.c.date == bindparam("key_date")
+        ).values({
+            name: bindparam(name)
+            for name in MySQLStorage.FRAME_COLUMNS + ["updated_at"]
+        })
+    
+    @traced(category="storage")
     def save_stock_data(self, data: List[StockDataDTO]) -> int:
         """
-        Save stock data to MySQL database
+        Save stock data, writing only new or changed rows
+        
+        Existing rows for the batch are read in one query and compared
+        column by column; identical rows are skipped, so re-fetched
+        overlapping bars cause no writes, redo/binlog traffic or index churn.
         
         Args:
             data: List of StockDataDTO objects to save
         
         Returns:
-            Number of records saved
+            Number of records inserted or updated
         """
         if not data:
             logger.warning("No data to save")
             return 0
         
-        if not self.SessionLocal:
+        if not self.engine:
             logger.error("Cannot save data: not connected to database")
             return 0
         
-        saved_count = 0
-        session = self.SessionLocal()
+        rows = self._to_rows(data)
         
         try:
-            for dto in data:
-                try:
-                    # Check if record exists
-                    existing = session.query(StockData).filter(
-                        StockData.symbol == dto.symbol,
-                        StockData.date == dto.date
-                    ).first()
-                    
-                    if existing:
-                        # Update existing record
-                        existing.open_price = dto.open_price
-                        existing.high_price = dto.high_price
-                        existing.low_price = dto.low_price
-                        existing.close_price = dto.close_price
-                        existing.adj_close_price = dto.adj_close_price
-                        existing.volume = dto.volume
-                        existing.market_cap = dto.market_cap
-                        existing.pe_ratio = dto.pe_ratio
-                        existing.turnover_rate = dto.turnover_rate
-                        existing.data_source = dto.data_source
-                        logger.debug(f"Updated existing record: {dto.symbol} {dto.date}")
-                    else:
-                        # Insert new record
-                        stock_data = StockData(
-                            symbol=dto.symbol,
-                            date=dto.date,
-                            open_price=dto.open_price,
-                            high_price=dto.high_price,
-                            low_price=dto.low_price,
-                            close_price=dto.close_price,
-                            adj_close_price=dto.adj_close_price,
-                            volume=dto.volume,
-                            market_cap=dto.market_cap,
-                            pe_ratio=dto.pe_ratio,
-                            turnover_rate=dto.turnover_rate,
-                            data_source=dto.data_source
-                        )
-                        session.add(stock_data)
-                        logger.debug(f"Inserted new record: {dto.symbol} {dto.date}")
-                    
-                    saved_count += 1
+            # One transaction: change check, then executemany per batch
+            with self.engine.begin() as conn:
+                inserts, updates, unchanged = self._plan_writes(conn, rows)
                 
-                except IntegrityError as e:
-                    logger.warning(
-                        f"Duplicate entry for {dto.symbol} on {dto.date}, skipping"
-                    )
-                    session.rollback()
-                    continue
-            
-            session.commit()
-            logger.info(f"Successfully saved/updated {saved_count} records")
+                for start in range(0, len(inserts), self.batch_size):
+                    conn.execute(self._insert_statement(), inserts[start:start + self.batch_size])
+                
+                # Only the SET columns and the key: symbol, date and created_at stay as stored
+                params = [
+                    {
+                        **{name: row[name] for name in self.FRAME_COLUMNS + ["updated_at"]},
+                        "key_symbol": row["symbol"],
+                        "key_date": row["date"],
+                    }
+                    for row in updates
+                ]
+                for start in range(0, len(params), self.batch_size):
+                    conn.execute(self._update_statement(), params[start:start + self.batch_size])
         
         except SQLAlchemyError as e:
-            session.rollback()
             logger.error(f"Database error while saving data: {str(e)}", exc_info=True)
+            return 0
         
-        finally:
-            session.close()
-        
-        return saved_count
+        ROWS_SAVED.inc(len(inserts), backend=self.backend_name, outcome="inserted")
+        ROWS_SAVED.inc(len(updates), backend=self.backend_name, outcome="updated")
+        ROWS_SAVED.inc(unchanged, backend=self.backend_name, outcome="unchanged")
+        logger.info(
+            f"Saved {len(rows)} records: {len(inserts)} inserted, "
+            f"{len(updates)} updated, {unchanged} unchanged"
+        )
+        return len(inserts) + len(updates)
+    
+    @staticmethod
+    def _record_to_dto(record) -> StockDataDTO:
+        """Convert a StockData row (ORM object or Row) to a DTO"""
+        return StockDataDTO(
+            symbol=record.symbol,
+            date=record.date,
+            open_price=record.open_price,
+            high_price=record.high_price,
+            low_price=record.low_price,
+            close_price=record.close_price,
+            adj_close_price=record.adj_close_price,
+            volume=record.volume,
+            market_cap=record.market_cap,
+            pe_ratio=record.pe_ratio,
+            turnover_rate=record.turnover_rate,
+            data_source=record.data_source
+        )
     
     def get_stock_data(
         self,
@@ -206,21 +328,7 @@ class MySQLStorage(BaseStorage):
             query = query.order_by(StockData.date)
             
             for record in query.all():
-                dto = StockDataDTO(
-                    symbol=record.symbol,
-                    date=record.date,
-                    open_price=record.open_price,
-                    high_price=record.high_price,
-                    low_price=record.low_price,
-                    close_price=record.close_price,
-                    adj_close_price=record.adj_close_price,
-                    volume=record.volume,
-                    market_cap=record.market_cap,
-                    pe_ratio=record.pe_ratio,
-                    turnover_rate=record.turnover_rate,
-                    data_source=record.data_source
-                )
-                results.append(dto)
+                results.append(self._record_to_dto(record))
             
             logger.info(f"Retrieved {len(results)} records for {symbol}")
         
@@ -232,6 +340,7 @@ class MySQLStorage(BaseStorage):
         
         return results
     
+    @traced(category="storage")
     def get_latest_date(self, symbol: str) -> Optional[date]:
         """
         Get the latest date for which data exists for a symbol
@@ -264,4 +373,216 @@ class MySQLStorage(BaseStorage):
         
         finally:
             session.close()
-
+    
+    @traced(category="storage")
+    def get_latest_dates(self, symbols: List[str]) -> Dict[str, Optional[date]]:
+        """
+        Get the latest stored date for many symbols in one query
+        
+        Args:
+            symbols: Stock ticker symbols
+        
+        Returns:
+            Mapping of symbol to latest date (None if no data exists)
+        """
+        latest = {symbol: None for symbol in symbols}
+        
+        if not self.SessionLocal:
+            logger.error("Cannot retrieve latest dates: not connected to database")
+            return latest
+        
+        session = self.SessionLocal()
+        
+        try:
+            rows = session.query(StockData.symbol, func.max(StockData.date)).filter(
+                StockData.symbol.in_(symbols)
+            ).group_by(StockData.symbol).all()
+            
+            latest.update({symbol: max_date for symbol, max_date in rows})
+        
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error while getting latest dates: {str(e)}",
+                exc_info=True
+            )
+        
+        finally:
+            session.close()
+        
+        return latest
+    
+    @traced(category="storage")
+    def get_latest_closes(
+        self,
+        symbols: List[str]
+    ) -> Dict[str, Tuple[Optional[date], Optional[float]]]:
+        """
+        Get the latest stored date and its close for many symbols in one query
+        
+        Args:
+            symbols: Stock ticker symbols
+        
+        Returns:
+            Mapping of symbol to (latest date, close) ((None, None) if no data exists)
+        """
+        latest = {symbol: (None, None) for symbol in symbols}
+        
+        if not self.SessionLocal:
+            logger.error("Cannot retrieve latest closes: not connected to database")
+            return latest
+        
+        session = self.SessionLocal()
+        
+        try:
+            newest = select(StockData.symbol, func.max(StockData.date).label("date")).where(
+                StockData.symbol.in_(symbols)
+            ).group_by(StockData.symbol).subquery()
+            
+            # Each symbol's newest bar is a primary-key lookup from the grouped dates
+            rows = session.query(StockData.symbol, StockData.date, StockData.close_price).join(
+                newest,
+                (StockData.symbol == newest.c.symbol) & (StockData.date == newest.c.date)
+            ).all()
+            
+            latest.update({symbol: (day, close) for symbol, day, close in rows})
+        
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error while getting latest closes: {str(e)}",
+                exc_info=True
+            )
+        
+        finally:
+            session.close()
+        
+        return latest
+    
+    @traced(category="storage")
+    def get_average_dollar_volume(
+        self,
+        symbols: List[str],
+        start_date: Optional[date] = None
+    ) -> Dict[str, Optional[float]]:
+        """
+        Get the average daily traded value (close * volume) in one query
+        
+        Args:
+            symbols: Stock ticker symbols
+            start_date: Only average bars on or after this date (optional)
+        
+        Returns:
+            Mapping of symbol to average traded value (None if no bars)
+        """
+        averages = {symbol: None for symbol in symbols}
+        
+        if not self.SessionLocal:
+            logger.error("Cannot retrieve liquidity: not connected to database")
+            return averages
+        
+        session = self.SessionLocal()
+        
+        try:
+            query = session.query(
+                StockData.symbol, func.avg(StockData.close_price * StockData.volume)
+            ).filter(StockData.symbol.in_(symbols))
+            if start_date:
+                query = query.filter(StockData.date >= start_date)
+            rows = query.group_by(StockData.symbol).all()
+            
+            averages.update({
+                symbol: float(value) if value is not None else None
+                for symbol, value in rows
+            })
+        
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error while getting liquidity: {str(e)}",
+                exc_info=True
+            )
+        
+        finally:
+            session.close()
+        
+        return averages
+    
+    def iter_stock_data(
+        self,
+        symbol: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        batch_size: int = 10_000
+    ) -> Iterator[List[StockDataDTO]]:
+        """
+        Stream stock data in batches without loading the full result set
+        
+        Args:
+            symbol: Stock ticker symbol (optional, defaults to all symbols)
+            start_date: Start date filter (optional)
+            end_date: End date filter (optional)
+            batch_size: Number of rows per yielded batch
+        
+        Yields:
+            Lists of StockDataDTO objects ordered by symbol and date
+        """
+        if not self.engine:
+            logger.error("Cannot stream data: not connected to database")
+            return
+        
+        stmt = self._range_query(
+            select(StockData), symbol and [symbol], start_date, end_date
+        )
+        
+        with self.engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True,
+                yield_per=batch_size
+            ).execute(stmt)
+            
+            for partition in result.partitions():
+                yield [self._record_to_dto(row) for row in partition]
+    
+    def read_frame(
+        self,
+        symbols: Optional[List[str]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Load a column subset of stock data into a DataFrame for analytics
+        
+        Args:
+            symbols: Stock ticker symbols (optional, defaults to all symbols)
+            start_date: Start date filter (optional)
+            end_date: End date filter (optional)
+            columns: Columns to load besides symbol and date (optional, defaults to all)
+        
+        Returns:
+            DataFrame ordered by symbol and date
+        """
+        if not self.engine:
+            logger.error("Cannot read data: not connected to database")
+            return pd.DataFrame()
+        
+        names = ["symbol", "date"] + [
+            name for name in (columns or self.FRAME_COLUMNS)
+            if name not in ("symbol", "date")
+        ]
+        stmt = self._range_query(
+            select(*[getattr(StockData, name) for name in names]),
+            symbols, start_date, end_date
+        )
+        
+        with self.engine.connect() as conn:
+            return pd.read_sql(stmt, conn)
+    
+    @staticmethod
+    def _range_query(stmt, symbols, start_date, end_date):
+        """Apply the common symbol/date filters and ordering to a select"""
+        if symbols:
+            stmt = stmt.where(StockData.symbol.in_(symbols))
+        if start_date:
+            stmt = stmt.where(StockData.date >= start_date)
+        if end_date:
+            stmt = stmt.where(StockData.date <= end_date)
+        return stmt.order_by(StockData.symbol, StockData.date)
@@ -0,0 +1,279 @@
+"""Partitioned Parquet mirror of stock_data for offline analytics"""
+
+import json
+import logging
+import os
+import zlib
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from sqlalchemy import func, select
+
+from src.models import StockData
+
+logger = logging.getLogger(__name__)
+
+
+# Columns mirrored from stock_data (surrogate keys and audit columns are skipped)
+MIRROR_SCHEMA = pa.schema([
+    ("symbol", pa.string()),
+    ("date", pa.date32()),
+    ("open_price", pa.float64()),
+    ("high_price", pa.float64()),
+    ("low_price", pa.float64()),
+    ("close_price", pa.float64()),
+    ("adj_close_price", pa.float64()),
+    ("volume", pa.int64()),
+    ("market_cap", pa.float64()),
+    ("pe_ratio", pa.float64()),
+    ("turnover_rate", pa.float64()),
+    ("data_source", pa.string()),
+])
+
+PARTITION_SCHEMA = pa.schema([
+    ("year", pa.int32()),
+    ("bucket", pa.int32()),
+])
+
+
+def symbol_bucket(symbol: str, num_buckets: int) -> int:
+    """
+    Map a symbol to a stable partition bucket
+
+    Args:
+        symbol: Stock ticker symbol
+        num_buckets: Total number of symbol buckets
+
+    Returns:
+        Bucket number in [0, num_buckets)
+    """
+    return zlib.crc32(symbol.upper().encode("utf-8")) % num_buckets
+
+
+class ParquetMirror:
+    """
+    Local Parquet copy of stock_data partitioned by year and symbol bucket
+
+    The mirror is append-only by date: each sync copies the rows whose date is
+    newer than the per-symbol watermark recorded by the previous sync, so heavy
+    research scans can run against local files instead of MySQL.
+    """
+
+    WATERMARK_FILE = "_watermark.json"
+
+    def __init__(self, root_dir: str, num_buckets: int = 16, chunk_size: int = 100_000):
+        """
+        Initialize the Parquet mirror
+
+        Args:
+            root_dir: Directory holding the partitioned dataset
+            num_buckets: Number of symbol hash buckets per year
+            chunk_size: Rows streamed from the database per write
+        """
+        if num_buckets < 1:
+            raise ValueError("num_buckets must be at least 1")
+
+        self.root_dir = Path(root_dir)
+        self.num_buckets = num_buckets
+        self.chunk_size = chunk_size
+
+    @property
+    def watermark_path(self) -> Path:
+        """Path of the watermark file"""
+        return self.root_dir / self.WATERMARK_FILE
+
+    def get_watermarks(self) -> Dict[str, date]:
+        """
+        Get the last exported date per symbol
+
+        Returns:
+            Mapping of symbol to the latest date present in the mirror
+        """
+        if not self.watermark_path.exists():
+            return {}
+
+        with open(self.watermark_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+
+        if state.get("num_buckets") != self.num_buckets:
+            raise ValueError(
+                f"Mirror at {self.root_dir} was written with "
+                f"{state.get('num_buckets')} buckets, not {self.num_buckets}"
+            )
+
+        return {
+            symbol: date.fromisoformat(value)
+            for symbol, value in state.get("symbols", {}).items()
+        }
+
+    def _save_watermarks(self, watermarks: Dict[str, date]) -> None:
+        """Atomically persist the watermark file"""
+        state = {
+            "num_buckets": self.num_buckets,
+            "updated_at": datetime.utcnow().isoformat(),
+            "symbols": {
+                symbol: value.isoformat()
+                for symbol, value in sorted(watermarks.items())
+            },
+        }
+
+        tmp_path = self.watermark_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.watermark_path)
+
+    def sync(self, engine) -> int:
+        """
+        Append rows newer than the watermark from the database to the mirror
+
+        Args:
+            engine: SQLAlchemy engine bound to the stock_data table
+
+        Returns:
+            Number of rows exported
+        """
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        watermarks = self.get_watermarks()
+        run_id = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+        exported = 0
+
+        with engine.connect() as conn:
+            # Only symbols with dates beyond their watermark need scanning
+            latest = conn.execute(
+                select(StockData.symbol, func.max(StockData.date))
+                .group_by(StockData.symbol)
+            ).all()
+            pending = {
+                symbol: watermarks.get(symbol)
+                for symbol, max_date in latest
+                if watermarks.get(symbol) is None or max_date > watermarks[symbol]
+            }
+
+            if not pending:
+                logger.info("Parquet mirror is up to date")
+                return 0
+
+            columns = [getattr(StockData, name) for name in MIRROR_SCHEMA.names]
+            stmt = select(*columns).where(StockData.symbol.in_(list(pending)))
+
+            known = [value for value in pending.values() if value is not None]
+            if known and len(known) == len(pending):
+                stmt = stmt.where(StockData.date > min(known))
+
+            # Ordering by date lets the watermark advance safely after every chunk
+            stmt = stmt.order_by(StockData.date, StockData.symbol)
+
+            for chunk_no, chunk in enumerate(
+                pd.read_sql(stmt, conn, chunksize=self.chunk_size)
+            ):
+                chunk = self._filter_new_rows(chunk, pending)
+                if chunk.empty:
+                    continue
+
+                self._write_chunk(chunk, basename=f"part-{run_id}-{chunk_no}")
+                exported += len(chunk)
+
+                for symbol, max_date in chunk.groupby("symbol")["date"].max().items():
+                    watermarks[symbol] = max_date
+                    pending[symbol] = max_date
+                self._save_watermarks(watermarks)
+
+        logger.info(f"Exported {exported} rows to Parquet mirror at {self.root_dir}")
+        return exported
+
+    def _filter_new_rows(
+        self,
+        chunk: pd.DataFrame,
+        watermarks: Dict[str, Optional[date]]
+    ) -> pd.DataFrame:
+        """Drop rows at or before each symbol's watermark"""
+        chunk["date"] = pd.to_datetime(chunk["date"]).dt.date
+
+        cutoff = chunk["symbol"].map(watermarks)
+        keep = cutoff.isna() | (chunk["date"] > cutoff.fillna(date.min))
+        return chunk[keep]
+
+    def _write_chunk(self, chunk: pd.DataFrame, basename: str) -> None:
+        """Write one DataFrame chunk into the year/bucket partitions"""
+        table = pa.Table.from_pandas(chunk, schema=MIRROR_SCHEMA, preserve_index=False)
+
+        years = [value.year for value in chunk["date"]]
+        buckets = [symbol_bucket(symbol, self.num_buckets) for symbol in chunk["symbol"]]
+        table = table.append_column(
+            PARTITION_SCHEMA.field("year"), pa.array(years, pa.int32())
+        ).append_column(
+            PARTITION_SCHEMA.field("bucket"), pa.array(buckets, pa.int32())
+        )
+
+        ds.write_dataset(
+            table,
+            self.root_dir,
+            format="parquet",
+            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+            basename_template=f"{basename}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+    def read(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Read mirrored rows, pruning partitions and columns
+
+        Args:
+            symbols: Symbols to read (optional, defaults to all)
+            start_date: Start date filter (optional)
+            end_date: End date filter (optional)
+            columns: Columns to load (optional, defaults to all mirrored columns)
+
+        Returns:
+            DataFrame sorted by symbol and date, one row per (symbol, date)
+        """
+        columns = list(columns or MIRROR_SCHEMA.names)
+        unknown = set(columns) - set(MIRROR_SCHEMA.names)
+        if unknown:
+            raise ValueError(f"Unknown mirror columns: {sorted(unknown)}")
+
+        if not any(self.root_dir.glob("year=*")):
+            return pd.DataFrame(columns=columns)
+
+        dataset = ds.dataset(
+            self.root_dir,
+            format="parquet",
+            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+            schema=pa.unify_schemas([MIRROR_SCHEMA, PARTITION_SCHEMA]),
+        )
+
+        expr = None
+
+        def _and(condition):
+            return condition if expr is None else expr & condition
+
+        if symbols is not None:
+            symbols = sorted({s.upper() for s in symbols})
+            buckets = sorted({symbol_bucket(s, self.num_buckets) for s in symbols})
+            expr = _and(ds.field("bucket").isin(buckets))
+            expr = _and(ds.field("symbol").isin(symbols))
+        if start_date:
+            expr = _and(ds.field("year") >= start_date.year)
+            expr = _and(ds.field("date") >= pa.scalar(start_date, pa.date32()))
+        if end_date:
+            expr = _and(ds.field("year") <= end_date.year)
+            expr = _and(ds.field("date") <= pa.scalar(end_date, pa.date32()))
+
+        # Sort keys are loaded even when not requested, then dropped
+        load_columns = list(dict.fromkeys(columns + ["symbol", "date"]))
+        df = dataset.to_table(columns=load_columns, filter=expr).to_pandas()
+        df = df.sort_values(["symbol", "date"], ignore_index=True)
+        # A sync interrupted between writing a chunk and saving the watermark
+        # exports those rows again, so the mirror may hold a bar twice
+        df = df.drop_duplicates(["symbol", "date"], keep="last", ignore_index=True)
+        return df[columns]
@@ -0,0 +1,361 @@
+"""MySQL RANGE partitioning and retention for time-series tables"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+logger = logging.getLogger(__name__)
+
+
+# Partition intervals accepted by PartitionSpec
+INTERVALS = ("year", "month")
+
+# Retention actions accepted by PartitionManager
+RETENTION_ACTIONS = ("drop", "exchange")
+
+
+@dataclass
+class PartitionSpec:
+    """How one table is partitioned"""
+
+    table: str
+    column: str
+    interval: str = "year"
+    is_datetime: bool = False
+    retention: Optional[int] = None
+    primary_key: Tuple[str, ...] = ()
+
+    def floor(self, day: date) -> date:
+        """Start of the interval containing day"""
+        return date(day.year, 1, 1) if self.interval == "year" else date(day.year, day.month, 1)
+
+    def next(self, start: date) -> date:
+        """Start of the interval after the one starting at start"""
+        if self.interval == "year":
+            return date(start.year + 1, 1, 1)
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+
+    def shift(self, start: date, intervals: int) -> date:
+        """Start of the interval a number of intervals before (negative) or after start"""
+        if self.interval == "year":
+            return date(start.year + intervals, 1, 1)
+        months = start.year * 12 + start.month - 1 + intervals
+        return date(months // 12, months % 12 + 1, 1)
+
+    def name(self, start: date) -> str:
+        """Partition name for the interval starting at start"""
+        return f"p{start:%Y}" if self.interval == "year" else f"p{start:%Y%m}"
+
+    def literal(self, bound: date) -> str:
+        """SQL literal for a partition bound"""
+        return f"'{bound.isoformat()} 00:00:00'" if self.is_datetime else f"'{bound.isoformat()}'"
+
+    def definition(self, start: date) -> str:
+        """PARTITION clause for the interval starting at start"""
+        return f"PARTITION {self.name(start)} VALUES LESS THAN ({self.literal(self.next(start))})"
+
+
+def stock_data_spec() -> PartitionSpec:
+    """stock_data: yearly partitions on the bar date, kept forever"""
+    return PartitionSpec(table="stock_data", column="date", interval="year")
+
+
+def raw_data_spec(retention_months: Optional[int] = None) -> PartitionSpec:
+    """
+    stock_price_raw: monthly partitions on the crawl time
+
+    MySQL requires the partitioning column in every unique key, so the
+    primary key becomes (id, crawl_save_time).
+
+    Args:
+        retention_months: Months of raw responses to keep (None keeps all)
+    """
+    return PartitionSpec(
+        table="stock_price_raw",
+        column="crawl_save_time",
+        interval="month",
+        is_datetime=True,
+        retention=retention_months or None,
+        primary_key=("id", "crawl_save_time"),
+    )
+
+
+def intraday_bars_spec() -> PartitionSpec:
+    """intraday_bars: monthly partitions on the bar start time, kept forever"""
+    return PartitionSpec(table="intraday_bars", column="ts", interval="month", is_datetime=True)
+
+
+def default_specs(raw_retention_months: Optional[int] = None) -> List[PartitionSpec]:
+    """Partition specs of the crawler's time-series tables"""
+    return [stock_data_spec(), raw_data_spec(raw_retention_months), intraday_bars_spec()]
+
+
+class PartitionManager:
+    """
+    Keeps RANGE COLUMNS partitions rolling ahead of time and enforces retention
+
+    Each table gets one partition per interval plus a MAXVALUE catch-all
+    (pfuture). Maintenance splits new intervals off pfuture while it is
+    still empty, so adding partitions never copies rows, and expired
+    partitions are removed with DROP PARTITION (or first moved out with
+    EXCHANGE PARTITION) instead of a DELETE. Queries filtering on the
+    partitioning column directly, as get_stock_data does, only read the
+    matching partitions.
+
+    Only MySQL supports partitioning; on other databases every method is a
+    no-op.
+    """
+
+    FUTURE = "pfuture"
+
+    def __init__(
+        self,
+        engine: Engine,
+        specs: List[PartitionSpec],
+        ahead: int = 3,
+        retention_action: str = "drop",
+        today: Optional[date] = None,
+        convert: bool = True
+    ):
+        """
+        Initialize the manager
+
+        Args:
+            engine: SQLAlchemy engine
+            specs: Tables to manage
+            ahead: Intervals to create beyond the current one
+            retention_action: drop expired partitions, or exchange them into
+                standalone <table>_archive_<period> tables first
+            today: Reference date (defaults to today)
+            convert: Partition tables that are not partitioned yet; the
+                conversion rebuilds the table and blocks writers, so
+                unattended maintenance leaves it to ``utils.py partitions --apply``
+        """
+        if retention_action not in RETENTION_ACTIONS:
+            raise ValueError(f"Unknown retention action: {retention_action}")
+        for spec in specs:
+            if spec.interval not in INTERVALS:
+                raise ValueError(f"Unknown partition interval: {spec.interval}")
+
+        self.engine = engine
+        self.specs = specs
+        self.ahead = ahead
+        self.retention_action = retention_action
+        self.today = today
+        self.convert = convert
+
+    @property
+    def supported(self) -> bool:
+        return self.engine.dialect.name == "mysql"
+
+    def list_partitions(self, table: str) -> List[Tuple[str, Optional[date], int]]:
+        """
+        Get a table's partitions in order
+
+        Args:
+            table: Table name
+
+        Returns:
+            List of (name, exclusive upper bound or None for MAXVALUE, approximate rows);
+            empty if the table is not partitioned
+        """
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS "
+                "FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table "
+                "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+            ), {"table": table}).all()
+
+        partitions = []
+        for name, description, table_rows in rows:
+            bound = None
+            if description and description.upper() != "MAXVALUE":
+                bound = date.fromisoformat(description.strip("'")[:10])
+            partitions.append((name, bound, int(table_rows or 0)))
+        return partitions
+
+    def _oldest_value(self, spec: PartitionSpec) -> Optional[date]:
+        with self.engine.connect() as conn:
+            value = conn.execute(text(f"SELECT MIN({spec.column}) FROM {spec.table}")).scalar()
+        if isinstance(value, datetime):
+            return value.date()
+        return value
+
+    def _primary_key_statement(self, spec: PartitionSpec) -> Optional[str]:
+        """ALTER widening the primary key to include the partitioning column, if needed"""
+        if not spec.primary_key:
+            return None
+        current = inspect(self.engine).get_pk_constraint(spec.table)["constrained_columns"]
+        if spec.column in current:
+            return None
+        return (
+            f"ALTER TABLE {spec.table} DROP PRIMARY KEY, "
+            f"ADD PRIMARY KEY ({', '.join(spec.primary_key)})"
+        )
+
+    def _has_rows(self, table: str, partition: Optional[str] = None) -> bool:
+        """Exact emptiness check (TABLE_ROWS is only an estimate for InnoDB)"""
+        source = f"{table} PARTITION ({partition})" if partition else table
+        with self.engine.connect() as conn:
+            return conn.execute(text(f"SELECT 1 FROM {source} LIMIT 1")).first() is not None
+
+    def _exchange_statements(self, spec: PartitionSpec, name: str) -> Optional[List[str]]:
+        """
+        Statements moving an expired partition into its archive table
+
+        Resumes a run that stopped part way: an existing archive table is
+        reused, and a partition that is already empty while its archive
+        holds rows was exchanged before, so only its DROP is left.
+
+        Args:
+            spec: Partitioned table
+            name: Expired partition
+
+        Returns:
+            Statements to run before the partition is dropped, or None when
+            both the partition and an existing archive hold rows (the
+            partition is then kept)
+        """
+        archive = f"{spec.table}_archive_{name[1:]}"
+        if not inspect(self.engine).has_table(archive):
+            return [
+                f"CREATE TABLE {archive} LIKE {spec.table}",
+                f"ALTER TABLE {archive} REMOVE PARTITIONING",
+                f"ALTER TABLE {spec.table} EXCHANGE PARTITION {name} WITH TABLE {archive}",
+            ]
+
+        statements = []
+        if self.list_partitions(archive):
+            statements.append(f"ALTER TABLE {archive} REMOVE PARTITIONING")
+        if not self._has_rows(archive):
+            statements.append(
+                f"ALTER TABLE {spec.table} EXCHANGE PARTITION {name} WITH TABLE {archive}"
+            )
+        elif self._has_rows(spec.table, name):
+            logger.error(
+                f"Both {spec.table} partition {name} and {archive} hold rows; "
+                f"keeping the partition until one of them is emptied"
+            )
+            return None
+        return statements
+
+    def plan(self, spec: PartitionSpec) -> List[str]:
+        """
+        DDL statements that bring one table up to date
+
+        Args:
+            spec: Table to plan for
+
+        Returns:
+            Statements in execution order (empty if nothing to do)
+        """
+        today = self.today or date.today()
+        horizon = spec.shift(spec.floor(today), self.ahead + 1)
+        partitions = self.list_partitions(spec.table)
+        statements = []
+
+        if not partitions:
+            if not self.convert:
+                logger.warning(
+                    f"{spec.table} is not partitioned; run 'python utils.py partitions --apply' "
+                    f"while the crawler is idle to convert it"
+                )
+                return statements
+            # One-time conversion: rebuilds the table
+            pk_statement = self._primary_key_statement(spec)
+            if pk_statement:
+                statements.append(pk_statement)
+            start = spec.floor(self._oldest_value(spec) or today)
+            definitions = []
+            while start < horizon:
+                definitions.append(spec.definition(start))
+                start = spec.next(start)
+            definitions.append(f"PARTITION {self.FUTURE} VALUES LESS THAN (MAXVALUE)")
+            statements.append(
+                f"ALTER TABLE {spec.table} PARTITION BY RANGE COLUMNS({spec.column}) "
+                f"({', '.join(definitions)})"
+            )
+            return statements
+
+        # Roll forward: split new intervals off the catch-all partition
+        bounds = [bound for _, bound, _ in partitions if bound is not None]
+        start = max(bounds) if bounds else spec.floor(today)
+        definitions = []
+        while start < horizon:
+            definitions.append(spec.definition(start))
+            start = spec.next(start)
+        if definitions:
+            if any(name == self.FUTURE for name, _, _ in partitions):
+                definitions.append(f"PARTITION {self.FUTURE} VALUES LESS THAN (MAXVALUE)")
+                statements.append(
+                    f"ALTER TABLE {spec.table} REORGANIZE PARTITION {self.FUTURE} "
+                    f"INTO ({', '.join(definitions)})"
+                )
+            else:
+                statements.append(
+                    f"ALTER TABLE {spec.table} ADD PARTITION ({', '.join(definitions)})"
+                )
+
+        # Retention: whole partitions older than the cutoff
+        if spec.retention:
+            cutoff = spec.shift(spec.floor(today), -spec.retention)
+            expired = [
+                name for name, bound, _ in partitions
+                if bound is not None and bound <= cutoff
+            ]
+            if self.retention_action == "exchange":
+                exchanged = []
+                for name in expired:
+                    exchange = self._exchange_statements(spec, name)
+                    if exchange is not None:
+                        statements += exchange
+                        exchanged.append(name)
+                expired = exchanged
+            if expired:
+                statements.append(f"ALTER TABLE {spec.table} DROP PARTITION {', '.join(expired)}")
+
+        return statements
+
+    def maintain(self, dry_run: bool = False) -> List[str]:
+        """
+        Create upcoming partitions and apply retention for every table
+
+        Args:
+            dry_run: Only log the statements that would run
+
+        Returns:
+            Statements executed (or planned, in dry-run mode)
+        """
+        if not self.supported:
+            logger.info(f"Partitioning is not supported on {self.engine.dialect.name}, skipping")
+            return []
+
+        executed = []
+        for spec in self.specs:
+            try:
+                if not inspect(self.engine).has_table(spec.table):
+                    logger.info(f"{spec.table} does not exist, skipping")
+                    continue
+                statements = self.plan(spec)
+                for statement in statements:
+                    logger.info(f"{'Would run' if dry_run else 'Running'}: {statement}")
+                    if not dry_run:
+                        with self.engine.begin() as conn:
+                            conn.exec_driver_sql(statement)
+                    executed.append(statement)
+                if not statements:
+                    logger.info(f"Partitions of {spec.table} are up to date")
+
+            except SQLAlchemyError as e:
+                logger.error(
+                    f"Partition maintenance failed for {spec.table}: {str(e)}",
+                    exc_info=True
+                )
+
+        return executed
@@ -0,0 +1,293 @@
+"""Compressed local archive of old raw API responses"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from sqlalchemy import delete, func, select
+
+from src.models import StockPriceRaw
+
+logger = logging.getLogger(__name__)
+
+
+# Every stock_price_raw column, so archived rows can be rebuilt as StockPriceRaw objects
+ARCHIVE_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("stock_code", pa.string()),
+    ("price_date_range", pa.string()),
+    ("time_granularity", pa.string()),
+    ("crawl_save_time", pa.timestamp("us")),
+    ("response_json", pa.string()),
+    ("data_source", pa.string()),
+    ("api_function", pa.string()),
+    ("api_params", pa.string()),
+    ("response_status", pa.string()),
+    ("error_message", pa.string()),
+])
+
+# Sort order inside a file; row group statistics on it prune lookups by stock
+SORT_KEYS = [("stock_code", "ascending"), ("crawl_save_time", "ascending"), ("id", "ascending")]
+
+
+def _month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def _next_month(value: datetime) -> datetime:
+    return datetime(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+class RawArchive:
+    """
+    Zstd-compressed Parquet archive of stock_price_raw, one file per source and month
+
+    Files live at <root>/<data_source>/<yyyy-mm>.parquet, sorted by stock
+    code and crawl time in small row groups, so a lookup decompresses only
+    the row groups of the requested stock. An index file records the stock
+    codes and crawl time range of every archive file, so lookups open only
+    the files that can match.
+
+    archive() moves rows month by month: the month's file is rewritten with
+    the new rows merged in (atomically, deduplicated by id) before the rows
+    are deleted from the database, so an interrupted run loses nothing and
+    can simply be repeated.
+    """
+
+    INDEX_FILE = "_index.json"
+
+    def __init__(self, root_dir: str, row_group_size: int = 2_000, compression_level: int = 9):
+        """
+        Initialize the archive
+
+        Args:
+            root_dir: Directory holding the archive files
+            row_group_size: Rows per Parquet row group (the unit a lookup decompresses)
+            compression_level: Zstd compression level
+        """
+        self.root_dir = Path(root_dir)
+        self.row_group_size = row_group_size
+        self.compression_level = compression_level
+
+    @property
+    def index_path(self) -> Path:
+        """Path of the index file"""
+        return self.root_dir / self.INDEX_FILE
+
+    def get_index(self) -> Dict[str, Dict]:
+        """
+        Get the archive index
+
+        Returns:
+            Mapping of file path (relative to the root) to its data_source,
+            stock_codes, start/end crawl times (ISO format) and row count
+        """
+        if not self.index_path.exists():
+            return {}
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_index(self, index: Dict[str, Dict]) -> None:
+        """Atomically persist the index file"""
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def _file_path(self, data_source: str, month: datetime) -> str:
+        return f"{data_source}/{month:%Y-%m}.parquet"
+
+    def _write_file(self, relative_path: str, table: pa.Table, index: Dict[str, Dict]) -> None:
+        """Merge rows into an archive file and update its index entry"""
+        path = self.root_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if path.exists():
+            existing = pq.read_table(path, schema=ARCHIVE_SCHEMA)
+            # Rows from an interrupted earlier run may already be archived
+            new_ids = pa.array(set(table.column("id").to_pylist()) - set(
+                existing.column("id").to_pylist()
+            ), pa.int64())
+            table = pa.concat_tables([
+                existing, table.filter(pc.is_in(table.column("id"), value_set=new_ids))
+            ])
+        table = table.sort_by(SORT_KEYS)
+
+        tmp_path = path.with_suffix(".tmp")
+        pq.write_table(
+            table,
+            tmp_path,
+            row_group_size=self.row_group_size,
+            compression="zstd",
+            compression_level=self.compression_level,
+            use_dictionary=[name for name in ARCHIVE_SCHEMA.names if name != "response_json"],
+        )
+        os.replace(tmp_path, path)
+
+        times = table.column("crawl_save_time")
+        index[relative_path] = {
+            "data_source": table.column("data_source")[0].as_py(),
+            "stock_codes": sorted(set(table.column("stock_code").to_pylist())),
+            "start": pc.min(times).as_py().isoformat(),
+            "end": pc.max(times).as_py().isoformat(),
+            "rows": table.num_rows,
+        }
+
+    def archive(self, engine, before: datetime, delete_chunk_size: int = 1_000) -> int:
+        """
+        Move raw rows crawled before a cutoff from the database into the archive
+
+        Args:
+            engine: SQLAlchemy engine bound to the stock_price_raw table
+            before: Rows with crawl_save_time before this are archived
+            delete_chunk_size: Rows deleted per statement
+
+        Returns:
+            Number of rows archived
+        """
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        index = self.get_index()
+        columns = [getattr(StockPriceRaw, name) for name in ARCHIVE_SCHEMA.names]
+        archived = 0
+
+        while True:
+            with engine.connect() as conn:
+                oldest = conn.scalar(
+                    select(func.min(StockPriceRaw.crawl_save_time))
+                    .where(StockPriceRaw.crawl_save_time < before)
+                )
+                if oldest is None:
+                    break
+
+                # One month at a time bounds memory and maps onto one file per source
+                month = _month_start(oldest)
+                month_end = min(_next_month(month), before)
+                rows = conn.execute(
+                    select(*columns).where(
+                        StockPriceRaw.crawl_save_time >= month,
+                        StockPriceRaw.crawl_save_time < month_end,
+                    )
+                ).all()
+
+            by_source: Dict[str, List] = {}
+            for row in rows:
+                by_source.setdefault(row.data_source, []).append(row)
+
+            for data_source, source_rows in by_source.items():
+                table = pa.Table.from_pylist(
+                    [dict(row._mapping) for row in source_rows], schema=ARCHIVE_SCHEMA
+                )
+                self._write_file(self._file_path(data_source, month), table, index)
+            self._save_index(index)
+
+            # Delete only after the files and index are safely on disk
+            ids = [row.id for row in rows]
+            with engine.begin() as conn:
+                for start in range(0, len(ids), delete_chunk_size):
+                    conn.execute(
+                        delete(StockPriceRaw)
+                        .where(StockPriceRaw.id.in_(ids[start:start + delete_chunk_size]))
+                    )
+
+            archived += len(rows)
+            logger.info(
+                f"Archived {len(rows)} raw responses from {month:%Y-%m} "
+                f"({', '.join(sorted(by_source))})"
+            )
+
+        logger.info(f"Archived {archived} raw responses crawled before {before} to {self.root_dir}")
+        return archived
+
+    def lookup(
+        self,
+        stock_code: str,
+        data_source: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        time_granularity: Optional[str] = None,
+        response_status: Optional[str] = None
+    ) -> List[StockPriceRaw]:
+        """
+        Find archived raw responses
+
+        Args:
+            stock_code: Stock symbol/code
+            data_source: Data source name (optional, defaults to all)
+            start: Earliest crawl time, inclusive (optional)
+            end: Latest crawl time, inclusive (optional)
+            time_granularity: Time granularity (optional)
+            response_status: Response status (optional)
+
+        Returns:
+            Detached StockPriceRaw objects ordered by crawl time
+        """
+        candidates = [
+            path for path, entry in self.get_index().items()
+            if stock_code in entry["stock_codes"]
+            and (data_source is None or entry["data_source"] == data_source)
+            and (start is None or datetime.fromisoformat(entry["end"]) >= start)
+            and (end is None or datetime.fromisoformat(entry["start"]) <= end)
+        ]
+
+        filters = [("stock_code", "=", stock_code)]
+        if start is not None:
+            filters.append(("crawl_save_time", ">=", start))
+        if end is not None:
+            filters.append(("crawl_save_time", "<=", end))
+        if time_granularity is not None:
+            filters.append(("time_granularity", "=", time_granularity))
+        if response_status is not None:
+            filters.append(("response_status", "=", response_status))
+
+        records = []
+        for path in candidates:
+            table = pq.read_table(self.root_dir / path, schema=ARCHIVE_SCHEMA, filters=filters)
+            records.extend(table.to_pylist())
+
+        records.sort(key=lambda record: (record["crawl_save_time"], record["id"]))
+        return [StockPriceRaw(**record) for record in records]
+
+    def get_latest(
+        self,
+        stock_code: str,
+        data_source: str,
+        time_granularity: str = "daily"
+    ) -> Optional[StockPriceRaw]:
+        """
+        Get the most recent successful archived response
+
+        Args:
+            stock_code: Stock symbol/code
+            data_source: Data source name
+            time_granularity: Time granularity
+
+        Returns:
+            Detached StockPriceRaw object or None
+        """
+        # Walk files newest first and stop at the first one with a match
+        candidates = sorted(
+            (entry["end"], path)
+            for path, entry in self.get_index().items()
+            if stock_code in entry["stock_codes"] and entry["data_source"] == data_source
+        )
+        for _, path in reversed(candidates):
+            table = pq.read_table(
+                self.root_dir / path,
+                schema=ARCHIVE_SCHEMA,
+                filters=[
+                    ("stock_code", "=", stock_code),
+                    ("time_granularity", "=", time_granularity),
+                    ("response_status", "=", "success"),
+                ],
+            )
+            if table.num_rows:
+                records = table.to_pylist()
+                latest = max(records, key=lambda record: (record["crawl_save_time"], record["id"]))
+                return StockPriceRaw(**latest)
+        return None
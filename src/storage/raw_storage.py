@@ -3,12 +3,13 @@
 import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from sqlalchemy import create_engine, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.models import StockPriceRaw, Base
 from .base import BaseStorage
+from .engine import acquire_engine, release_engine
 
 logger = logging.getLogger(__name__)
 
@@ -16,16 +17,29 @@ logger = logging.getLogger(__name__)
 class RawDataStorage(BaseStorage):
     """Storage for raw API responses"""
     
-    def __init__(self, database_url: str):
+    def __init__(
+        self,
+        database_url: str,
+        pool_options: Optional[Dict[str, Any]] = None,
+        archive_dir: Optional[str] = None
+    ):
         """
         Initialize raw data storage
         
         Args:
             database_url: SQLAlchemy database URL
+            pool_options: Shared engine/pool options (see storage.engine.EngineManager)
+            archive_dir: Directory of the cold archive of old responses (optional)
         """
         self.database_url = database_url
+        self.pool_options = pool_options or {}
         self.engine = None
         self.SessionLocal = None
+        self.archive = None
+        if archive_dir:
+            # pyarrow is only needed when an archive is configured
+            from .raw_archive import RawArchive
+            self.archive = RawArchive(archive_dir)
     
     def connect(self) -> bool:
         """
@@ -36,12 +50,8 @@ class RawDataStorage(BaseStorage):
         """
         try:
             logger.info("Connecting to MySQL database for raw data storage...")
-            self.engine = create_engine(
-                self.database_url,
-                echo=False,
-                pool_pre_ping=True,
-                pool_recycle=3600,
-            )
+            # Shares the engine and pool with MySQLStorage on the same URL
+            self.engine = acquire_engine(self.database_url, **self.pool_options)
             
             # Test connection
             with self.engine.connect() as conn:
@@ -58,12 +68,18 @@ class RawDataStorage(BaseStorage):
         
         except Exception as e:
             logger.error(f"Failed to connect to database: {str(e)}", exc_info=True)
+            # Callers do not disconnect after a failed connect; drop the engine reference now
+            if self.engine is not None:
+                release_engine(self.database_url)
+                self.engine = None
             return False
     
     def disconnect(self) -> None:
         """Disconnect from database"""
         if self.engine:
-            self.engine.dispose()
+            release_engine(self.database_url)
+            self.engine = None
+            self.SessionLocal = None
             logger.info("Disconnected from database")
     
     def initialize_schema(self) -> bool:
@@ -168,7 +184,8 @@ class RawDataStorage(BaseStorage):
             time_granularity: Time granularity
         
         Returns:
-            StockPriceRaw object or None
+            StockPriceRaw object or None (falls back to the archive when the
+            database holds no successful response)
         """
         if not self.SessionLocal:
             logger.error("Cannot retrieve data: not connected to database")
@@ -184,6 +201,8 @@ class RawDataStorage(BaseStorage):
                 StockPriceRaw.response_status == "success"
             ).order_by(StockPriceRaw.crawl_save_time.desc()).first()
             
+            if result is None and self.archive is not None:
+                result = self.archive.get_latest(stock_code, data_source, time_granularity)
             return result
         
         except SQLAlchemyError as e:
@@ -193,6 +212,77 @@ class RawDataStorage(BaseStorage):
         finally:
             session.close()
     
+    def get_raw_history(
+        self,
+        stock_code: str,
+        data_source: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[StockPriceRaw]:
+        """
+        Get every stored response for a stock, archived or not
+        
+        Args:
+            stock_code: Stock symbol/code
+            data_source: Data source name (optional, defaults to all)
+            start: Earliest crawl time, inclusive (optional)
+            end: Latest crawl time, inclusive (optional)
+        
+        Returns:
+            List of StockPriceRaw objects ordered by crawl time
+        """
+        if not self.SessionLocal:
+            logger.error("Cannot retrieve data: not connected to database")
+            return []
+        
+        session = self.SessionLocal()
+        
+        try:
+            query = session.query(StockPriceRaw).filter(StockPriceRaw.stock_code == stock_code)
+            if data_source:
+                query = query.filter(StockPriceRaw.data_source == data_source)
+            if start:
+                query = query.filter(StockPriceRaw.crawl_save_time >= start)
+            if end:
+                query = query.filter(StockPriceRaw.crawl_save_time <= end)
+            results = query.order_by(StockPriceRaw.crawl_save_time, StockPriceRaw.id).all()
+            
+            if self.archive is not None:
+                archived = self.archive.lookup(stock_code, data_source, start, end)
+                results = sorted(archived + results, key=lambda raw: (raw.crawl_save_time, raw.id))
+            return results
+        
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while retrieving raw data: {str(e)}", exc_info=True)
+            return []
+        
+        finally:
+            session.close()
+    
+    def archive_raw_data(self, before: datetime) -> int:
+        """
+        Move responses crawled before a cutoff into the cold archive
+        
+        Args:
+            before: Responses with crawl_save_time before this are archived
+        
+        Returns:
+            Number of responses archived
+        """
+        if self.archive is None:
+            logger.error("Cannot archive raw data: no archive directory configured")
+            return 0
+        if not self.engine:
+            logger.error("Cannot archive raw data: not connected to database")
+            return 0
+        
+        try:
+            return self.archive.archive(self.engine, before)
+        
+        except (SQLAlchemyError, OSError) as e:
+            logger.error(f"Failed to archive raw data: {str(e)}", exc_info=True)
+            return 0
+    
     # Implement required abstract methods from BaseStorage
     def save_stock_data(self, data: List[Any]) -> int:
         """Not used for raw data storage"""
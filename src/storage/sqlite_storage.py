@@ -0,0 +1,106 @@
+"""Embedded SQLite storage implementation"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import sessionmaker
+
+from src.models import StockData
+from .engine import acquire_engine, release_engine
+from .mysql_storage import MySQLStorage
+
+logger = logging.getLogger(__name__)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Tune every new SQLite connection for write throughput"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")       # Readers don't block the writer
+    cursor.execute("PRAGMA synchronous=NORMAL")     # fsync at checkpoints only (safe with WAL)
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")      # 64 MiB page cache
+    cursor.execute("PRAGMA mmap_size=268435456")    # Memory-map up to 256 MiB for scans
+    cursor.close()
+
+
+class SQLiteStorage(MySQLStorage):
+    """
+    Serverless storage backed by a single SQLite file
+
+    Shares the schema, query and change-detecting write code of
+    MySQLStorage; new rows go through ``INSERT ... ON CONFLICT DO UPDATE``
+    instead of MySQL's ``ON DUPLICATE KEY UPDATE``.
+    """
+
+    backend_name = "sqlite"
+
+    def __init__(
+        self,
+        db_path: str,
+        batch_size: int = 1000,
+        pool_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize SQLite storage
+
+        Args:
+            db_path: Path of the SQLite database file
+            batch_size: Rows per executemany batch when saving
+            pool_options: Shared engine/pool options (see storage.engine.EngineManager)
+        """
+        super().__init__(
+            f"sqlite:///{db_path}", pool_options=pool_options, batch_size=batch_size
+        )
+        self.db_path = Path(db_path)
+
+    def connect(self) -> bool:
+        """
+        Open the SQLite database, creating the file if needed
+
+        Returns:
+            True if connection successful, False otherwise
+        """
+        try:
+            logger.info(f"Opening SQLite database at {self.db_path}...")
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+            self.engine = acquire_engine(
+                self.database_url,
+                on_connect=_set_sqlite_pragmas,
+                **self.pool_options
+            )
+
+            # Test connection
+            with self.engine.connect() as conn:
+                conn.execute(select(1))
+
+            self.SessionLocal = sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                bind=self.engine
+            )
+
+            logger.info("Successfully opened SQLite database")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to open SQLite database: {str(e)}", exc_info=True)
+            # Callers do not disconnect after a failed connect; drop the engine reference now
+            if self.engine is not None:
+                release_engine(self.database_url)
+                self.engine = None
+            return False
+
+    def _insert_statement(self):
+        """INSERT ... ON CONFLICT DO UPDATE used for new rows"""
+        stmt = sqlite_insert(StockData.__table__)
+        return stmt.on_conflict_do_update(
+            index_elements=["symbol", "date"],
+            set_={
+                name: stmt.excluded[name]
+                for name in self.FRAME_COLUMNS + ["updated_at"]
+            }
+        )
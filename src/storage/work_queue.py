@@ -0,0 +1,288 @@
+"""Database-backed work queue shared by crawler replicas"""
+
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, case, func, insert, or_, select, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.models import CrawlTask
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClaimedBatch:
+    """Symbols leased to this worker by one claim"""
+
+    token: str
+    symbols: List[str]
+    attempts: Dict[str, int] = field(default_factory=dict)
+
+
+class WorkQueue:
+    """
+    Lease-based work queue in the crawl_queue table
+
+    Every replica enqueues the run's symbols (duplicates are ignored), then
+    claims small batches. A claim leases rows for lease_seconds; the holder
+    renews the lease while it works and marks each symbol done or failed.
+    Rows whose lease expired (the worker crashed or hung) are claimable
+    again, up to max_attempts claims per symbol.
+
+    MySQL/PostgreSQL claims use ``SELECT ... FOR UPDATE SKIP LOCKED`` so
+    concurrent claimers never wait on each other's rows; SQLite, which has
+    a single writer, claims with one ``UPDATE ... WHERE id IN (SELECT ...)``.
+    Lease times come from each worker's clock, so leases should be much
+    longer than the clock skew between hosts.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        worker_id: str,
+        lease_seconds: float = 120.0,
+        max_attempts: int = 3
+    ):
+        """
+        Initialize the queue
+
+        Args:
+            engine: SQLAlchemy engine of the shared database
+            worker_id: Name of this worker, recorded as the lease owner
+            lease_seconds: Lease duration of a claim
+            max_attempts: Claims per symbol before it is marked failed
+        """
+        self.engine = engine
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def _lease_deadline(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+
+    def enqueue(self, run_key: str, symbols: List[str]) -> int:
+        """
+        Add a run's symbols, keeping rows another replica already added
+
+        Args:
+            run_key: Run identifier shared by all replicas
+            symbols: Symbols in priority order
+
+        Returns:
+            Number of rows inserted by this call
+        """
+        now = datetime.utcnow()
+        rows = [
+            {
+                "run_key": run_key,
+                "symbol": symbol,
+                "priority": priority,
+                "status": "pending",
+                "attempts": 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for priority, symbol in enumerate(symbols)
+        ]
+        if not rows:
+            return 0
+
+        if self.engine.dialect.name == "postgresql":
+            stmt = postgresql.insert(CrawlTask).on_conflict_do_nothing(
+                index_elements=["run_key", "symbol"]
+            )
+        else:
+            stmt = insert(CrawlTask).prefix_with("OR IGNORE", dialect="sqlite") \
+                .prefix_with("IGNORE", dialect="mysql")
+        try:
+            with self.engine.begin() as conn:
+                inserted = conn.execute(stmt, rows).rowcount
+            logger.info(f"Enqueued {inserted} of {len(rows)} symbols for run {run_key}")
+            return inserted
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while enqueueing run {run_key}: {str(e)}", exc_info=True)
+            return 0
+
+    def _claimable(self, run_key: str, now: datetime):
+        return and_(
+            CrawlTask.run_key == run_key,
+            CrawlTask.attempts < self.max_attempts,
+            or_(
+                CrawlTask.status == "pending",
+                and_(CrawlTask.status == "leased", CrawlTask.lease_expires_at < now),
+            ),
+        )
+
+    def claim(self, run_key: str, batch_size: int) -> Optional[ClaimedBatch]:
+        """
+        Lease up to batch_size symbols, highest priority first
+
+        Args:
+            run_key: Run identifier
+            batch_size: Maximum symbols to lease
+
+        Returns:
+            ClaimedBatch, or None when nothing is claimable
+        """
+        now = datetime.utcnow()
+        token = uuid.uuid4().hex
+        values = {
+            "status": "leased",
+            "owner": self.worker_id,
+            "lease_token": token,
+            "lease_expires_at": self._lease_deadline(),
+            "attempts": CrawlTask.attempts + 1,
+            "updated_at": now,
+        }
+        claimable = self._claimable(run_key, now)
+        candidates = select(CrawlTask.id).where(claimable) \
+            .order_by(CrawlTask.priority, CrawlTask.id).limit(batch_size)
+
+        try:
+            with self.engine.begin() as conn:
+                self._fail_exhausted(conn, run_key, now)
+
+                if self.engine.dialect.name == "sqlite":
+                    # Single statement: the write lock makes the claim atomic
+                    conn.execute(
+                        update(CrawlTask)
+                        .where(CrawlTask.id.in_(candidates.scalar_subquery()))
+                        .values(**values)
+                    )
+                else:
+                    ids = conn.scalars(candidates.with_for_update(skip_locked=True)).all()
+                    if ids:
+                        conn.execute(
+                            update(CrawlTask)
+                            .where(CrawlTask.id.in_(ids), claimable)
+                            .values(**values)
+                        )
+
+                rows = conn.execute(
+                    select(CrawlTask.symbol, CrawlTask.attempts)
+                    .where(CrawlTask.lease_token == token)
+                    .order_by(CrawlTask.priority)
+                ).all()
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while claiming work: {str(e)}", exc_info=True)
+            return None
+
+        if not rows:
+            return None
+        batch = ClaimedBatch(
+            token=token,
+            symbols=[symbol for symbol, _ in rows],
+            attempts={symbol: attempts for symbol, attempts in rows},
+        )
+        logger.info(f"Worker {self.worker_id} claimed {batch.symbols} for run {run_key}")
+        return batch
+
+    def _fail_exhausted(self, conn, run_key: str, now: datetime) -> None:
+        """Mark expired leases that used their last attempt as failed"""
+        result = conn.execute(
+            update(CrawlTask)
+            .where(
+                CrawlTask.run_key == run_key,
+                CrawlTask.status == "leased",
+                CrawlTask.lease_expires_at < now,
+                CrawlTask.attempts >= self.max_attempts,
+            )
+            .values(status="failed", lease_token=None, last_error="lease expired", updated_at=now)
+        )
+        if result.rowcount:
+            logger.warning(
+                f"{result.rowcount} symbols of run {run_key} failed after expired leases"
+            )
+
+    def renew(self, batch: ClaimedBatch) -> bool:
+        """
+        Extend the lease of a batch's unfinished symbols
+
+        Args:
+            batch: Batch returned by claim()
+
+        Returns:
+            False if the lease was lost (expired and claimed by another worker)
+        """
+        try:
+            with self.engine.begin() as conn:
+                result = conn.execute(
+                    update(CrawlTask)
+                    .where(CrawlTask.lease_token == batch.token, CrawlTask.status == "leased")
+                    .values(lease_expires_at=self._lease_deadline(), updated_at=datetime.utcnow())
+                )
+            return result.rowcount > 0
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while renewing lease: {str(e)}", exc_info=True)
+            return False
+
+    def _finish(self, batch: ClaimedBatch, symbols: List[str], **values) -> None:
+        """Update symbols of a batch, provided the batch still holds their lease"""
+        if not symbols:
+            return
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(
+                    update(CrawlTask)
+                    .where(CrawlTask.lease_token == batch.token, CrawlTask.symbol.in_(symbols))
+                    .values(lease_token=None, updated_at=datetime.utcnow(), **values)
+                )
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while updating work queue: {str(e)}", exc_info=True)
+
+    def complete(self, batch: ClaimedBatch, symbol: str) -> None:
+        """Mark a symbol as done"""
+        self._finish(batch, [symbol], status="done", last_error=None)
+
+    def fail(self, batch: ClaimedBatch, symbol: str, error: str = "", retry: bool = True) -> None:
+        """
+        Record a failed symbol
+
+        Args:
+            batch: Batch holding the symbol
+            symbol: Stock ticker symbol
+            error: Error message kept in last_error
+            retry: Return the symbol to pending while attempts remain
+        """
+        status = case((CrawlTask.attempts < self.max_attempts, "pending"), else_="failed") \
+            if retry else "failed"
+        self._finish(batch, [symbol], status=status, last_error=error[:255] or None)
+
+    def release(self, batch: ClaimedBatch, symbols: List[str]) -> None:
+        """Return unprocessed symbols to pending without counting an attempt"""
+        self._finish(
+            batch, symbols, status="pending", attempts=CrawlTask.attempts - 1, lease_expires_at=None
+        )
+
+    def stats(self, run_key: str) -> Dict[str, int]:
+        """
+        Count a run's symbols by status
+
+        Args:
+            run_key: Run identifier
+
+        Returns:
+            Mapping of status to number of symbols
+        """
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    select(CrawlTask.status, func.count())
+                    .where(CrawlTask.run_key == run_key)
+                    .group_by(CrawlTask.status)
+                ).all()
+            return {status: count for status, count in rows}
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while reading work queue stats: {str(e)}", exc_info=True)
+            return {}
@@ -1,52 +1,172 @@
 """Logging configuration module"""
 
+import atexit
+import copy
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
+from typing import Optional
 
+import structlog
 
-def setup_logging(log_level: str = "INFO", log_file: str = "stock_crawler.log") -> None:
+# Listener thread that owns the real handlers; replaced on every setup_logging()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that defers all formatting to the listener thread
+
+    The stock QueueHandler runs the full formatter in the calling thread.
+    Here the caller only merges the message arguments (which may reference
+    mutable objects) and renders the traceback to text; timestamps, layout
+    and JSON encoding happen on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _add_exc_text(logger, method_name, event_dict):
+    """structlog processor restoring tracebacks pre-rendered by the queue handler"""
+    record = event_dict.get("_record")
+    if record is not None and record.exc_text:
+        event_dict["exception"] = record.exc_text
+    return event_dict
+
+
+def _json_formatter() -> structlog.stdlib.ProcessorFormatter:
+    """Formatter rendering stdlib log records as one JSON object per line"""
+    return structlog.stdlib.ProcessorFormatter(
+        processor=structlog.processors.JSONRenderer(),
+        foreign_pre_chain=[
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.ExtraAdder(),
+            structlog.processors.CallsiteParameterAdder(
+                [
+                    structlog.processors.CallsiteParameter.FILENAME,
+                    structlog.processors.CallsiteParameter.LINENO,
+                    structlog.processors.CallsiteParameter.THREAD_NAME,
+                ]
+            ),
+            _add_exc_text,
+        ],
+    )
+
+
+def setup_logging(
+    log_level: str = "INFO",
+    log_file: str = "stock_crawler.log",
+    log_format: str = "text",
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5
+) -> None:
     """
     Setup logging configuration
-    
+
+    The root logger only gets a QueueHandler; console and file output run on
+    a background listener thread, so logging calls never wait on I/O.
+
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Log file path
+        log_format: "text" for human-readable lines or "json" for one
+            structlog-rendered JSON object per line
+        max_bytes: Rotate the log file at this size (0 disables rotation)
+        backup_count: Number of rotated log files to keep
     """
+    global _listener
+
+    # Flush and stop the previous pipeline before replacing it
+    shutdown_logging()
+
     # Create logs directory if it doesn't exist
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
-    
+
     log_file_path = log_dir / log_file
-    
+
+    if log_format == "json":
+        console_formatter = _json_formatter()
+        file_formatter = _json_formatter()
+    else:
+        console_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        file_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
+        )
+
+    # Console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(log_level)
+    console_handler.setFormatter(console_formatter)
+
+    # Rotating file handler
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file_path,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8"
+    )
+    file_handler.setLevel(log_level)
+    file_handler.setFormatter(file_formatter)
+
     # Configure root logger
     logger = logging.getLogger()
     logger.setLevel(log_level)
-    
+
     # Remove existing handlers
     logger.handlers.clear()
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(log_level)
-    console_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(_NonBlockingQueueHandler(log_queue))
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
     )
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler
-    file_handler = logging.FileHandler(log_file_path)
-    file_handler.setLevel(log_level)
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
+    _listener.start()
+
+    # Route structlog loggers through the same stdlib pipeline
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.stdlib.render_to_log_kwargs,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
     )
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
-    
+
     # Reduce noise from third-party libraries
     logging.getLogger('urllib3').setLevel(logging.WARNING)
     logging.getLogger('requests').setLevel(logging.WARNING)
     logging.getLogger('yfinance').setLevel(logging.WARNING)
     logging.getLogger('apscheduler').setLevel(logging.WARNING)
 
+
+def shutdown_logging() -> None:
+    """Drain queued log records and stop the listener thread"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
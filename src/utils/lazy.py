@@ -0,0 +1,35 @@
+"""Lazy attribute loading for package __init__ modules"""
+
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_module(name: str, attributes: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """
+    Build module-level __getattr__ and __dir__ that import attributes on first use
+
+    Keeps importing a package cheap when its submodules pull in heavy
+    dependencies (pandas, SQLAlchemy, yfinance, ...): each attribute's
+    submodule is only imported when the attribute is first accessed, then
+    cached in the package namespace.
+
+    Args:
+        name: The package's __name__
+        attributes: Attribute name -> relative submodule path (e.g. ".rollups")
+
+    Returns:
+        Tuple of (__getattr__, __dir__) to assign in the package
+    """
+    def __getattr__(attribute: str):
+        module = attributes.get(attribute)
+        if module is None:
+            raise AttributeError(f"module {name!r} has no attribute {attribute!r}")
+        value = getattr(importlib.import_module(module, name), attribute)
+        setattr(sys.modules[name], attribute, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[name])) | set(attributes))
+
+    return __getattr__, __dir__
@@ -0,0 +1,413 @@
+"""Process-local metrics with Prometheus text and JSON exposition"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+LabelValues = Tuple[str, ...]
+
+# Latency buckets in seconds, from sub-millisecond DB calls to slow HTTP requests
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+    def to_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return {",".join(key) or "_": value for key, value in sorted(self._values.items())}
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall time of a block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            for key in sorted(self._counts):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), self._counts[key]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {self._sums[key]}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            result = {}
+            for key, counts in sorted(self._counts.items()):
+                count = sum(counts)
+                result[",".join(key) or "_"] = {
+                    "count": count,
+                    "sum": round(self._sums[key], 6),
+                    "mean": round(self._sums[key] / count, 6) if count else 0.0,
+                }
+            return result
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Snapshot of all metrics as plain data"""
+        return {name: metric.to_dict() for name, metric in list(self._metrics.items())}
+
+    def dump_json(self, path: str) -> None:
+        """Write a JSON snapshot of all metrics"""
+        output = Path(path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+        logger.info(f"Wrote metrics snapshot to {output}")
+
+
+REGISTRY = MetricsRegistry()
+
+# Data source metrics
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "crawler_http_request_seconds",
+    "Time spent in data source HTTP requests",
+    ("source", "endpoint")
+)
+RATE_LIMIT_SLEEP_SECONDS = REGISTRY.counter(
+    "crawler_rate_limit_sleep_seconds_total",
+    "Time spent sleeping for request pacing and rate-limit backoff",
+    ("source", "reason")
+)
+RATE_LIMIT_HITS = REGISTRY.counter(
+    "crawler_rate_limit_hits_total",
+    "Throttled responses (HTTP 429 or provider rate-limit notes)",
+    ("source",)
+)
+SOURCE_FAILOVERS = REGISTRY.counter(
+    "crawler_source_failovers_total",
+    "Fetches retried on another source after the preferred source failed",
+    ("from_source", "to_source", "reason")
+)
+REQUEST_RATE = REGISTRY.gauge(
+    "crawler_request_rate",
+    "Allowed requests per second chosen by the adaptive rate controller",
+    ("source",)
+)
+CIRCUIT_STATE = REGISTRY.gauge(
+    "crawler_circuit_state",
+    "Data source circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ("source",)
+)
+HEDGED_REQUESTS = REGISTRY.counter(
+    "crawler_hedged_requests_total",
+    "Hedged fetches issued after the primary exceeded its latency percentile, by winner",
+    ("winner",)
+)
+
+# Storage metrics
+ROWS_SAVED = REGISTRY.counter(
+    "crawler_rows_saved_total",
+    "Rows passed to save_stock_data, by outcome (inserted/updated/unchanged)",
+    ("backend", "outcome")
+)
+SAVE_SECONDS = REGISTRY.histogram(
+    "crawler_save_seconds",
+    "Time spent in save_stock_data calls",
+    ("backend",)
+)
+WRITE_ROWS_PER_SECOND = REGISTRY.gauge(
+    "crawler_write_rows_per_second",
+    "Write throughput of the most recent save_stock_data call",
+    ("backend",)
+)
+DB_ROUND_TRIPS_PER_SAVE = REGISTRY.histogram(
+    "crawler_db_round_trips_per_save",
+    "Database statements executed per save_stock_data call",
+    ("backend",),
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+)
+DB_STATEMENTS = REGISTRY.counter(
+    "crawler_db_statements_total",
+    "Database statements executed",
+    ()
+)
+
+# Data-quality metrics
+QUALITY_ROWS = REGISTRY.counter(
+    "crawler_quality_rows_total",
+    "Fetched rows checked by data-quality validation, by outcome (passed/quarantined/held)",
+    ("outcome",)
+)
+QUALITY_RULE_FAILURES = REGISTRY.counter(
+    "crawler_quality_rule_failures_total",
+    "Fetched rows failing each data-quality rule",
+    ("rule",)
+)
+
+# Cache metrics; hit ratio = hits / (hits + misses)
+CACHE_REQUESTS = REGISTRY.counter(
+    "crawler_cache_requests_total",
+    "Cache lookups by cache name and result (hit/miss)",
+    ("cache", "result")
+)
+
+# Job metrics
+JOB_DURATION_SECONDS = REGISTRY.histogram(
+    "crawler_job_duration_seconds",
+    "Duration of scheduled or one-off jobs",
+    ("job",),
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200)
+)
+SYMBOLS_PROCESSED = REGISTRY.counter(
+    "crawler_symbols_processed_total",
+    "Symbols processed by fetch jobs, by outcome",
+    ("status",)
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup"""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def timed_sleep(seconds: float, source: str, reason: str) -> None:
+    """time.sleep that is accounted as pacing/backoff time"""
+    if seconds <= 0:
+        return
+    with span(f"sleep.{reason}", "sleep", source=source, seconds=seconds):
+        time.sleep(seconds)
+    RATE_LIMIT_SLEEP_SECONDS.inc(seconds, source=source, reason=reason)
+
+
+# Per-thread count of DB statements, for round trips per save
+_statement_counts = threading.local()
+
+
+def track_db_statements(engine) -> None:
+    """Count statements executed through a SQLAlchemy engine"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_statement(conn, cursor, statement, parameters, context, executemany):
+        DB_STATEMENTS.inc()
+        _statement_counts.value = getattr(_statement_counts, "value", 0) + 1
+
+
+def db_statement_count() -> int:
+    """Statements executed so far by the current thread"""
+    return getattr(_statement_counts, "value", 0)
+
+
+@contextmanager
+def measure_save(backend: str) -> Iterator[Dict[str, int]]:
+    """
+    Measure a save_stock_data call
+
+    The caller stores the number of saved rows in the yielded dict under
+    "rows" for the throughput gauge; the storage itself counts rows by
+    outcome in ROWS_SAVED.
+    """
+    outcome = {"rows": 0}
+    statements_before = db_statement_count()
+    start = time.perf_counter()
+    try:
+        yield outcome
+    finally:
+        elapsed = time.perf_counter() - start
+        SAVE_SECONDS.observe(elapsed, backend=backend)
+        DB_ROUND_TRIPS_PER_SAVE.observe(db_statement_count() - statements_before, backend=backend)
+        if elapsed > 0:
+            WRITE_ROWS_PER_SECOND.set(outcome["rows"] / elapsed, backend=backend)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+
+        body = self.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("metrics endpoint: " + format, *args)
+
+
+class MetricsServer:
+    """Serves /metrics from a background thread"""
+
+    def __init__(self, port: int, host: str = "0.0.0.0"):
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="metrics-server",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Serving Prometheus metrics on http://{self.host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
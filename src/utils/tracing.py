@@ -0,0 +1,355 @@
+"""Lightweight trace spans and per-run profiling"""
+
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter as TallyCounter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Profiling modes accepted by run_profiler()
+PROFILE_MODES = ("cprofile", "sampling")
+
+
+class Tracer:
+    """
+    Collects timed spans and writes them in Chrome trace format
+
+    Spans are only recorded between start() and stop(); outside a traced run
+    span() costs a single attribute check. The resulting file can be opened
+    in chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def start(self) -> None:
+        """Discard previous spans and start recording"""
+        with self._lock:
+            self._events = []
+            self._origin = time.perf_counter()
+            self.enabled = True
+
+    def stop(self) -> None:
+        """Stop recording; recorded spans are kept until the next start()"""
+        self.enabled = False
+
+    def _timestamp(self, perf_time: float) -> float:
+        """Microseconds since start(), as Chrome trace expects"""
+        return (perf_time - self._origin) * 1e6
+
+    def add_span(
+        self,
+        name: str,
+        start: float,
+        end: float,
+        category: str = "",
+        args: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Record a completed span
+
+        Args:
+            name: Span name
+            start: time.perf_counter() at span start
+            end: time.perf_counter() at span end
+            category: Chrome trace category (e.g. fetch, storage, sleep)
+            args: Extra values shown in the trace viewer
+        """
+        if not self.enabled:
+            return
+        event = {
+            "name": name,
+            "cat": category or "app",
+            "ph": "X",
+            "ts": round(self._timestamp(start), 3),
+            "dur": round((end - start) * 1e6, 3),
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = {k: str(v) for k, v in args.items()}
+        with self._lock:
+            self._events.append(event)
+
+    @contextmanager
+    def span(self, name: str, category: str = "", **args: Any) -> Iterator[None]:
+        """Time the enclosed block as a span"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, time.perf_counter(), category, args)
+
+    def summary(self, top: int = 15) -> List[Dict[str, Any]]:
+        """
+        Aggregate recorded spans by name
+
+        Args:
+            top: Number of span names to return, by total time
+
+        Returns:
+            List of dicts with name, count, total_seconds and self_seconds
+        """
+        with self._lock:
+            events = sorted(self._events, key=lambda e: (e["tid"], e["ts"], -e["dur"]))
+
+        totals: Dict[str, Dict[str, Any]] = {}
+        # Self time = span duration minus the duration of its direct children
+        stacks: Dict[int, List[Dict[str, Any]]] = {}
+        child_time: Dict[int, float] = {}
+
+        for event in events:
+            stack = stacks.setdefault(event["tid"], [])
+            while stack and event["ts"] >= stack[-1]["ts"] + stack[-1]["dur"]:
+                stack.pop()
+            if stack:
+                parent = id(stack[-1])
+                child_time[parent] = child_time.get(parent, 0.0) + event["dur"]
+            stack.append(event)
+
+        for event in events:
+            entry = totals.setdefault(
+                event["name"], {"name": event["name"], "count": 0, "total": 0.0, "self": 0.0}
+            )
+            entry["count"] += 1
+            entry["total"] += event["dur"]
+            entry["self"] += event["dur"] - child_time.get(id(event), 0.0)
+
+        ranked = sorted(totals.values(), key=lambda e: e["total"], reverse=True)[:top]
+        return [
+            {
+                "name": e["name"],
+                "count": e["count"],
+                "total_seconds": round(e["total"] / 1e6, 6),
+                "self_seconds": round(e["self"] / 1e6, 6),
+            }
+            for e in ranked
+        ]
+
+    def write(self, path: str) -> Path:
+        """
+        Write recorded spans as a Chrome trace JSON file
+
+        Args:
+            path: Output file path
+
+        Returns:
+            Path of the written file
+        """
+        output = Path(path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            events = list(self._events)
+
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": self._pid, "args": {"name": "stock-crawler"}},
+        ]
+        for thread in threading.enumerate():
+            metadata.append({
+                "name": "thread_name", "ph": "M", "pid": self._pid,
+                "tid": thread.ident, "args": {"name": thread.name},
+            })
+
+        with open(output, "w") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+        logger.info(f"Wrote {len(events)} trace spans to {output}")
+        return output
+
+
+TRACER = Tracer()
+
+
+def span(name: str, category: str = "", **args: Any):
+    """
+    Context manager timing a block as a span on the global tracer
+
+    Args:
+        name: Span name
+        category: Chrome trace category
+        **args: Extra values shown in the trace viewer (e.g. symbol)
+    """
+    return TRACER.span(name, category, **args)
+
+
+def traced(name: Optional[str] = None, category: str = "") -> Callable:
+    """
+    Decorator recording each call of a function as a span
+
+    Args:
+        name: Span name (defaults to the function's qualified name)
+        category: Chrome trace category
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                TRACER.add_span(span_name, start, time.perf_counter(), category)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_db_statements(engine) -> None:
+    """
+    Record every SQL statement executed on an engine as a span
+
+    Args:
+        engine: SQLAlchemy engine
+    """
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if TRACER.enabled:
+            conn.info.setdefault("trace_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("trace_start")
+        if not starts:
+            return
+        start = starts.pop()
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        TRACER.add_span(
+            f"db.{verb.lower()}", start, time.perf_counter(), "db",
+            {"executemany": executemany} if executemany else None
+        )
+
+
+class SamplingProfiler:
+    """
+    Periodically samples the stack of one thread
+
+    Produces collapsed stacks ("frame;frame;frame count" lines), the input
+    format of flamegraph.pl and speedscope. Unlike cProfile it adds no
+    per-call overhead, so time in C extensions and sleeps is not distorted.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        """
+        Initialize the profiler
+
+        Args:
+            interval: Seconds between samples
+            thread_id: Thread to sample (defaults to the calling thread)
+        """
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples: TallyCounter = TallyCounter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def write(self, path: str) -> Path:
+        """
+        Write collapsed stacks to a file
+
+        Args:
+            path: Output file path
+
+        Returns:
+            Path of the written file
+        """
+        output = Path(path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return output
+
+
+@contextmanager
+def run_profiler(mode: Optional[str], output_dir: str, run_id: str) -> Iterator[None]:
+    """
+    Profile the enclosed block and write the result to output_dir
+
+    cProfile writes ``<run_id>.prof`` (open with snakeviz or pstats) and logs
+    the top functions by cumulative time; sampling writes
+    ``<run_id>.collapsed`` for flame graphs.
+
+    Args:
+        mode: cprofile, sampling, or None to disable profiling
+        output_dir: Directory for profile output
+        run_id: File name stem for this run
+    """
+    if not mode:
+        yield
+        return
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {mode}")
+
+    directory = Path(output_dir)
+
+    if mode == "sampling":
+        profiler = SamplingProfiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            path = profiler.write(str(directory / f"{run_id}.collapsed"))
+            logger.info(f"Wrote {sum(profiler.samples.values())} stack samples to {path}")
+        return
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{run_id}.prof"
+        profile.dump_stats(str(path))
+
+        report = io.StringIO()
+        pstats.Stats(profile, stream=report).sort_stats("cumulative").print_stats(25)
+        logger.info(f"Wrote cProfile output to {path}\n{report.getvalue()}")
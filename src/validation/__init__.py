@@ -0,0 +1,19 @@
+"""Data-quality validation of fetched bars"""
+
+from typing import TYPE_CHECKING
+
+from src.utils.lazy import lazy_module
+
+if TYPE_CHECKING:
+    from .quality import QualityGate, bars_frame, check_bars
+
+_LAZY_ATTRIBUTES = {
+    "QualityGate": ".quality",
+    "bars_frame": ".quality",
+    "check_bars": ".quality",
+}
+
+__all__ = ["QualityGate", "bars_frame", "check_bars"]
+
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_ATTRIBUTES)
@@ -0,0 +1,337 @@
+"""Vectorized data-quality checks between the data source and storage"""
+
+import json
+import logging
+from datetime import datetime
+from itertools import compress
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.data_sources.base import StockDataDTO
+from src.models import DataQualityRun, QuarantinedBar
+from src.utils.metrics import QUALITY_ROWS, QUALITY_RULE_FAILURES
+
+logger = logging.getLogger(__name__)
+
+
+# Rules in the order they are reported
+RULES = [
+    "missing_close",
+    "non_positive_price",
+    "ohlc_inconsistent",
+    "negative_volume",
+    "price_jump",
+    "duplicate",
+]
+
+# DTO fields copied into stock_data_quarantine
+QUARANTINE_FIELDS = [
+    "symbol", "date", "open_price", "high_price", "low_price", "close_price",
+    "adj_close_price", "volume", "market_cap", "pe_ratio", "turnover_rate", "data_source",
+]
+
+# Relative slack for high/low bounds, so rounding in adjusted prices is not an error
+OHLC_TOLERANCE = 1e-6
+
+
+def bars_frame(data: List[StockDataDTO]) -> pd.DataFrame:
+    """
+    Columnar view of a batch of DTOs with the fields the rules need
+
+    Args:
+        data: Fetched bars
+
+    Returns:
+        DataFrame in batch order with symbol, day (date ordinal), prices and
+        volume; missing prices and volumes are NaN
+    """
+    def floats(name: str) -> np.ndarray:
+        return np.array([getattr(dto, name) for dto in data], dtype=float)
+
+    return pd.DataFrame({
+        "symbol": [dto.symbol for dto in data],
+        "day": np.array([dto.date.toordinal() for dto in data], dtype=np.int64),
+        "open_price": floats("open_price"),
+        "high_price": floats("high_price"),
+        "low_price": floats("low_price"),
+        "close_price": floats("close_price"),
+        "volume": floats("volume"),
+    })
+
+
+def check_bars(
+    bars: pd.DataFrame,
+    prev_close: Optional[Dict[str, float]] = None,
+    max_jump: float = 0.5
+) -> pd.DataFrame:
+    """
+    Evaluate every rule on a batch
+
+    price_jump compares each close with the symbol's previous usable close
+    in the batch (or prev_close for its first row); a move is too large when
+    |log(close / previous)| exceeds log(1 + max_jump), so 0.5 flags gains
+    over 50% and losses over 33%. A large move is only an outlier when the
+    next usable close returns to within that limit of the previous one; a
+    move that holds (a split, a crash) passes. The last bar of a symbol has
+    no next close to confirm a large move with and is marked held: it is
+    neither saved nor quarantined, so the next crawl fetches it again
+    together with the bar that decides it. Rows after a flagged outlier are
+    compared with the last unflagged close, so the row returning to the
+    usual level is not caught as well.
+
+    Args:
+        bars: DataFrame from bars_frame()
+        prev_close: Latest stored close per symbol before the batch (optional)
+        max_jump: Largest close-to-close move as a ratio (0 disables price_jump)
+
+    Returns:
+        Boolean DataFrame with one column per rule and a held column,
+        aligned with bars
+    """
+    open_, high, low, close, volume = (
+        bars[name].to_numpy()
+        for name in ("open_price", "high_price", "low_price", "close_price", "volume")
+    )
+    flags = {}
+
+    flags["missing_close"] = np.isnan(close)
+    with np.errstate(invalid="ignore"):
+        flags["non_positive_price"] = (np.vstack([open_, high, low, close]) <= 0).any(axis=0)
+        # NaN prices are skipped: fmax/fmin ignore them and NaN comparisons are False
+        ceiling = np.fmax(np.fmax(open_, close), low)
+        floor = np.fmin(np.fmin(open_, close), high)
+        flags["ohlc_inconsistent"] = (
+            (high < ceiling * (1 - OHLC_TOLERANCE)) | (low > floor * (1 + OHLC_TOLERANCE))
+        )
+        flags["negative_volume"] = volume < 0
+
+    # Rows sorted by symbol and day; lexsort is stable, so equal keys keep batch order
+    codes, symbols = pd.factorize(bars["symbol"])
+    days = bars["day"].to_numpy()
+    order = np.lexsort((days, codes))
+    codes, days, close = codes[order], days[order], close[order]
+    same_symbol = codes[1:] == codes[:-1]
+
+    # The last bar of a (symbol, day) wins, as in save_stock_data
+    duplicate = np.empty(len(order), dtype=bool)
+    duplicate[order] = np.append(same_symbol & (days[1:] == days[:-1]), False)
+    flags["duplicate"] = duplicate
+
+    flags["price_jump"] = np.zeros(len(order), dtype=bool)
+    held = np.zeros(len(order), dtype=bool)
+    if max_jump > 0:
+        size = len(order)
+        positions = np.arange(size)
+        # First and last sorted rows of every row's symbol
+        first = np.maximum.accumulate(np.where(np.append(True, ~same_symbol), positions, 0))
+        last_row = np.minimum.accumulate(
+            np.where(np.append(~same_symbol, True), positions, size)[::-1]
+        )[::-1]
+        known = prev_close or {}
+        seed = np.array([known.get(symbol, np.nan) for symbol in symbols], dtype=float)[codes]
+        bad = (
+            flags["missing_close"] | flags["non_positive_price"] |
+            flags["ohlc_inconsistent"] | duplicate
+        )[order]
+        limit = np.log1p(max_jump)
+
+        def neighbours(usable: np.ndarray):
+            # Closes of the previous (else the seed) and next usable rows of the same symbol
+            last = np.maximum.accumulate(np.where(usable, positions, -1))
+            before = np.append(-1, last[:-1])
+            previous = np.where(before >= first, close[np.maximum(before, 0)], seed)
+            upcoming = np.minimum.accumulate(np.where(usable, positions, size)[::-1])[::-1]
+            after = np.append(upcoming[1:], size)
+            following = np.where(after <= last_row, close[np.minimum(after, size - 1)], np.nan)
+            return previous, following
+
+        def move(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+            # NaN where either close is missing, so it compares False both ways
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.abs(np.log(a / b))
+
+        previous, following = neighbours(~bad)
+        outlier = ~bad & (move(close, previous) > limit) & (move(following, previous) <= limit)
+        # Large moves left after dropping the outliers stand unless nothing follows them
+        previous, following = neighbours(~bad & ~outlier)
+        unconfirmed = ~bad & ~outlier & (move(close, previous) > limit) & np.isnan(following)
+        flags["price_jump"][order] = outlier
+        held[order] = unconfirmed
+
+    return pd.DataFrame({**{rule: flags[rule] for rule in RULES}, "held": held}, index=bars.index)
+
+
+class QualityGate:
+    """
+    Validates fetched batches before they are saved
+
+    Each batch is checked with whole-column NumPy/pandas operations (no
+    per-row Python beyond building the columns). Bars failing any rule are
+    kept out of stock_data and, with a SQL engine, written to
+    stock_data_quarantine together with the rules they failed. Totals of a
+    crawl are written to data_quality_runs by finish_run().
+    """
+
+    def __init__(self, engine=None, max_jump: float = 0.5, worker_id: Optional[str] = None):
+        """
+        Initialize the gate
+
+        Args:
+            engine: SQLAlchemy engine for the quarantine and statistics tables
+                (None only counts and logs failures)
+            max_jump: Largest close-to-close move as a ratio (0 disables price_jump)
+            worker_id: Replica name recorded with the run statistics (optional)
+        """
+        self.engine = engine
+        self.max_jump = max_jump
+        self.worker_id = worker_id
+        self.run_id: Optional[int] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.started_at = datetime.utcnow()
+        self.symbols = set()
+        self.checked = 0
+        self.quarantined = 0
+        self.held = 0
+        self.rule_counts = {rule: 0 for rule in RULES}
+
+    def start_run(self) -> Optional[int]:
+        """
+        Reset the totals and open a data_quality_runs row
+
+        Returns:
+            Run id (None without an engine or if the row could not be written)
+        """
+        self._reset()
+        self.run_id = None
+        if self.engine is None:
+            return None
+        try:
+            with self.engine.begin() as conn:
+                result = conn.execute(insert(DataQualityRun).values(
+                    worker_id=self.worker_id, started_at=self.started_at
+                ))
+                self.run_id = result.inserted_primary_key[0]
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to record data-quality run: {str(e)}", exc_info=True)
+        return self.run_id
+
+    def validate(
+        self,
+        data: List[StockDataDTO],
+        prev_close: Optional[Dict[str, float]] = None
+    ) -> List[StockDataDTO]:
+        """
+        Check a batch and quarantine the failing bars
+
+        Args:
+            data: Fetched bars
+            prev_close: Latest stored close per symbol before the batch (optional)
+
+        Returns:
+            Bars that passed every rule, in batch order (without held bars
+            whose large move the next crawl confirms)
+        """
+        if not data:
+            return data
+
+        flags = check_bars(bars_frame(data), prev_close, self.max_jump)
+        held = flags.pop("held").to_numpy()
+        failed = flags.any(axis=1).to_numpy()
+        held &= ~failed
+        failures = int(failed.sum())
+        holds = int(held.sum())
+
+        self.checked += len(data)
+        self.held += holds
+        self.symbols.update(dto.symbol for dto in data)
+        QUALITY_ROWS.inc(len(data) - failures - holds, outcome="passed")
+        if holds:
+            QUALITY_ROWS.inc(holds, outcome="held")
+            logger.info(
+                f"Holding {holds} bars with unconfirmed price moves until the next crawl: "
+                + ", ".join(f"{dto.symbol} {dto.date}" for dto in compress(data, held))
+            )
+        if not failures:
+            return list(compress(data, ~held)) if holds else data
+
+        self.quarantined += failures
+        QUALITY_ROWS.inc(failures, outcome="quarantined")
+        for rule, count in flags.sum().items():
+            if count:
+                self.rule_counts[rule] += int(count)
+                QUALITY_RULE_FAILURES.inc(int(count), rule=rule)
+
+        # Comma-joined names of the failed rules, one string per failed row
+        failed_flags = flags[failed]
+        reasons = failed_flags.dot(failed_flags.columns + ",").str.rstrip(",").tolist()
+        rejected = list(compress(data, failed))
+        examples = ", ".join(
+            f"{dto.symbol} {dto.date} ({reason})" for dto, reason in zip(rejected[:10], reasons)
+        )
+        logger.warning(
+            f"Quarantined {failures} of {len(data)} bars: {examples}"
+            f"{', ...' if failures > 10 else ''}"
+        )
+        self._quarantine(rejected, reasons, prev_close or {})
+        return list(compress(data, ~failed & ~held))
+
+    def _quarantine(self, rejected: List[StockDataDTO], reasons: List[str],
+                    prev_close: Dict[str, float]) -> None:
+        if self.engine is None:
+            return
+        now = datetime.utcnow()
+        rows = [
+            {
+                **{name: getattr(dto, name) for name in QUARANTINE_FIELDS},
+                "reasons": reason,
+                "prev_close": prev_close.get(dto.symbol),
+                "run_id": self.run_id,
+                "quarantined_at": now,
+            }
+            for dto, reason in zip(rejected, reasons)
+        ]
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(QuarantinedBar), rows)
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to write quarantined bars: {str(e)}", exc_info=True)
+
+    def finish_run(self) -> Dict[str, int]:
+        """
+        Log the run's totals and store them in its data_quality_runs row
+
+        Returns:
+            Dictionary with symbols, rows_checked, rows_passed, rows_quarantined,
+            rows_held and the failure count of every rule
+        """
+        stats = {
+            "symbols": len(self.symbols),
+            "rows_checked": self.checked,
+            "rows_passed": self.checked - self.quarantined - self.held,
+            "rows_quarantined": self.quarantined,
+        }
+        logger.info(
+            f"Data quality: {stats['rows_passed']}/{self.checked} bars passed, "
+            f"{self.quarantined} quarantined {self.rule_counts}, {self.held} held"
+        )
+        if self.engine is not None and self.run_id is not None:
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(
+                        update(DataQualityRun)
+                        .where(DataQualityRun.id == self.run_id)
+                        .values(
+                            finished_at=datetime.utcnow(),
+                            rule_counts=json.dumps(self.rule_counts),
+                            **stats
+                        )
+                    )
+            except SQLAlchemyError as e:
+                logger.error(f"Failed to record data-quality run: {str(e)}", exc_info=True)
+        return {**stats, "rows_held": self.held, **self.rule_counts}
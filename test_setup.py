@@ -96,6 +96,253 @@ def test_data_source():
         return False
 
 
+def test_startup_time():
+    """Test that CLI entry points import quickly without heavy dependencies"""
+    print("\n" + "=" * 60)
+    print("Testing Startup Import Time...")
+    print("=" * 60)
+    
+    import subprocess
+    import json
+    
+    budget_seconds = 0.5
+    heavy_modules = ["yfinance", "pandas", "sqlalchemy", "apscheduler", "pyarrow"]
+    
+    # A fresh interpreter, so modules already imported by this script don't count
+    probe = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import src.main, utils\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"loaded = [m for m in {heavy_modules!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'loaded': loaded}))\n"
+    )
+    
+    try:
+        output = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=str(Path(__file__).parent),
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        
+        print(f"  - Import time of src.main + utils: {result['elapsed']:.3f}s "
+              f"(budget {budget_seconds}s)")
+        
+        if result["loaded"]:
+            print(f"✗ Heavy modules imported at startup: {result['loaded']}")
+            return False
+        if result["elapsed"] > budget_seconds:
+            print("✗ Startup import time over budget")
+            return False
+        
+        print("✓ Startup imports are within budget")
+        return True
+    
+    except Exception as e:
+        print(f"✗ Startup time test failed: {str(e)}")
+        return False
+
+
+def test_update_keeps_created_at():
+    """Test that re-saving a changed bar updates it in place without resetting created_at"""
+    print("\n" + "=" * 60)
+    print("Testing Changed-Row Updates...")
+    print("=" * 60)
+    
+    import tempfile
+    import time
+    from datetime import date
+    from src.data_sources.base import StockDataDTO
+    from src.models import StockData
+    from src.storage import SQLiteStorage
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = SQLiteStorage(str(Path(tmp) / "update_check.db"))
+            if not storage.connect() or not storage.initialize_schema():
+                print("✗ Could not open a temporary SQLite database")
+                return False
+            
+            try:
+                bar = dict(symbol="TEST", date=date(2024, 1, 2), close_price=10.0,
+                           data_source="check")
+                storage.save_stock_data([StockDataDTO(**bar)])
+                with storage.engine.connect() as conn:
+                    before = conn.execute(StockData.__table__.select()).one()
+                
+                time.sleep(0.01)
+                storage.save_stock_data([StockDataDTO(**dict(bar, close_price=11.0))])
+                with storage.engine.connect() as conn:
+                    after = conn.execute(StockData.__table__.select()).one()
+            finally:
+                storage.disconnect()
+        
+        print(f"  - close {before.close_price} -> {after.close_price}, "
+              f"created_at {before.created_at} -> {after.created_at}")
+        if after.close_price != 11.0 or after.updated_at <= before.updated_at:
+            print("✗ Changed bar was not updated")
+            return False
+        if after.created_at != before.created_at:
+            print("✗ Update overwrote created_at")
+            return False
+        
+        print("✓ Changed bars are updated in place and keep created_at")
+        return True
+    
+    except Exception as e:
+        print(f"✗ Update test failed: {str(e)}")
+        return False
+
+
+def test_work_queue():
+    """Test claiming, renewing, failing, releasing and reclaiming work on SQLite"""
+    print("\n" + "=" * 60)
+    print("Testing Work Queue...")
+    print("=" * 60)
+    
+    import tempfile
+    from src.storage import SQLiteStorage, WorkQueue
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = SQLiteStorage(str(Path(tmp) / "queue_check.db"))
+            if not storage.connect() or not storage.initialize_schema():
+                print("✗ Could not open a temporary SQLite database")
+                return False
+            
+            try:
+                run = "check"
+                first = WorkQueue(storage.engine, "first", lease_seconds=60, max_attempts=3)
+                second = WorkQueue(storage.engine, "second", lease_seconds=60, max_attempts=3)
+                # Leases that are already expired when taken, as if the worker died
+                stale = WorkQueue(storage.engine, "stale", lease_seconds=-1, max_attempts=3)
+                
+                steps = []
+                
+                def check(name, ok):
+                    steps.append(ok)
+                    print(f"  {'✓' if ok else '✗'} {name}")
+                
+                check("enqueue ignores another replica's rows",
+                      first.enqueue(run, ["AAA", "BBB", "CCC"]) == 3
+                      and second.enqueue(run, ["AAA", "BBB", "CCC"]) == 0)
+                
+                batch_1 = first.claim(run, 2)
+                batch_2 = second.claim(run, 2)
+                check("claims split the symbols in priority order",
+                      batch_1.symbols == ["AAA", "BBB"] and batch_2.symbols == ["CCC"]
+                      and second.claim(run, 2) is None)
+                check("holder renews its lease", first.renew(batch_1))
+                
+                first.complete(batch_1, "AAA")
+                first.fail(batch_1, "BBB", "boom")
+                second.release(batch_2, ["CCC"])
+                check("failed and released symbols return to pending",
+                      first.stats(run) == {"done": 1, "pending": 2})
+                
+                lost = stale.claim(run, 2)
+                reclaimed = first.claim(run, 2)
+                check("expired leases are reclaimed",
+                      lost.symbols == ["BBB", "CCC"] and reclaimed.symbols == ["BBB", "CCC"]
+                      and reclaimed.attempts == {"BBB": 3, "CCC": 2})
+                check("a lost lease can not be renewed", not stale.renew(lost))
+                
+                stale.complete(lost, "BBB")
+                for symbol in reclaimed.symbols:
+                    first.complete(reclaimed, symbol)
+                check("only the current holder finishes symbols", first.stats(run) == {"done": 3})
+            finally:
+                storage.disconnect()
+        
+        if all(steps):
+            print("✓ Work queue leases behave as expected")
+        else:
+            print("✗ Work queue leases misbehaved")
+        return all(steps)
+    
+    except Exception as e:
+        print(f"✗ Work queue test failed: {str(e)}")
+        return False
+
+
+def test_quality_rules():
+    """Test the vectorized data-quality rules on small batches"""
+    print("\n" + "=" * 60)
+    print("Testing Data-Quality Rules...")
+    print("=" * 60)
+    
+    from datetime import date
+    from src.data_sources.base import StockDataDTO
+    from src.validation import QualityGate, bars_frame, check_bars
+    
+    def bars(symbol, closes, start=10, **fields):
+        return [
+            StockDataDTO(symbol=symbol, date=date(2024, 1, start + i), open_price=close,
+                         high_price=close, low_price=close, close_price=close,
+                         volume=100, **fields)
+            for i, close in enumerate(closes)
+        ]
+    
+    def failures(data, prev_close=None):
+        flags = check_bars(bars_frame(data), prev_close)
+        return {
+            rule: [data[i].date.day for i in flags.index[flags[rule]]]
+            for rule in flags.columns if flags[rule].any()
+        }
+    
+    broken = bars("BAD", [10.0, 10.0, None, 10.0, 10.0, 10.0])
+    for name in ("open_price", "high_price", "low_price", "close_price"):
+        setattr(broken[0], name, 0.0)
+    broken[1].high_price = 9.0
+    broken[3].volume = -5
+    broken[5].date = broken[4].date
+    
+    cases = [
+        ("split holds", bars("AAA", [40.0, 41.0, 40.5]), {"AAA": 100.0}, {}),
+        ("move on the last bar is held", bars("AAA", [40.0]), {"AAA": 100.0},
+         {"held": [10]}),
+        ("outlier that reverts", bars("AAA", [101.0, 400.0, 102.0]), {"AAA": 100.0},
+         {"price_jump": [11]}),
+        ("symbols checked apart", bars("BBB", [50.0, 20.0, 50.0]) + bars("AAA", [10.0, 11.0]),
+         None, {"price_jump": [11]}),
+        ("row rules", broken, None, {
+            "missing_close": [12], "non_positive_price": [10], "ohlc_inconsistent": [11],
+            "negative_volume": [13], "duplicate": [14],
+        }),
+    ]
+    
+    try:
+        passed = True
+        for name, data, prev_close, expected in cases:
+            found = failures(data, prev_close)
+            ok = found == expected
+            passed &= ok
+            print(f"  {'✓' if ok else '✗'} {name}: {found or 'no flags'}")
+        
+        gate = QualityGate(max_jump=0.5)
+        gate.start_run()
+        kept = gate.validate(bars("AAA", [101.0, 400.0, 102.0, 40.0]), {"AAA": 100.0})
+        stats = gate.finish_run()
+        kept_days = [dto.date.day for dto in kept]
+        ok = kept_days == [10, 12] and stats["rows_quarantined"] == 1 and stats["rows_held"] == 1
+        passed &= ok
+        print(f"  {'✓' if ok else '✗'} gate keeps days {kept_days}, "
+              f"quarantines {stats['rows_quarantined']}, holds {stats['rows_held']}")
+        
+        if passed:
+            print("✓ Data-quality rules flag only the expected bars")
+        else:
+            print("✗ Data-quality rules flagged unexpected bars")
+        return passed
+    
+    except Exception as e:
+        print(f"✗ Data-quality test failed: {str(e)}")
+        return False
+
+
 def test_database_connection():
     """Test database connection (requires MySQL to be running)"""
     print("\n" + "=" * 60)
@@ -136,6 +383,18 @@ def main():
     # Test configuration
     results.append(("Configuration", test_config()))
     
+    # Test startup import time
+    results.append(("Startup Time", test_startup_time()))
+    
+    # Test changed-row updates
+    results.append(("Row Updates", test_update_keeps_created_at()))
+    
+    # Test the distributed work queue
+    results.append(("Work Queue", test_work_queue()))
+    
+    # Test data-quality rules
+    results.append(("Quality Rules", test_quality_rules()))
+    
     # Test data source
     results.append(("Data Source", test_data_source()))
     
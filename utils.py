@@ -5,16 +5,19 @@ Utility script for common operations
 
 import sys
 import argparse
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.config import get_settings
-from src.storage import MySQLStorage
 
 
 def show_stats():
     """Show database statistics"""
+    from src.storage import MySQLStorage
+    
     settings = get_settings()
     storage = MySQLStorage(settings.get_database_url())
     
@@ -34,13 +37,13 @@ def show_stats():
     
     try:
         # Total records
-        total = session.query(func.count(StockData.id)).scalar()
+        total = session.query(func.count()).select_from(StockData).scalar()
         print(f"Total records: {total:,}")
         
         # Per symbol stats
         results = session.query(
             StockData.symbol,
-            func.count(StockData.id).label('count'),
+            func.count().label('count'),
             func.min(StockData.date).label('min_date'),
             func.max(StockData.date).label('max_date')
         ).group_by(StockData.symbol).all()
@@ -78,6 +81,8 @@ def add_symbols(symbols: list):
 
 def query_latest(symbol: str):
     """Query latest data for a symbol"""
+    from src.storage import MySQLStorage
+    
     settings = get_settings()
     storage = MySQLStorage(settings.get_database_url())
     
@@ -114,6 +119,403 @@ def query_latest(symbol: str):
     print()
 
 
+def export_parquet():
+    """Sync new stock_data rows into the Parquet mirror"""
+    from src.storage import MySQLStorage, ParquetMirror
+    
+    settings = get_settings()
+    storage = MySQLStorage(settings.get_database_url())
+    
+    if not storage.connect():
+        print("Failed to connect to database")
+        return
+    
+    mirror = ParquetMirror(
+        settings.parquet_mirror_dir,
+        num_buckets=settings.parquet_symbol_buckets
+    )
+    
+    try:
+        exported = mirror.sync(storage.engine)
+        print(f"\nExported {exported:,} rows to {settings.parquet_mirror_dir}")
+    finally:
+        storage.disconnect()
+    
+    print()
+
+
+def migrate_schema(drop_old: bool = False):
+    """Rebuild a legacy stock_data table clustered on (symbol, date)"""
+    from src.storage import create_storage, migrate_stock_data, stock_data_layout
+    
+    settings = get_settings()
+    storage = create_storage(settings)
+    
+    if not hasattr(storage, "engine"):
+        print("migrate-schema needs a SQL storage backend (mysql or sqlite)")
+        return
+    
+    if not storage.connect():
+        print("Failed to connect to database")
+        return
+    
+    try:
+        print(f"\nCurrent stock_data layout: {stock_data_layout(storage.engine)}")
+        copied = migrate_stock_data(storage.engine, keep_backup=not drop_old)
+        print(f"Rows copied: {copied:,}")
+        print(f"New stock_data layout: {stock_data_layout(storage.engine)}")
+        if copied and not drop_old:
+            print("The original table was kept as stock_data_old")
+    finally:
+        storage.disconnect()
+    
+    print()
+
+
+def archive_raw(days: Optional[int] = None):
+    """Move old raw API responses from the database to the cold archive"""
+    from src.storage import RawDataStorage
+    from src.storage.engine import pool_options_from_settings
+    
+    settings = get_settings()
+    days = days if days is not None else settings.raw_archive_after_days
+    if days <= 0:
+        print("Set RAW_ARCHIVE_AFTER_DAYS or pass --days to choose the archive horizon")
+        return
+    
+    storage = RawDataStorage(
+        settings.get_database_url(),
+        pool_options=pool_options_from_settings(settings),
+        archive_dir=settings.raw_archive_dir
+    )
+    if not storage.connect():
+        print("Failed to connect to database")
+        return
+    
+    try:
+        before = datetime.utcnow() - timedelta(days=days)
+        archived = storage.archive_raw_data(before)
+        print(f"\nArchived {archived:,} raw responses crawled before {before:%Y-%m-%d %H:%M}")
+        print(f"Archive: {settings.raw_archive_dir}")
+    finally:
+        storage.disconnect()
+    
+    print()
+
+
+def fetch_intraday(symbols: list, interval: str = "1min", month: Optional[str] = None):
+    """Fetch intraday bars from Alpha Vantage, keep the raw responses and store the bars"""
+    from src.data_sources.alphavantage_source import AlphaVantageDataSource
+    from src.storage import IntradayStorage, RawDataStorage
+    from src.storage.engine import pool_options_from_settings
+    
+    settings = get_settings()
+    if not settings.alphavantage_api_key:
+        print("Set ALPHAVANTAGE_API_KEY to fetch intraday bars")
+        return
+    
+    source = AlphaVantageDataSource(api_key=settings.alphavantage_api_key)
+    raw_storage = RawDataStorage(
+        settings.get_database_url(), pool_options=pool_options_from_settings(settings)
+    )
+    bar_storage = IntradayStorage(
+        settings.get_database_url(), pool_options=pool_options_from_settings(settings)
+    )
+    if not raw_storage.connect() or not bar_storage.connect():
+        print("Failed to connect to database")
+        return
+    
+    try:
+        raw_storage.initialize_schema()
+        started = datetime.utcnow()
+        params = {"interval": interval, "outputsize": "full"}
+        if month:
+            params["month"] = month
+        
+        for symbol in symbols:
+            symbol = symbol.upper()
+            result = source.fetch_raw_data(symbol, "TIME_SERIES_INTRADAY", **params)
+            raw_storage.save_raw_response(
+                stock_code=symbol,
+                response_json=result['response_json'],
+                data_source="alphavantage",
+                time_granularity=f"intraday_{interval}",
+                price_date_range=result.get('date_range'),
+                api_function=result.get('api_function'),
+                api_params=result.get('api_params'),
+                response_status=result['status'],
+                error_message=result.get('error_message')
+            )
+            print(f"{symbol}: {result['status']} {result.get('date_range') or ''}")
+        
+        saved = bar_storage.ingest_raw(since=started)
+        print(f"\nStored {saved:,} intraday bars")
+    finally:
+        bar_storage.disconnect()
+        raw_storage.disconnect()
+    
+    print()
+
+
+def ingest_intraday(hours: Optional[float] = None):
+    """Normalize stored intraday raw responses into the intraday_bars table"""
+    from src.storage import IntradayStorage
+    from src.storage.engine import pool_options_from_settings
+    
+    settings = get_settings()
+    storage = IntradayStorage(
+        settings.get_database_url(), pool_options=pool_options_from_settings(settings)
+    )
+    if not storage.connect():
+        print("Failed to connect to database")
+        return
+    
+    try:
+        storage.initialize_schema()
+        since = datetime.utcnow() - timedelta(hours=hours) if hours else None
+        saved = storage.ingest_raw(since=since)
+        print(f"\nStored {saved:,} intraday bars")
+    finally:
+        storage.disconnect()
+    
+    print()
+
+
+def show_rollups(symbol: str, period: str = "M", rebuild: bool = False):
+    """Show weekly/monthly bars derived from daily data, optionally rebuilding them"""
+    from src.analytics import RollupEngine
+    from src.storage import create_storage
+    
+    settings = get_settings()
+    storage = create_storage(settings)
+    
+    if not hasattr(storage, "read_frame"):
+        print("rollups needs a SQL storage backend (mysql or sqlite)")
+        return
+    
+    if not storage.connect():
+        print("Failed to connect to database")
+        return
+    
+    try:
+        storage.initialize_schema()
+        # --rebuild also computes the requested period when it is not configured
+        periods = settings.rollup_periods_list
+        engine = RollupEngine(storage, periods + [period] if period not in periods else periods)
+        if rebuild:
+            symbols = settings.symbols_list if symbol.upper() == "ALL" else [symbol.upper()]
+            written = engine.rebuild(symbols)
+            print(f"\nRebuilt {written:,} rollup rows for {len(symbols)} symbols")
+            if symbol.upper() == "ALL":
+                return
+        
+        rollups = engine.get_rollups(symbol.upper(), period)
+        if rollups.empty:
+            print(f"\nNo {period} rollups for {symbol.upper()} (try --rebuild)")
+            return
+        print(f"\n{symbol.upper()} {period} bars (last 12):")
+        print(rollups.tail(12).to_string(index=False))
+    finally:
+        storage.disconnect()
+    
+    print()
+
+
+# Screens of the screen command: name -> (Screener method, uses --days, extra kwargs)
+SCREENS = {
+    "gainers": ("movers", False, {}),
+    "losers": ("movers", False, {"ascending": True}),
+    "range": ("price_range", True, {}),
+    "volume": ("volume_spikes", True, {}),
+    "pe": ("lowest_pe", False, {}),
+    "market-cap": ("largest_market_cap", False, {}),
+}
+
+
+def run_screen(name: str, top: int = 10, days: int = 30):
+    """Rank the universe with an in-memory screen"""
+    import time
+    from src.analytics import Screener, load_panel
+    from src.storage import create_storage
+    
+    settings = get_settings()
+    storage = create_storage(settings)
+    if not storage.connect():
+        print("Failed to connect to database")
+        return
+    
+    try:
+        started = time.perf_counter()
+        panel = load_panel(
+            storage,
+            settings.screening_cache_path or None,
+            max_days=settings.screening_max_days
+        )
+        loaded = time.perf_counter()
+        
+        method, uses_days, kwargs = SCREENS[name]
+        if uses_days:
+            kwargs = {**kwargs, "days": days}
+        result = getattr(Screener(panel), method)(top=top, **kwargs)
+        screened = time.perf_counter()
+        
+        print(f"\n{name} screen on {panel.last_date} "
+              f"({panel.shape[1]} symbols x {panel.shape[0]} days)")
+        print(result.round(2).to_string() if not result.empty else "No matching symbols")
+        print(f"\nPanel refresh {(loaded - started) * 1000:.0f} ms, "
+              f"screen {(screened - loaded) * 1000:.1f} ms")
+    finally:
+        storage.disconnect()
+    
+    print()
+
+
+def show_correlations(symbol: str, other: Optional[str] = None, window: int = 60,
+                      top: int = 10, negative: bool = False):
+    """Show the rolling correlation of a pair or a symbol's nearest neighbours"""
+    import time
+    from src.analytics import load_panel, update_correlations
+    from src.storage import create_storage
+    
+    settings = get_settings()
+    storage = create_storage(settings)
+    if not storage.connect():
+        print("Failed to connect to database")
+        return
+    
+    try:
+        started = time.perf_counter()
+        panel = load_panel(
+            storage,
+            settings.screening_cache_path or None,
+            max_days=settings.screening_max_days
+        )
+        rolling = update_correlations(
+            panel, settings.correlation_dir or "data/correlation", [window]
+        )[window]
+        updated = time.perf_counter()
+        
+        try:
+            if other:
+                result = rolling.pair(symbol, other)
+                print(f"\n{symbol.upper()} / {other.upper()} over {window} days "
+                      f"through {rolling.last_date}:")
+                for name, value in result.items():
+                    print(f"  {name:<13} {value:.6g}")
+            else:
+                neighbours = rolling.neighbours(symbol, top, negative)
+                print(f"\n{'Least' if negative else 'Most'} correlated with {symbol.upper()} "
+                      f"over {window} days through {rolling.last_date}:")
+                print(neighbours.round(4).to_string() if not neighbours.empty
+                      else "Not enough shared history")
+        except KeyError as e:
+            print(f"\n{e.args[0]}")
+            return
+        
+        print(f"\nUpdate {(updated - started) * 1000:.0f} ms, "
+              f"query {(time.perf_counter() - updated) * 1000:.1f} ms")
+    finally:
+        storage.disconnect()
+    
+    print()
+
+
+def show_quality(runs: int = 10, limit: int = 20):
+    """Show recent data-quality runs and quarantined bars"""
+    import pandas as pd
+    from sqlalchemy import select
+    from src.models import DataQualityRun, QuarantinedBar
+    from src.storage import create_storage
+    
+    settings = get_settings()
+    storage = create_storage(settings)
+    
+    if not hasattr(storage, "engine"):
+        print("quality needs a SQL storage backend (mysql or sqlite)")
+        return
+    
+    if not storage.connect():
+        print("Failed to connect to database")
+        return
+    
+    try:
+        storage.initialize_schema()
+        with storage.engine.connect() as conn:
+            recent = pd.read_sql(
+                select(
+                    DataQualityRun.id, DataQualityRun.started_at, DataQualityRun.symbols,
+                    DataQualityRun.rows_checked, DataQualityRun.rows_quarantined,
+                    DataQualityRun.rule_counts
+                ).order_by(DataQualityRun.id.desc()).limit(runs),
+                conn
+            )
+            quarantined = pd.read_sql(
+                select(
+                    QuarantinedBar.run_id, QuarantinedBar.symbol, QuarantinedBar.date,
+                    QuarantinedBar.open_price, QuarantinedBar.high_price,
+                    QuarantinedBar.low_price, QuarantinedBar.close_price,
+                    QuarantinedBar.volume, QuarantinedBar.prev_close, QuarantinedBar.reasons
+                ).order_by(QuarantinedBar.id.desc()).limit(limit),
+                conn
+            )
+        
+        print(f"\nData-quality runs (last {runs}):")
+        print(recent.to_string(index=False) if not recent.empty else "No runs recorded")
+        print(f"\nQuarantined bars (last {limit}):")
+        print(quarantined.to_string(index=False) if not quarantined.empty else "None")
+    finally:
+        storage.disconnect()
+    
+    print()
+
+
+def manage_partitions(apply: bool = False):
+    """Show partitions and plan (or apply) partition maintenance"""
+    from src.storage import PartitionManager, create_storage
+    from src.storage.partitioning import default_specs
+    
+    settings = get_settings()
+    storage = create_storage(settings)
+    
+    if not hasattr(storage, "engine"):
+        print("partitions needs a SQL storage backend")
+        return
+    
+    if not storage.connect():
+        print("Failed to connect to database")
+        return
+    
+    try:
+        manager = PartitionManager(
+            storage.engine,
+            default_specs(settings.raw_retention_months),
+            ahead=settings.partitions_ahead,
+            retention_action=settings.raw_retention_action
+        )
+        if not manager.supported:
+            print(f"\nPartitioning is not supported on {storage.engine.dialect.name}")
+            return
+        
+        for spec in manager.specs:
+            print(f"\n{spec.table} ({spec.interval}ly on {spec.column}):")
+            partitions = manager.list_partitions(spec.table)
+            if not partitions:
+                print("  not partitioned")
+            for name, bound, rows in partitions:
+                print(f"  {name:<10} < {bound or 'MAXVALUE'!s:<12} ~{rows:,} rows")
+        
+        statements = manager.maintain(dry_run=not apply)
+        print(f"\n{'Executed' if apply else 'Pending'} statements: {len(statements)}")
+        for statement in statements:
+            print(f"  {statement}")
+        if statements and not apply:
+            print("Run with --apply to execute them")
+    finally:
+        storage.disconnect()
+    
+    print()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Stock Crawler Utility Script"
@@ -135,6 +537,91 @@ def main():
     query_parser = subparsers.add_parser('query', help='Query latest data for a symbol')
     query_parser.add_argument('symbol', help='Stock symbol to query')
     
+    # Parquet export command
+    subparsers.add_parser('export-parquet', help='Sync new rows into the Parquet mirror')
+    
+    # Schema migration command
+    migrate_parser = subparsers.add_parser(
+        'migrate-schema', help='Cluster stock_data on (symbol, date) and drop redundant indexes'
+    )
+    migrate_parser.add_argument(
+        '--drop-old', action='store_true', help='Drop the original table after copying'
+    )
+    
+    # Raw response archival command
+    archive_parser = subparsers.add_parser(
+        'archive-raw', help='Move old raw API responses to compressed archive files'
+    )
+    archive_parser.add_argument(
+        '--days', type=int, help='Archive responses older than this (default RAW_ARCHIVE_AFTER_DAYS)'
+    )
+    
+    # Intraday commands
+    intraday_parser = subparsers.add_parser(
+        'fetch-intraday', help='Fetch intraday bars from Alpha Vantage'
+    )
+    intraday_parser.add_argument('symbols', nargs='+', help='Symbol(s) to fetch')
+    intraday_parser.add_argument(
+        '--interval', default='1min', choices=['1min', '5min', '15min', '30min', '60min'],
+        help='Bar length'
+    )
+    intraday_parser.add_argument('--month', help='Historical month (YYYY-MM) instead of the latest')
+    ingest_parser = subparsers.add_parser(
+        'ingest-intraday', help='Store bars from saved intraday raw responses'
+    )
+    ingest_parser.add_argument(
+        '--hours', type=float, help='Only responses crawled in the last N hours (default all)'
+    )
+    
+    # Rollup command
+    rollup_parser = subparsers.add_parser(
+        'rollups', help='Show weekly/monthly bars derived from daily data'
+    )
+    rollup_parser.add_argument('symbol', help="Stock symbol ('all' with --rebuild)")
+    rollup_parser.add_argument('--period', default='M', help='Period: W, M, Q, Y (default M)')
+    rollup_parser.add_argument(
+        '--rebuild', action='store_true', help='Recompute from all stored daily bars first'
+    )
+    
+    # Screening command
+    screen_parser = subparsers.add_parser(
+        'screen', help='Rank all symbols with an in-memory screen'
+    )
+    screen_parser.add_argument('name', choices=list(SCREENS), help='Screen to run')
+    screen_parser.add_argument('--top', type=int, default=10, help='Symbols to show')
+    screen_parser.add_argument(
+        '--days', type=int, default=30, help='Window for the range and volume screens'
+    )
+    
+    # Rolling correlation command
+    correlation_parser = subparsers.add_parser(
+        'correlation', help='Rolling return correlation of a pair or nearest neighbours'
+    )
+    correlation_parser.add_argument('symbol', help='Stock symbol')
+    correlation_parser.add_argument(
+        'other', nargs='?', help='Second symbol (omit to list the nearest neighbours)'
+    )
+    correlation_parser.add_argument('--window', type=int, default=60, help='Window in trading days')
+    correlation_parser.add_argument('--top', type=int, default=10, help='Neighbours to show')
+    correlation_parser.add_argument(
+        '--negative', action='store_true', help='Most negatively correlated neighbours'
+    )
+    
+    # Data-quality command
+    quality_parser = subparsers.add_parser(
+        'quality', help='Show data-quality run statistics and quarantined bars'
+    )
+    quality_parser.add_argument('--runs', type=int, default=10, help='Runs to show')
+    quality_parser.add_argument('--limit', type=int, default=20, help='Quarantined bars to show')
+    
+    # Partition maintenance command
+    partitions_parser = subparsers.add_parser(
+        'partitions', help='Show MySQL partitions and the pending maintenance'
+    )
+    partitions_parser.add_argument(
+        '--apply', action='store_true', help='Create upcoming partitions and apply retention'
+    )
+    
     args = parser.parse_args()
     
     if args.command == 'stats':
@@ -145,6 +632,26 @@ def main():
         add_symbols(args.symbols)
     elif args.command == 'query':
         query_latest(args.symbol)
+    elif args.command == 'export-parquet':
+        export_parquet()
+    elif args.command == 'migrate-schema':
+        migrate_schema(args.drop_old)
+    elif args.command == 'archive-raw':
+        archive_raw(args.days)
+    elif args.command == 'fetch-intraday':
+        fetch_intraday(args.symbols, args.interval, args.month)
+    elif args.command == 'ingest-intraday':
+        ingest_intraday(args.hours)
+    elif args.command == 'rollups':
+        show_rollups(args.symbol, args.period, args.rebuild)
+    elif args.command == 'screen':
+        run_screen(args.name, args.top, args.days)
+    elif args.command == 'correlation':
+        show_correlations(args.symbol, args.other, args.window, args.top, args.negative)
+    elif args.command == 'quality':
+        show_quality(args.runs, args.limit)
+    elif args.command == 'partitions':
+        manage_partitions(args.apply)
     else:
         parser.print_help()
 